@@ -0,0 +1,165 @@
+# Brief: Este codigo contiene la API asincrona de movimiento. Cada movimiento es una
+#        corrutina que se puede esperar (await robot.move({...}, duracion)), combinar con
+#        asyncio.gather, limitar con asyncio.wait_for o cancelar. Un solo lazo en el event
+#        loop genera los ticks de salida de todos los movimientos activos, asi varias
+#        articulaciones se mueven en paralelo con fases que se traslapan.
+#        Ejemplo:
+#            robot = AsyncRobot()
+#            await asyncio.gather(robot.move({'shoulder_1': 120}, 1), robot.move({'elbow_1': 110}, 0.5))
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import asyncio
+import math
+import time
+import PATH_Control as control
+
+class _Motion:
+    # Brief: Movimiento activo. frames tiene el pulso de cada gpio en cada tick, owned son los
+    #        gpio que el movimiento sigue controlando (un movimiento nuevo puede tomarlos).
+    __slots__ = ('gpios', 'frames', 'owned', 'step', 'future')
+
+    def __init__(self, gpios, frames, future):
+        self.gpios = gpios
+        self.frames = frames
+        self.owned = set(gpios)
+        self.step = 0
+        self.future = future
+
+class AsyncRobot:
+    # Brief: Robot con movimientos asincronos sobre el backend conectado en PATH_Control. Las
+    #        escrituras pasan por la etapa de salida de PATH_Control, un lote por tick con los
+    #        cambios de todos los movimientos. Siempre usa la salida por set_servo_pulsewidth,
+    #        el modo 'wave' no aplica porque los movimientos se deciden tick a tick.
+    def __init__(self):
+        self._motions = []
+        self._driver = None
+
+    # Brief: Mueve las articulaciones de servo_angles a su angulo en duration segundos con el
+    #        perfil de movimiento actual. Regresa True al llegar y False si otro movimiento tomo
+    #        todas sus articulaciones antes. Si se cancela (o vence un asyncio.wait_for) las
+    #        articulaciones se quedan en el ultimo pulso escrito. Lanza ValueError si un angulo
+    #        no es valido.
+    async def move(self, servo_angles, duration=None):
+        if duration is None:
+            duration = control.DEFAULT_DURATION
+        targets = {}
+        for servo_name, angle_input in servo_angles.items():
+            gpio = control.servo_gpios[servo_name]
+            target_angle = float(angle_input)
+            if not 0 <= target_angle <= 180:
+                raise ValueError(f'Ángulo inválido {target_angle}, para pin {gpio} (fuera de rango [0, 180])')
+            targets[gpio] = control.angle_to_pulse(target_angle, gpio)
+
+        gpios = list(targets)
+        start = [control.current_servo_pulse_widths.get(gpio, 1500) for gpio in gpios]
+        target = [targets[gpio] for gpio in gpios]
+        num_steps = max(1, int(math.ceil(duration / control.STEP_DELAY)))
+        frames = control.plan_frames(start, target, num_steps) if gpios else [[]] * num_steps
+        return await self._run(_Motion(gpios, frames, asyncio.get_running_loop().create_future()))
+
+    # Brief: Espera seconds segundos en ticks del lazo, sirve para escalonar movimientos
+    #        sobre la misma linea de tiempo que la salida (tambien con el reloj virtual).
+    async def sleep(self, seconds):
+        num_steps = max(1, int(round(seconds / control.STEP_DELAY)))
+        await self._run(_Motion([], [[]] * num_steps, asyncio.get_running_loop().create_future()))
+
+    async def home(self, duration=None):
+        import PATH_Gait as gait
+        return await self.move(gait.HOME_POSE, duration)
+
+    # Brief: Reproduce una secuencia de poses parciales como las de PATH_Gait. Con overlap > 0
+    #        cada pose empieza cuando a la anterior le falta esa fraccion de su duracion, las
+    #        articulaciones compartidas las toma la pose nueva desde su pulso actual.
+    async def play_sequence(self, sequence, duration=None, overlap=0.0):
+        if duration is None:
+            duration = control.GAIT_MOVE_DURATION
+        moves = []
+        for i, pose in enumerate(sequence):
+            moves.append(asyncio.ensure_future(self.move(pose, duration)))
+            if i < len(sequence) - 1:
+                await self.sleep(duration * (1.0 - overlap))
+        await asyncio.gather(*moves)
+        return True
+
+    # Brief: Cancela todos los movimientos activos, las articulaciones se quedan donde estan.
+    def stop(self):
+        for motion in self._motions:
+            motion.future.cancel()
+        self._motions.clear()
+
+    def is_moving(self):
+        return bool(self._motions)
+
+    async def _run(self, motion):
+        # Un movimiento nuevo toma las articulaciones que otro movimiento estaba moviendo
+        for other in self._motions:
+            other.owned.difference_update(motion.gpios)
+        self._motions.append(motion)
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.get_running_loop().create_task(self._drive())
+        try:
+            return await motion.future
+        except asyncio.CancelledError:
+            if motion in self._motions:
+                self._motions.remove(motion)
+            raise
+
+    async def _sleep(self, clock, seconds):
+        if clock is time:
+            await asyncio.sleep(seconds)
+        else:
+            # Reloj virtual del simulador: el tiempo avanza sin esperar
+            clock.sleep(seconds)
+            await asyncio.sleep(0)
+
+    # Brief: Lazo de salida, corre mientras haya movimientos. Cada tick avanza todos los
+    #        movimientos un paso (o los pasos atrasados si el tick llego tarde), junta el pulso
+    #        de cada gpio y lo manda en un solo lote.
+    async def _drive(self):
+        clock = control.clock
+        period = control.STEP_DELAY
+        observer = control.loop_observer
+        if observer is not None:
+            observer.loop_started(0, period)
+        start = clock.monotonic()
+        tick = 0
+        try:
+            while self._motions:
+                tick += 1
+                deadline = start + tick * period
+                await self._sleep(clock, deadline - clock.monotonic())
+                lateness = clock.monotonic() - deadline
+                if observer is not None:
+                    observer.tick(lateness)
+                advance = 1
+                if lateness >= period:
+                    skipped = int(lateness // period)
+                    tick += skipped
+                    advance += skipped
+
+                gpios = []
+                pulses = []
+                finished = []
+                for motion in list(self._motions):
+                    motion.step = min(motion.step + advance, len(motion.frames))
+                    for gpio, pulse in zip(motion.gpios, motion.frames[motion.step - 1]):
+                        if gpio in motion.owned:
+                            gpios.append(gpio)
+                            pulses.append(pulse)
+                    if motion.step == len(motion.frames) or (motion.gpios and not motion.owned):
+                        finished.append(motion)
+
+                control.current_servo_pulse_widths.update(control.output.write_frame(control.pi, gpios, pulses))
+                for motion in finished:
+                    self._motions.remove(motion)
+                    if not motion.future.done():
+                        motion.future.set_result(bool(motion.owned) or not motion.gpios)
+        except Exception as e:
+            print(f'Error en el lazo de movimiento asíncrono: {e}')
+            for motion in self._motions:
+                if not motion.future.done():
+                    motion.future.set_exception(e)
+            self._motions.clear()
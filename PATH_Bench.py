@@ -0,0 +1,198 @@
+# Brief: Este codigo contiene los benchmarks del camino critico del control. Corre
+#        move_servo_smooth, move_servo, forward1, rotate1 y execute_trajectory contra
+#        el backend simulado (mock) y contra un sustituto local de pigpiod (standin),
+#        mide comandos por segundo, latencia por llamada, jitter de los ticks, tiempo
+#        real contra tiempo comandado y uso de CPU, y guarda el resultado en JSON.
+#        Uso: python3 PATH_Bench.py [--backend mock standin] [--out bench_results.json]
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import pigpio
+import PATH_Control as control
+import PATH_Gait as gait
+from PATH_Output import send_servo_batch
+from PATH_Sim import SimPi, StandInDaemon
+
+BACKENDS = ('mock', 'standin')
+PERCENTILES = (50, 90, 99, 100)
+BENCH_TRAJECTORY = [(0, 0), (3, 30)]
+
+class TimedPi:
+    # Brief: Envuelve el backend y mide el tiempo de cada llamada a pigpio.
+    def __init__(self, pi):
+        self._pi = pi
+        self.latencies = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._pi, name)
+        if not callable(attr):
+            return attr
+        latencies = self.latencies
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = attr(*args, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            return result
+        return timed
+
+    # Un lote de la etapa de salida es un solo viaje al daemon
+    def set_servo_pulsewidths(self, items):
+        start = time.perf_counter()
+        send_servo_batch(self._pi, items)
+        self.latencies.append(time.perf_counter() - start)
+
+class LoopProbe:
+    # Brief: Observador del lazo de control, suma el tiempo comandado y guarda el retraso de cada tick.
+    def __init__(self):
+        self.commanded = 0.0
+        self.lateness = []
+
+    def loop_started(self, num_ticks, period):
+        self.commanded += num_ticks * period
+
+    def tick(self, lateness):
+        self.lateness.append(lateness)
+
+def percentiles(values, scale=1e6):
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {}
+    for p in PERCENTILES:
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        result[f'p{p}'] = round(ordered[index] * scale, 2)
+    return result
+
+def bench_cases(move_duration):
+    shoulder_1 = control.servo_gpios['shoulder_1']
+    pose = {name: 120 if name.startswith('shoulder') else 90 for name in control.servo_gpios}
+    return [
+        ('move_servo_smooth', lambda: control.move_servo_smooth(shoulder_1, 150, duration_sec=move_duration)),
+        ('move_servo', lambda: control.move_servo(pose, duration=move_duration)),
+        ('forward1', control.forward1),
+        ('rotate1', control.rotate1),
+        ('execute_trajectory', lambda: control.execute_trajectory(BENCH_TRAJECTORY)),
+    ]
+
+# Brief: Corre un caso con el backend dado, partiendo siempre de home.
+def run_case(name, fn, backend, backend_pi):
+    control.pi = backend_pi
+    control.clock = time
+    control.loop_observer = None
+    control.output.reset()
+    control.move_servos_sync(gait.HOME_POSE, duration_sec=0)
+
+    timed = TimedPi(backend_pi)
+    probe = LoopProbe()
+    control.pi = timed
+    control.loop_observer = probe
+
+    sent_before = control.output.sent
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    fn()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    control.pi = backend_pi
+    control.loop_observer = None
+    commands = len(timed.latencies)
+    output_writes = control.output.sent - sent_before
+    return {
+        'case': name,
+        'backend': backend,
+        'output_mode': control.OUTPUT_MODE,
+        'wall_s': round(wall, 4),
+        'commanded_s': round(probe.commanded, 4),
+        'excess_s': round(wall - probe.commanded, 4),
+        'commands': commands,
+        'commands_per_s': round(commands / wall, 1) if wall > 0 else None,
+        'servo_writes': output_writes,
+        'call_latency_us': percentiles(timed.latencies),
+        'tick_jitter_us': percentiles([abs(lateness) for lateness in probe.lateness]),
+        'ticks': len(probe.lateness),
+        'cpu_percent': round(100.0 * cpu / wall, 1) if wall > 0 else None,
+    }
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def run_benchmarks(backends, move_duration):
+    control.GAIT_MOVE_DURATION = move_duration
+    results = []
+    for backend in backends:
+        daemon = None
+        if backend == 'mock':
+            backend_pi = SimPi()
+        else:
+            daemon = StandInDaemon().start()
+            backend_pi = pigpio.pi(daemon.host, daemon.port)
+        try:
+            for name, fn in bench_cases(move_duration):
+                result = run_case(name, fn, backend, backend_pi)
+                print(f'{backend:8s} {name:20s} {result["wall_s"]:8.3f} s (comandado {result["commanded_s"]:.3f} s) '
+                      f'{result["commands_per_s"]:>9} cmd/s  p99 jitter {result["tick_jitter_us"].get("p99", 0):.0f} us')
+                results.append(result)
+        finally:
+            if daemon is not None:
+                backend_pi.stop()
+                daemon.close()
+    return results
+
+# Brief: Compara contra un archivo de resultados anterior y muestra los cambios por caso.
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['backend'], r['case']): r for r in json.load(f)['results']}
+    print(f'Comparacion contra {baseline_path}:')
+    for result in results:
+        old = baseline.get((result['backend'], result['case']))
+        if old is None:
+            continue
+        excess = result['excess_s'] - old['excess_s']
+        rate = (result['commands_per_s'] or 0) - (old['commands_per_s'] or 0)
+        print(f'  {result["backend"]:8s} {result["case"]:20s} exceso {excess:+.4f} s, {rate:+.1f} cmd/s')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks del camino critico de PATH_Control')
+    parser.add_argument('--backend', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--output-mode', choices=control.OUTPUT_MODES, default='servo')
+    parser.add_argument('--step-delay', type=float, default=control.STEP_DELAY)
+    parser.add_argument('--move-duration', type=float, default=0.25)
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', help='archivo JSON de una corrida anterior')
+    args = parser.parse_args()
+
+    control.STEP_DELAY = args.step_delay
+    control.set_output_mode(args.output_mode)
+    results = run_benchmarks(args.backend, args.move_duration)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'step_delay': control.STEP_DELAY,
+            'move_duration': args.move_duration,
+        },
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Resultados guardados en {args.out}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
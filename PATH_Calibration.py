@@ -0,0 +1,75 @@
+# Brief: Este codigo contiene la calibracion por servo. Cada articulacion tiene su
+#        offset, pulso minimo y maximo, inversion de giro y una correccion de no
+#        linealidad, leidos de servo_calibration.json. Al cargarla se compila una tabla
+#        de enteros por articulacion indexada en decimas de grado (0 a 1800), asi la
+#        conversion de angulo a pulso es una sola busqueda en un arreglo.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import json
+import os
+import numpy as np
+
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servo_calibration.json')
+
+# Resolucion de las tablas: decimas de grado de 0 a 180
+ANGLE_RESOLUTION = 10
+TABLE_SIZE = 180 * ANGLE_RESOLUTION + 1
+
+# Valores de un MG1501 sin calibrar, iguales a la formula original de angle_to_pulse.
+# correction es una lista de puntos [angulo, correccion en grados] que se interpola
+# linealmente y se suma al angulo pedido.
+DEFAULT_JOINT_CALIBRATION = {
+    'offset': 0.0,
+    'min_pulse': 1000,
+    'max_pulse': 2000,
+    'invert': False,
+    'correction': [],
+}
+
+# Brief: Lee el archivo de calibracion, las articulaciones o campos que falten toman los
+#        valores por defecto. Si el archivo no existe se usan los valores por defecto.
+def load_calibration(joint_names, path=CALIBRATION_FILE):
+    data = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        print(f'No se encontró {path}, se usa la calibración por defecto')
+
+    calibration = {}
+    for name in joint_names:
+        joint = dict(DEFAULT_JOINT_CALIBRATION)
+        joint.update(data.get(name, {}))
+        if not joint['min_pulse'] < joint['max_pulse']:
+            raise ValueError(f'Calibración inválida para {name}: min_pulse debe ser menor que max_pulse')
+        calibration[name] = joint
+    return calibration
+
+# Brief: Compila la tabla de una articulacion, regresa un arreglo int16 de TABLE_SIZE pulsos.
+def compile_joint_table(joint):
+    angles = np.arange(TABLE_SIZE, dtype=np.float64) / ANGLE_RESOLUTION
+    corrected = angles + joint['offset']
+    if joint['correction']:
+        points = np.array(sorted(joint['correction']), dtype=np.float64)
+        corrected += np.interp(angles, points[:, 0], points[:, 1])
+    if joint['invert']:
+        corrected = 180.0 - corrected
+    corrected = np.clip(corrected, 0.0, 180.0)
+    pulses = joint['min_pulse'] + corrected / 180.0 * (joint['max_pulse'] - joint['min_pulse'])
+    return np.floor(pulses).astype(np.int16)
+
+# Brief: Compila las tablas de todas las articulaciones, regresa {gpio: tabla}.
+def compile_tables(calibration, servo_gpios):
+    tables = {}
+    for name, gpio in servo_gpios.items():
+        table = compile_joint_table(calibration[name])
+        table.setflags(write=False)
+        tables[gpio] = table
+    return tables
+
+# Brief: Indice de la tabla para un angulo en grados (o un arreglo de angulos).
+def angle_index(angle):
+    return np.clip(np.rint(np.asarray(angle, dtype=np.float64) * ANGLE_RESOLUTION), 0, TABLE_SIZE - 1).astype(np.intp)
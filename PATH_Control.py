@@ -7,8 +7,14 @@
 
 from tkinter import messagebox
 import pigpio
+import os
 import time
 import math
+import threading
+from PATH_Scheduler import FixedRateLoop, SERVO_FRAME_PERIOD, align_rate
+import PATH_Wave as wave
+import PATH_Metrics as metrics
+from PATH_Output import OutputStage
 
 SHLD1_GPIO = 4
 SHLD2_GPIO = 17
@@ -20,12 +26,66 @@ ELBW2_GPIO = 23
 ELBW3_GPIO = 24
 ELBW4_GPIO = 25
 
-pi = pigpio.pi()
-if not pi.connected:
-     print('Pigpio daemon no se ha inicializad, correr "sudo systemctl start pigpiod"')
-     exit()
-else:
-     print('Daemon Pigpio inicializado, GPIO conectados')
+# Backend de los servos: 'pigpio' usa el daemon del raspberry y 'sim' usa PATH_Sim con
+# reloj virtual para correr sin hardware. Se elige con la variable de entorno PATH_BACKEND.
+BACKENDS = ('pigpio', 'sim')
+BACKEND = os.environ.get('PATH_BACKEND', 'pigpio')
+
+# Brief: Marcador del backend antes de llamar connect(), cualquier llamada a pigpio
+#        lanza un error que los movimientos reportan en consola.
+class _NotConnected:
+    def __getattr__(self, name):
+        raise RuntimeError('Backend de servos no conectado, llamar connect()')
+
+pi = _NotConnected()
+# Reloj usado por el lazo de control, cualquier objeto con monotonic() y sleep()
+clock = time
+# Observador del lazo de control (ver PATH_Scheduler.FixedRateLoop), por defecto las
+# metricas de PATH_Metrics que se muestran en el Tab 3
+loop_observer = metrics.control_metrics
+# Etapa de salida (ver PATH_Output): guarda el ultimo pulso escrito en cada GPIO y manda
+# los cambios de cada tick en un solo lote
+output = OutputStage()
+# Registro de los marcos comandados (ver PATH_Telemetry), se crea al conectar
+telemetry = None
+# Al activarse, el movimiento en curso se detiene en el siguiente tick y deja cada servo en
+# su pulso interpolado, asi el siguiente movimiento parte de ahi (ver MotionExecutor.submit)
+preempt_event = threading.Event()
+# El movimiento lo activa cuando de verdad se detuvo por preempt_event antes de terminar; si el
+# movimiento ya habia terminado o no se puede detener queda sin activar
+preempt_stopped = threading.Event()
+
+# Brief: Conecta el backend de los servos, con 'sim' el reloj del control pasa a ser el
+#        reloj virtual del simulador. Regresa True si la conexion se establecio.
+def connect(backend=BACKEND, host='localhost', port=8888):
+    global pi, clock, BACKEND, telemetry
+    if backend not in BACKENDS:
+        print(f'Backend inválido: {backend}')
+        return False
+
+    if backend == 'sim':
+        import PATH_Sim as sim
+        clock = sim.VirtualClock()
+        pi = sim.SimPi(clock)
+        print('Backend simulado inicializado, GPIO virtuales')
+    else:
+        clock = time
+        pi = pigpio.pi(host, port)
+        if not pi.connected:
+            print('Pigpio daemon no se ha inicializad, correr "sudo systemctl start pigpiod"')
+            return False
+        print('Daemon Pigpio inicializado, GPIO conectados')
+    # Cada escritura de pulso se cuenta y se mide para el panel de metricas
+    pi = metrics.InstrumentedPi(pi, metrics.control_metrics)
+    output.reset()
+    if telemetry is None:
+        from PATH_Telemetry import TelemetryRing
+        telemetry = TelemetryRing(servo_gpios.values())
+        output.telemetry = telemetry
+    telemetry.clock = clock
+    BACKEND = backend
+    load_calibration()
+    return True
 
 servo_gpios = {
     'elbow_1': ELBW1_GPIO,
@@ -44,23 +104,123 @@ current_servo_pulse_widths = {gpio: 1500 for gpio in servo_gpios.values()}
 SERVO_MIN_PULSE = 1000
 SERVO_MAX_PULSE = 2000
 SERVO_PULSE_RANGE = SERVO_MAX_PULSE - SERVO_MIN_PULSE
+# Tablas de calibracion por gpio (ver PATH_Calibration), se compilan en load_calibration
+pulse_tables = None
+pulse_lookup = None
 DEFAULT_DURATION = 1.5
-STEP_DELAY = 0.1
-
+# Periodo del lazo de control, alineado al marco de 50 Hz de los servos
+STEP_DELAY = SERVO_FRAME_PERIOD
+# Salida de los servos: 'servo' manda cada paso con set_servo_pulsewidth,
+# 'wave' compila el movimiento completo en waveforms y lo reproduce por DMA
+OUTPUT_MODES = ('servo', 'wave')
+OUTPUT_MODE = 'servo'
+# Perfil de velocidad de cada movimiento (ver PATH_Profiles): 'linear', 'trapezoidal',
+# 'min_jerk' o 'cubic'. Con minimum-jerk la velocidad empieza y termina en cero.
+MOTION_PROFILES = ('linear', 'trapezoidal', 'min_jerk', 'cubic')
+MOTION_PROFILE = 'min_jerk'
+# Que hace el lazo de control con los ticks que llegan tarde mas de un periodo (ver
+# PATH_Scheduler.FixedRateLoop): 'skip' los salta para no alargar el movimiento y 'catch_up'
+# los ejecuta de inmediato para no perder ningun paso
+LATE_TICK_MODES = ('skip', 'catch_up')
+LATE_TICK_MODE = 'skip'
+# Duracion de cada pose dentro de las caminatas forward1 y rotate1
+GAIT_MOVE_DURATION = 1
+# Filas de una tabla que se convierten a listas a la vez, asi una tabla grande (o un memmap
+# de PATH_Format) empieza a reproducirse sin convertirla completa
+TABLE_CHUNK = 256
+
+# Brief: Lee el periodo del lazo y la duracion por defecto de los campos del Tab 3. Si algun
+#        valor no es valido se muestra el error y se conservan los valores anteriores.
 def update_values(step_entry, mov_entry):
-    STEP_DELAY = float(step_entry.get())
+    global STEP_DELAY, DEFAULT_DURATION
+    try:
+        step_delay = float(step_entry.get())
+        duration = float(mov_entry.get())
+        if not (math.isfinite(step_delay) and math.isfinite(duration)) or step_delay <= 0 or duration < 0:
+            raise ValueError
+        step_delay = 1.0 / align_rate(1.0 / step_delay)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        messagebox.showerror('Valor inválido', 'El step delay debe ser un número mayor que 0 y la duración un número no negativo.')
+        return
+    STEP_DELAY = step_delay
     print(f'Step Delay actualizado a: {STEP_DELAY}')
-    DEFAULT_DURATION = float(mov_entry.get())
+    DEFAULT_DURATION = duration
     print(f'Duracion de movimiento actualizada a {DEFAULT_DURATION}')
 
     messagebox.showinfo('Aviso', 'Valores actualizados')
 
-def angle_to_pulse(angle):
+def set_output_mode(mode):
+    global OUTPUT_MODE
+    if mode not in OUTPUT_MODES:
+        print(f'Modo de salida inválido: {mode}')
+        return False
+    OUTPUT_MODE = mode
+    print(f'Modo de salida actualizado a: {OUTPUT_MODE}')
+    return True
+
+def set_late_tick_mode(mode):
+    global LATE_TICK_MODE
+    if mode not in LATE_TICK_MODES:
+        print(f'Modo de ticks atrasados inválido: {mode}')
+        return False
+    LATE_TICK_MODE = mode
+    print(f'Ticks atrasados: {LATE_TICK_MODE}')
+    return True
+
+def set_motion_profile(profile):
+    global MOTION_PROFILE
+    if profile not in MOTION_PROFILES:
+        print(f'Perfil de movimiento inválido: {profile}')
+        return False
+    MOTION_PROFILE = profile
+    print(f'Perfil de movimiento actualizado a: {MOTION_PROFILE}')
+    return True
+
+# Brief: Calcula todos los pasos de un movimiento con el perfil actual, regresa una lista
+#        de pasos con el pulso de cada articulacion. NumPy se importa hasta el primer movimiento.
+def plan_frames(start, target, num_steps):
+    import PATH_Profiles as profiles
+    return profiles.interpolate(start, target, profiles.fractions(MOTION_PROFILE, num_steps)).tolist()
+
+# Brief: Lee servo_calibration.json y compila las tablas de angulo a pulso de cada servo.
+#        Se llama al conectar y desde el Tab 3 para recargar la calibracion.
+def load_calibration(path=None):
+    global pulse_tables, pulse_lookup
+    import PATH_Calibration as calibration
+    try:
+        joints = calibration.load_calibration(servo_gpios, path or calibration.CALIBRATION_FILE)
+        tables = calibration.compile_tables(joints, servo_gpios)
+    except (OSError, ValueError) as e:
+        print(f'Error cargando la calibración: {e}')
+        return False
+
+    pulse_tables = tables
+    pulse_lookup = {gpio: table.tolist() for gpio, table in tables.items()}
+    # Las caminatas compiladas con la calibracion anterior ya no son validas
+    import PATH_Gait as gait
+    gait.clear_cache()
+    print('Calibración de servos cargada')
+    return True
+
+# Brief: Convierte un angulo en pulso. Con gpio se usa la tabla calibrada de ese servo (una
+#        sola busqueda por decima de grado), sin gpio se usa el rango nominal de 1000-2000 us.
+def angle_to_pulse(angle, gpio=None):
     angle = float(angle)
     angle = max(0, min(180, angle))
-    pulse_width = SERVO_MIN_PULSE + angle/(180) * SERVO_PULSE_RANGE
+    if gpio is None:
+        pulse_width = SERVO_MIN_PULSE + angle/(180) * SERVO_PULSE_RANGE
+        return int(pulse_width)
 
-    return int(pulse_width)
+    if pulse_lookup is None:
+        load_calibration()
+    return pulse_lookup[gpio][int(round(angle * 10))]
+
+# Brief: Version vectorizada de angle_to_pulse para un arreglo de angulos de un servo.
+def angles_to_pulses(angles, gpio):
+    import PATH_Calibration as calibration
+    if pulse_tables is None:
+        load_calibration()
+    return pulse_tables[gpio][calibration.angle_index(angles)]
 
 def pulse_to_angle(pulse):
     pulse = float(pulse)
@@ -68,9 +228,23 @@ def pulse_to_angle(pulse):
     angle = ((pulse - SERVO_MIN_PULSE) / SERVO_PULSE_RANGE)
     return angle 
 
+# Brief: Crea el lazo de control a la frecuencia definida por STEP_DELAY (o por period).
+def control_loop(period=None):
+    return FixedRateLoop(1.0 / (period or STEP_DELAY), clock=clock, catch_up=LATE_TICK_MODE == 'catch_up', observer=loop_observer)
+
+# Brief: Muestra en consola los ticks que llegaron tarde durante un movimiento.
+def report_overruns(loop):
+    if loop.overruns:
+        report = loop.report()
+        print(f'Aviso: {report["overruns"]} ticks atrasados ({report["skipped"]} saltados), '
+              f'retraso máximo {report["max_lateness_ms"]:.1f} ms a {report["rate_hz"]:.1f} Hz')
+
 # Definimos función para el movimiento lento
-def move_servo_smooth(gpio, target_angle, duration_sec=DEFAULT_DURATION):
+def move_servo_smooth(gpio, target_angle, duration_sec=None):
     global current_servo_pulse_widths
+    # La duracion se lee al llamar, asi se usa el valor actualizado con update_values
+    if duration_sec is None:
+        duration_sec = DEFAULT_DURATION
 
     try:
         target_angle = float(target_angle)
@@ -78,34 +252,34 @@ def move_servo_smooth(gpio, target_angle, duration_sec=DEFAULT_DURATION):
             print(f'Ángulo inválido {target_angle}, para pin {gpio} (fuera de rango [0, 180])')
             return False
 
-        target_pulse = angle_to_pulse(target_angle)
+        target_pulse = angle_to_pulse(target_angle, gpio)
         start_pulse = current_servo_pulse_widths.get(gpio, 1500)
         pulse_change = target_pulse - start_pulse
 
         if abs(pulse_change) < 1 or duration_sec <= 0:
             if start_pulse != target_pulse:
-                pi.set_servo_pulsewidth(gpio, target_pulse)
+                output.write(pi, gpio, target_pulse)
                 current_servo_pulse_widths[gpio] = target_pulse
-                time.sleep(STEP_DELAY)
+                clock.sleep(STEP_DELAY)
             return True
 
-        num_steps = max(1, int(math.ceil(duration_sec / STEP_DELAY)))
-        pulse_increment = float(pulse_change) / num_steps
+        loop = control_loop()
+        num_steps = max(1, int(math.ceil(duration_sec / loop.period)))
 
-        current_pulse = float(start_pulse)
-        for step in range(num_steps):
-            current_pulse += pulse_increment
-            set_pulse = int(round(current_pulse))
-            set_pulse = max(SERVO_MIN_PULSE, min(SERVO_MAX_PULSE, set_pulse))
+        # Los pasos se calculan antes de iniciar, asi los ticks saltados por el lazo no
+        # alteran la duracion ni el punto final del movimiento.
+        frames = plan_frames([start_pulse], [target_pulse], num_steps)
+        for step in loop.ticks(num_steps):
+            if preempt_event.is_set():
+                print(f'Movimiento del pin {gpio} interrumpido por un nuevo objetivo')
+                preempt_stopped.set()
+                return False
+            set_pulse = frames[step - 1][0]
 
-            pi.set_servo_pulsewidth(gpio, set_pulse)
+            output.write(pi, gpio, set_pulse)
             current_servo_pulse_widths[gpio] = set_pulse
-            time.sleep(STEP_DELAY)
-        
-        if current_servo_pulse_widths[gpio] != target_pulse:
-            pi.set_servo_pulsewidth(gpio, target_pulse)
-            current_servo_pulse_widths[gpio] = target_pulse
-            time.sleep(STEP_DELAY)
+
+        report_overruns(loop)
         return True
     
     except ValueError:
@@ -116,25 +290,125 @@ def move_servo_smooth(gpio, target_angle, duration_sec=DEFAULT_DURATION):
         return False
 
 
+# Brief: Motor de movimiento multi-articulacion. Recibe el diccionario completo de
+#        servo_angles e interpola todas las articulaciones sobre una misma linea de
+#        tiempo, de modo que todas llegan a su objetivo juntas y un cambio de pose
+#        cuesta una sola duracion en lugar de una por servo.
+def move_servos_sync(servo_angles, duration_sec=None):
+    global current_servo_pulse_widths
+    if duration_sec is None:
+        duration_sec = DEFAULT_DURATION
+
+    all_valid = True
+    start_pulses = {}
+    target_pulses = {}
+
+    # Se validan los angulos y se obtienen los pulsos de inicio y objetivo de cada gpio
+    for servo_name, angle_input in servo_angles.items():
+        gpio = servo_gpios[servo_name]
+        try:
+            target_angle = float(angle_input)
+        except ValueError:
+            print(f'Error: Valor inválido para ángulo del pin {gpio}')
+            all_valid = False
+            continue
+
+        if not 0 <= target_angle <= 180:
+            print(f'Ángulo inválido {target_angle}, para pin {gpio} (fuera de rango [0, 180])')
+            all_valid = False
+            continue
+
+        target_pulse = angle_to_pulse(target_angle, gpio)
+        start_pulse = current_servo_pulse_widths.get(gpio, 1500)
+        if start_pulse != target_pulse:
+            start_pulses[gpio] = start_pulse
+            target_pulses[gpio] = target_pulse
+
+    if not target_pulses:
+        return all_valid
+
+    try:
+        if duration_sec <= 0:
+            output.write_frame(pi, list(target_pulses), list(target_pulses.values()))
+            current_servo_pulse_widths.update(target_pulses)
+            clock.sleep(STEP_DELAY)
+            return all_valid
+
+        # Todas las articulaciones comparten el mismo numero de pasos, en el ultimo
+        # paso la fraccion es 1 y cada servo queda exactamente en su objetivo.
+        loop = control_loop()
+        num_steps = max(1, int(math.ceil(duration_sec / loop.period)))
+        if OUTPUT_MODE == 'wave':
+            if not move_servos_wave(start_pulses, target_pulses, num_steps, loop.period):
+                return False
+            return all_valid
+
+        gpios = list(target_pulses)
+        frames = plan_frames([start_pulses[gpio] for gpio in gpios], [target_pulses[gpio] for gpio in gpios], num_steps)
+        # Cada tick se manda como un solo lote con los GPIO que cambiaron. Si llega un nuevo
+        # objetivo el movimiento se corta aqui, en el pulso interpolado del ultimo tick, y
+        # regresa False porque los servos no llegaron a la pose.
+        for step in loop.ticks(num_steps):
+            if preempt_event.is_set():
+                print(f'Movimiento interrumpido por un nuevo objetivo en el paso {step - 1} de {num_steps}')
+                report_overruns(loop)
+                preempt_stopped.set()
+                return False
+            current_servo_pulse_widths.update(output.write_frame(pi, gpios, frames[step - 1]))
+
+        report_overruns(loop)
+        return all_valid
+
+    except Exception as e:
+        print(f'Error moviendo servos {list(target_pulses)}: {e}')
+        return False
+
+
+# Brief: Salida por DMA del motor multi-articulacion. Se calculan todos los pasos del
+#        movimiento para los 8 GPIO de servo_gpios y se mandan al daemon como un solo
+#        segmento de waveforms, los tiempos los lleva el DMA y no el lazo de Python.
+#        preempt_event corta la cadena con wave_tx_stop y los servos se quedan en el tick
+#        que se estaba transmitiendo. Regresa False si el movimiento se interrumpio.
+def move_servos_wave(start_pulses, target_pulses, num_steps, period):
+    gpios = list(servo_gpios.values())
+    start = [start_pulses.get(gpio, current_servo_pulse_widths[gpio]) for gpio in gpios]
+    target = [target_pulses.get(gpio, current_servo_pulse_widths[gpio]) for gpio in gpios]
+    frames = plan_frames(start, target, num_steps)
+
+    frames_per_tick = max(1, int(round(period / SERVO_FRAME_PERIOD)))
+    played = wave.play_segment(pi, gpios, frames, frames_per_tick, clock=clock, observer=loop_observer,
+                               stop_event=preempt_event)
+    if played:
+        output.mark(gpios, frames[played - 1])
+        current_servo_pulse_widths.update(zip(gpios, frames[played - 1]))
+    if played < len(frames):
+        print(f'Movimiento interrumpido por un nuevo objetivo en el paso {played} de {num_steps}')
+        preempt_stopped.set()
+        return False
+    return True
+
+
 def servo_set_angle(angle, gpio):
     try:
         # Verificar que el ángulo se encuentre entre 0 y 180 grados
         angle = float(angle)
         if not 0 <= angle <= 180:
-            messagebox.showerror('Ángulo inválido', f'El ángulo para el pin {gpio} debe estar entre 0 y 180 grados.')
+            print(f'Ángulo inválido: el ángulo para el pin {gpio} debe estar entre 0 y 180 grados.')
             return False
         
         # Aquí se incluye la lógica para mover el servo al ángulo deseado.
-        print(f'Simulando colocar el servo del pin {gpio} en {angle} grados')
-        pulse_width = int((angle / 180) * 1000+ 1000)
-        pi.set_servo_pulsewidth(gpio, pulse_width)
+        print(f'Colocando el servo del pin {gpio} en {angle} grados')
+        pulse_width = angle_to_pulse(angle, gpio)
+        output.write(pi, gpio, pulse_width)
+        current_servo_pulse_widths[gpio] = pulse_width
         return True
     except ValueError:
-        messagebox.showerror('Valor inválido', f'El ángulo para el pin {gpio} debe ser un número.')
+        print(f'Valor inválido: el ángulo para el pin {gpio} debe ser un número.')
         return False
 
-def execute_servos(sEntry1, sEntry2, sEntry3, sEntry4, eEntry1, eEntry2, eEntry3, eEntry4, duration_per_servo=1):
-    # Se recuperan los valores en los inputs y se guardan en el diccionario
+# Brief: Se recuperan los valores en los inputs y se guardan en el diccionario, se debe
+#        llamar desde el hilo de Tk antes de mandar el movimiento al ejecutor.
+def read_servo_entries(sEntry1, sEntry2, sEntry3, sEntry4, eEntry1, eEntry2, eEntry3, eEntry4):
     servo_angles = {}
     servo_angles["shoulder_1"] = float(sEntry1.get())
     servo_angles["shoulder_2"] = float(sEntry2.get())
@@ -144,21 +418,22 @@ def execute_servos(sEntry1, sEntry2, sEntry3, sEntry4, eEntry1, eEntry2, eEntry3
     servo_angles["elbow_2"] = float(eEntry2.get())
     servo_angles["elbow_3"] = float(eEntry3.get())
     servo_angles["elbow_4"] = float(eEntry4.get())
-    
-    all_angles_set = True
+    return servo_angles
+
+# Brief: Mueve los servos a la pose indicada, regresa True si todos los servos se movieron.
+#        Se ejecuta en el hilo del ejecutor de movimientos, los avisos los muestra la vista.
+#        Sin duration_per_servo se usa la duracion configurada en DEFAULT_DURATION.
+def execute_servos(servo_angles, duration_per_servo=None):
     start_time = time.time()
 
-    #Se recupera el gpio de cada servo y se manda actualizar su ángulo.
+    #Se recupera el gpio de cada servo y se mandan mover todos al mismo tiempo.
     for servo_name, angle_input in servo_angles.items():
         gpio_pin = servo_gpios[servo_name]
         print(f'Moviendo {servo_name} (GPIO: {gpio_pin}) a {angle_input:.1f}º...')
-        if not move_servo_smooth(gpio_pin, angle_input, duration_sec=duration_per_servo):
-            all_angles_set = False
-    
-    if all_angles_set:
-        messagebox.showinfo('Ángulos actualizados', 'Se han mandado a actualizar la posición de los ángulos. Revisar la consola para más información.')
-    else:
-        messagebox.showerror('Error moviendo servos', 'No todos los servos se movieron a la posición deseada.')
+    with metrics.control_metrics.phase('pose'):
+        all_angles_set = move_servos_sync(servo_angles, duration_sec=duration_per_servo)
+    print(f'Pose completada en {time.time() - start_time:.2f} s')
+    return all_angles_set
 
 
 def home():
@@ -173,189 +448,181 @@ def home():
     servo_angles["elbow_4"] = 170
 
     #Se recupera el gpio de cada servo y se manda actualizar su ángulo.
-    for servo_name, angle_input in servo_angles.items():
-        gpio_pin = servo_gpios[servo_name]
-        time.sleep(0.5)
-        if not servo_set_angle(angle_input, gpio_pin):
-            print('Error colocando los servos en home...')
+    all_home = True
+    with metrics.control_metrics.phase('home'):
+        for servo_name, angle_input in servo_angles.items():
+            gpio_pin = servo_gpios[servo_name]
+            clock.sleep(0.5)
+            if not servo_set_angle(angle_input, gpio_pin):
+                print('Error colocando los servos en home...')
+                all_home = False
 
-    messagebox.showinfo('Ángulos actualizados', 'Se han colocado los servos en home')
+    return all_home
 
 print('Leyendo funciones de control...')
 
 def move_servo(servo_angles, duration=1):
-    for servo_name, angle_input in servo_angles.items():
-        gpio_pin = servo_gpios[servo_name]
-        if not move_servo_smooth(gpio_pin, angle_input, duration_sec=duration):
-            print('Error moviendo servos')
-
-def forward1():
-    print('Forward 1')
-    servo_angles = {}
-
-    # Move to home
-    servo_angles["elbow_1"] = 170
-    servo_angles["elbow_2"] = 20
-    servo_angles["elbow_3"] = 20
-    servo_angles["elbow_4"] = 170
-    servo_angles["shoulder_1"] = 90
-    servo_angles["shoulder_2"] = 90
-    servo_angles["shoulder_3"] = 90
-    servo_angles["shoulder_4"] = 90
+    # Todas las articulaciones de la secuencia se mueven en una sola linea de tiempo
+    if not move_servos_sync(servo_angles, duration_sec=duration):
+        print('Error moviendo servos')
+
+# Brief: Convierte una pose {servo: angulo} en {gpio: pulso}, se usa para compilar las caminatas.
+def pose_to_pulses(pose):
+    return {servo_gpios[servo_name]: angle_to_pulse(angle, servo_gpios[servo_name]) for servo_name, angle in pose.items()}
+
+# Brief: Reproduce una tabla de caminata (ticks x articulaciones en el orden de servo_gpios).
+#        El lazo solo recorre listas de enteros, la etapa de salida manda los GPIO cuyo pulso
+#        cambio en un solo lote por tick. Con period la tabla se reproduce a ese periodo.
+def play_table(table, period=None):
+    gpios = list(servo_gpios.values())
+    if len(table) == 0:
+        return True
 
-    move_servo(servo_angles)
+    try:
+        if OUTPUT_MODE == 'wave':
+            frames_per_tick = max(1, int(round((period or STEP_DELAY) / SERVO_FRAME_PERIOD)))
+            wave.play_segment(pi, gpios, table.tolist(), frames_per_tick, clock=clock, observer=loop_observer)
+            output.mark(gpios, table[-1].tolist())
+            current_servo_pulse_widths.update(zip(gpios, table[-1].tolist()))
+            return True
 
-    # Sequence 1
-    servo_angles = {}  
-    servo_angles['shoulder_2'] = 0
-    servo_angles['shoulder_3'] = 180
-    move_servo(servo_angles)
+        loop = control_loop(period)
+        chunk_start = 0
+        rows = table[:TABLE_CHUNK].tolist()
+        for step in loop.ticks(len(table)):
+            index = step - 1
+            if index >= chunk_start + TABLE_CHUNK:
+                chunk_start = index - index % TABLE_CHUNK
+                rows = table[chunk_start:chunk_start + TABLE_CHUNK].tolist()
+            current_servo_pulse_widths.update(output.write_frame(pi, gpios, rows[index - chunk_start]))
+
+        report_overruns(loop)
+        return True
 
-    # Sequence 2
-    servo_angles = {}
-    servo_angles["elbow_1"] = 110
-    servo_angles['elbow_4'] = 110
-    move_servo(servo_angles)
+    except Exception as e:
+        print(f'Error reproduciendo tabla de caminata: {e}')
+        return False
 
-    # Sequence 3
-    servo_angles = {}
-    servo_angles['shoulder_3'] = 90
-    servo_angles['elbow_4'] = 170
-    servo_angles['elbow_1'] = 170
-    move_servo(servo_angles)
+# Brief: Ejecuta un ciclo de la caminata name, primero se lleva el robot a home y despues
+#        se reproduce la tabla compilada (la compilacion solo ocurre la primera vez).
+def run_gait(name):
+    # NumPy se importa hasta que se usa la primera caminata para no alargar el arranque
+    import PATH_Gait as gait
+    with metrics.control_metrics.phase('home'):
+        move_servo(gait.HOME_POSE)
+    # La tabla supone que el robot esta en home, no se reproduce si se interrumpio el movimiento a home
+    if preempt_event.is_set():
+        print(f'Caminata {name} cancelada, el movimiento a home se interrumpió')
+        return False
+    table = gait.gait_table(name, gait.HOME_POSE, list(servo_gpios.values()), pose_to_pulses, STEP_DELAY, GAIT_MOVE_DURATION, MOTION_PROFILE)
+    with metrics.control_metrics.phase(name):
+        return play_table(table)
+
+# Brief: Ejecuta varios ciclos de caminata seguidos sin regresar a home entre ellos. Se va a
+#        home una sola vez al inicio y los ciclos se reproducen como una sola tabla continua
+#        en la que el final de cada ciclo se traslapa con el inicio del siguiente.
+def run_gait_stream(names):
+    names = list(names)
+    if not names:
+        return True
+    import PATH_Gait as gait
+    with metrics.control_metrics.phase('home'):
+        move_servo(gait.HOME_POSE)
+    if preempt_event.is_set():
+        print('Caminata cancelada, el movimiento a home se interrumpió')
+        return False
+    table = gait.stream_table(names, gait.HOME_POSE, list(servo_gpios.values()), pose_to_pulses, STEP_DELAY, GAIT_MOVE_DURATION, MOTION_PROFILE)
+    print(f'Ejecutando {len(names)} ciclos continuos ({len(table) * STEP_DELAY:.1f} s)')
+    with metrics.control_metrics.phase('stream'):
+        return play_table(table)
+
+# Brief: Tabla de entrada que lleva los servos de su pulso actual al primer tick de una tabla
+#        grabada, con la duracion y el perfil de movimiento actuales. start es {gpio: pulso} de
+#        donde se parte, por defecto current_servo_pulse_widths.
+def lead_in_table(first_row, duration_sec=None, start=None):
+    import PATH_Profiles as profiles
+    gpios = list(servo_gpios.values())
+    num_steps = max(1, int(math.ceil((duration_sec or DEFAULT_DURATION) / STEP_DELAY)))
+    pulses = current_servo_pulse_widths if start is None else start
+    start = [pulses[gpio] for gpio in gpios]
+    return profiles.interpolate(start, first_row, profiles.fractions(MOTION_PROFILE, num_steps))
+
+# Brief: Reproduce un archivo de caminata de PATH_Format a la frecuencia con la que se grabo.
+#        La tabla se abre con memmap y empieza a reproducirse sin leer el archivo completo.
+def play_file(path):
+    import PATH_Format as fmt
+    try:
+        table, rate_hz = fmt.load_frames(path, list(servo_gpios.values()))
+    except (OSError, ValueError) as e:
+        print(f'Error abriendo {path}: {e}')
+        return False
+    if len(table) == 0:
+        return True
+    print(f'Reproduciendo {path}: {len(table)} ticks a {rate_hz:.1f} Hz')
+    with metrics.control_metrics.phase('file'):
+        return play_table(lead_in_table(table[0])) and play_table(table, 1.0 / rate_hz)
+
+# Brief: Compila la caminata parametrica gait_type ('crawl' o 'trot', ver PATH_Locomotion) en
+#        una tabla de pulsos de cycles ciclos, regresa la tabla o None si no se puede ejecutar.
+#        params son los parametros de la caminata (stride, height, cycle_period, duty). Las
+#        longitudes de PATH_IK son provisionales, mientras no se midan solo se permite el
+#        backend simulado para no mandar a los servos angulos calculados con ellas.
+def build_locomotion(gait_type='trot', cycles=4, **params):
+    import PATH_IK as ik
+    import PATH_Locomotion as locomotion
+    if not ik.LINK_LENGTHS_MEASURED and BACKEND != 'sim':
+        print(f'Caminata {gait_type} cancelada: las longitudes de PATH_IK no se han medido, solo se puede usar el backend sim')
+        return None
+    try:
+        table, gait_metrics = locomotion.locomotion_table(gait_type, servo_gpios, angles_to_pulses, STEP_DELAY, cycles, **params)
+    except ValueError as e:
+        print(f'Error generando la caminata {gait_type}: {e}')
+        return None
+    print(f'Caminata {gait_type}: {cycles} ciclos ({len(table) * STEP_DELAY:.1f} s), '
+          f'{gait_metrics["speed_mm_s"]:.0f} mm/s, {gait_metrics["lateral_mm"]:.1f} mm de desplazamiento lateral')
+    return table
+
+# Brief: Camina cycles ciclos con la caminata parametrica (ver build_locomotion). Las patas no
+#        parten de home, por eso primero se lleva cada servo de su pulso actual a la primera
+#        fila de la tabla.
+def run_locomotion(gait_type='trot', cycles=4, **params):
+    table = build_locomotion(gait_type, cycles, **params)
+    if table is None:
+        return False
+    with metrics.control_metrics.phase('locomotion'):
+        return play_table(lead_in_table(table[0])) and play_table(table)
 
-    # Sequence 4
-    servo_angles = {}
-    servo_angles["elbow_4"] = 110
-    servo_angles['elbow_1'] = 110
-    servo_angles["shoulder_2"] = 90
-    move_servo(servo_angles)
+def forward1():
+    print('Forward 1')
+    return run_gait('forward1')
 
-    # Sequence 5
-    servo_angles = {}
-    servo_angles['elbow_1'] = 170
-    servo_angles['elbow_4'] = 170
-    move_servo(servo_angles)
-    
 def rotate1():
     print('Rotate 1')
-    servo_angles = {}
-
-    # Move to home
-    servo_angles["elbow_1"] = 170
-    servo_angles["elbow_2"] = 20
-    servo_angles["elbow_3"] = 20
-    servo_angles["elbow_4"] = 170
-    servo_angles["shoulder_1"] = 90
-    servo_angles["shoulder_2"] = 90
-    servo_angles["shoulder_3"] = 90
-    servo_angles["shoulder_4"] = 90
-    move_servo(servo_angles)
-
-    # Sequence 1
-    servo_angles = {}
-    servo_angles["elbow_1"] = 110
-    servo_angles["elbow_4"] = 110
-    servo_angles["shoulder_3"] = 180
-    move_servo(servo_angles)
-
-    # Sequence 2
-    servo_angles = {}
-    servo_angles["elbow_4"] = 170
-    servo_angles["elbow_1"] = 170
-    move_servo(servo_angles)
-
-    # Sequence 4
-    servo_angles = {}
-    servo_angles["elbow_4"] = 110
-    servo_angles["elbow_1"] = 110
-    servo_angles["shoulder_2"] = 160
-    move_servo(servo_angles)
-
-    # Sequence 5
-    servo_angles = {}
-    servo_angles["elbow_1"] = 170
-    servo_angles["elbow_4"] = 170
-    move_servo(servo_angles)
-
-
-    # Sequence 6
-    servo_angles = {}
-    servo_angles["elbow_3"] = 80
-    servo_angles["elbow_2"] = 80
-    servo_angles["shoulder_1"] = 180
-    move_servo(servo_angles)
-
-    # Sequence 7
-    servo_angles = {}
-    servo_angles["elbow_2"] = 20
-    servo_angles["elbow_3"] = 20
-    move_servo(servo_angles)
+    return run_gait('rotate1')
 
-    # Sequence 8
-    servo_angles = {}
-    servo_angles["elbow_2"] = 80
-    servo_angles["elbow_3"] = 80
-    servo_angles["shoulder_4"] = 180
-    move_servo(servo_angles)
-
-    # Sequence 9
-    servo_angles = {}
-    servo_angles["elbow_3"] = 20
-    servo_angles["elbow_2"] = 20
-    move_servo(servo_angles)
 
-    # Sequence 10
-    servo_angles = {}
-    servo_angles["shoulder_3"] = 90
-    servo_angles["shoulder_4"] = 90
-    servo_angles["shoulder_2"] = 90
-    servo_angles["shoulder_1"] = 90
-    move_servo(servo_angles)
+# Brief: Convierte los waypoints en la lista de ciclos de caminata ('rotate1', 'rotate1_reverse'
+#        y 'forward1') que los recorre, sin mover los servos. Ver PATH_Planner.
+def trajectory_cycles(waypoints):
+    import PATH_Planner as planner
+    print('Waypoints:', waypoints)
+    plan = planner.plan_route(waypoints)
+    cycles = plan['cycles']
+    turns = sum(1 for name in cycles if name != planner.STRIDE)
+    print(f'Ruta con {len(plan["points"])} puntos: {turns} giros y {len(cycles) - turns} pasos, '
+          f'llegada en ({plan["position"][0]:.1f}, {plan["position"][1]:.1f})')
+    return cycles
 
 
 def execute_trajectory(waypoints):
     if not waypoints:
-        messagebox.showerror('Alerta', 'La trayectoria no se ha definido')
-        return
-    x0 = 0
-    y0 = 0
-    print('Waypoints:', waypoints) 
-    for i, data in enumerate(waypoints):
-        if i == 0:
-            continue
-
-        x1 = int(data[0]) * math.cos(data[1] * math.pi / 180)
-        y1 = int(data[0]) * math.sin(data[1] * math.pi / 180)
-
-        X = x1 - x0
-        Y = y1 - y0
-
-        dist = int(math.sqrt(X**2 + Y**2))
-        rot = math.degrees(math.atan2(Y/X))
-
-        print(f'Moviendo a waypoint {i} de {len(waypoints)-1}: ({data[0]},{data[1]})')
-        print(f'Item {i}:  distance: {dist}, rotation: {rot}')
-
-        # Se efectua el giro
-        for k in range(int(rot/10)):
-            if rot != 0:
-                print(f'Ejecutando rotate1: {k}')
-                rotate1()
-            else:
-                print('Trayectoria con rotación vacía')
-
-        # Se efectua el desplazamiento lineal
-        for j in range(dist):
-            if dist != 0:
-                print(f'Ejecutando forward1: {j}')
-                forward1()
-            else:
-                print('Trayectoria con distancia vacía.')
-        
-        # Update initial Point
-        x0 = x1
-        y0 = y1
+        print('La trayectoria no se ha definido')
+        return False
+    cycles = trajectory_cycles(waypoints)
 
+    # Todos los ciclos se ejecutan como una corrida continua, con un solo home al inicio
     print('Ejecutando trayectoria')
-    messagebox.showinfo('Trayectoria mandada a ejecutar', 'Espere a que se termine la trayectoria actual.')
+    if not run_gait_stream(cycles):
+        return False
+    print('Trayectoria terminada')
+    return True
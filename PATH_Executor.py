@@ -0,0 +1,158 @@
+# Brief: Este codigo contiene el ejecutor de movimientos del robot. Los comandos
+#        de movimiento se encolan y se ejecutan en un hilo dedicado para que el
+#        mainloop de Tk nunca se bloquee mientras los servos se mueven.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import queue
+import threading
+
+POLL_INTERVAL_MS = 50
+
+class MotionExecutor:
+    # Brief: Hilo trabajador con una cola de comandos. Cada comando es una funcion
+    #        de PATH_Control con sus argumentos; al terminar se llama on_done(resultado).
+    #        Si se conecta a Tk con attach_tk, los callbacks se ejecutan en el hilo
+    #        de Tk por medio de root.after, de lo contrario en el hilo trabajador.
+    #        preempt es un threading.Event que el movimiento en curso revisa en cada tick
+    #        (ver PATH_Control.preempt_event), se activa para interrumpirlo. stopped es el
+    #        Event que el movimiento activa si de verdad se detuvo antes de terminar
+    #        (PATH_Control.preempt_stopped). Sin los dos, coalesce solo reemplaza a los
+    #        movimientos de la cola.
+    def __init__(self, preempt=None, stopped=None):
+        self._commands = queue.Queue()
+        self._completed = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._current = None
+        self._dropped = set()
+        self._preempt = preempt
+        self._stopped = stopped
+        self._next_id = 0
+        self._root = None
+        self._status_listeners = []
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='motion-executor', daemon=True)
+        self._thread.start()
+
+    # Brief: Encola un movimiento y regresa su id. name es el texto que se muestra en el estado.
+    #        Con coalesce el movimiento reemplaza a los que esperan en la cola con la misma
+    #        llave, y si no hay nada mas antes que el, interrumpe al que se esta ejecutando con
+    #        esa llave; el nuevo parte del pulso interpolado en que se quedo. Los movimientos
+    #        reemplazados en la cola no se ejecutan y llaman on_dropped(), los que se detuvieron
+    #        antes de terminar no llaman on_done (preempted() dice si el movimiento en curso se
+    #        detuvo). Uno que ya habia terminado cuando llega el nuevo llama on_done normalmente.
+    def submit(self, name, fn, *args, on_done=None, on_dropped=None, coalesce=None, **kwargs):
+        dropped = []
+        with self._lock:
+            self._next_id += 1
+            job_id = self._next_id
+            if coalesce is not None:
+                dropped = [job for job in self._pending if job[2] == coalesce]
+                self._dropped.update(job[0] for job in dropped)
+                self._pending = [job for job in self._pending if job[2] != coalesce]
+                current = self._current
+                if current is not None and current[2] == coalesce and not self._pending and self._stopped is not None:
+                    self._preempt.set()
+            self._pending.append((job_id, name, coalesce, on_dropped))
+        self._commands.put((job_id, name, fn, args, kwargs, on_done))
+        for job in dropped:
+            if job[3] is not None:
+                self._dispatch(job[3])
+        self._notify_status()
+        return job_id
+
+    # Brief: True si el movimiento en curso se detuvo antes de terminar porque llego otro, se
+    #        llama desde el movimiento mismo (en el hilo del ejecutor) para saber como termino.
+    def preempted(self):
+        return self._stopped is not None and self._stopped.is_set()
+
+    def is_busy(self):
+        with self._lock:
+            return self._current is not None or bool(self._pending)
+
+    # Brief: Texto con el movimiento actual y el numero de movimientos en cola.
+    def status(self):
+        with self._lock:
+            current = self._current
+            queued = len(self._pending)
+        if current is None:
+            return 'Motion: idle'
+        if queued:
+            return f'Motion: running {current[1]} ({queued} queued)'
+        return f'Motion: running {current[1]}'
+
+    # Brief: Registra una funcion que recibe el texto de estado cada vez que cambia.
+    def add_status_listener(self, listener):
+        self._status_listeners.append(listener)
+        listener(self.status())
+
+    # Brief: Conecta el ejecutor al root de Tk, a partir de aqui los callbacks de
+    #        terminado y de estado se despachan en el hilo de Tk con root.after.
+    def attach_tk(self, root):
+        self._root = root
+        root.after(POLL_INTERVAL_MS, self._poll_tk)
+
+    def shutdown(self):
+        self._running = False
+        self._commands.put(None)
+
+    def _run(self):
+        while self._running:
+            command = self._commands.get()
+            if command is None:
+                break
+            job_id, name, fn, args, kwargs, on_done = command
+            with self._lock:
+                if job_id in self._dropped:
+                    self._dropped.discard(job_id)
+                    continue
+                current = next(job for job in self._pending if job[0] == job_id)
+                self._pending = [job for job in self._pending if job[0] != job_id]
+                self._current = current
+                if self._stopped is not None:
+                    self._preempt.clear()
+                    self._stopped.clear()
+            self._notify_status()
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                print(f'Error ejecutando {name}: {e}')
+                result = False
+
+            # El movimiento ya termino; un preempt que llegue desde aqui no lo detiene, solo el
+            # que el movimiento reporto en stopped cuenta
+            with self._lock:
+                self._current = None
+            preempted = self.preempted()
+            self._notify_status()
+            if on_done is not None and not preempted:
+                self._dispatch(on_done, result)
+
+    def _dispatch(self, callback, *args):
+        if self._root is None:
+            callback(*args)
+        else:
+            self._completed.put((callback, args))
+
+    def _notify_status(self):
+        text = self.status()
+        for listener in self._status_listeners:
+            self._dispatch(listener, text)
+
+    # Brief: Se ejecuta en el hilo de Tk, vacia los callbacks pendientes y se vuelve a programar.
+    def _poll_tk(self):
+        while True:
+            try:
+                callback, args = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f'Error en callback del ejecutor: {e}')
+        if self._running:
+            self._root.after(POLL_INTERVAL_MS, self._poll_tk)
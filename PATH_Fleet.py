@@ -0,0 +1,198 @@
+# Brief: Este codigo contiene el control de varios robots desde una sola estacion. Cada robot
+#        tiene su propia conexion a pigpiod (host y puerto), su propio proceso de control (ver
+#        PATH_Process, cada proceso tiene su copia del estado de PATH_Control), sus pulsos y su
+#        ejecutor de movimientos. Los comandos de la flota se mandan a todos los robots al mismo
+#        tiempo, cada uno desde su ejecutor, con un tiempo de inicio comun para que todos
+#        empiecen el movimiento juntos.
+#        Uso: python3 PATH_Fleet.py --robot r1=192.168.1.10 --robot r2=192.168.1.11:8888 --gait forward1
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import argparse
+import threading
+import time
+import PATH_Control as control
+from PATH_Executor import MotionExecutor
+from PATH_Process import RemoteControl
+
+# Margen entre que se manda un comando de flota y su tiempo de inicio, debe alcanzar para que
+# todos los ejecutores tomen el comando y lo escriban en el buffer de su proceso
+START_DELAY = 0.2
+
+class Robot:
+    # Brief: Un robot de la flota. Las funciones de movimiento son las de RemoteControl
+    #        (execute_servos, home, run_gait, execute_trajectory, play_file...) y se ejecutan en
+    #        el ejecutor propio del robot.
+    def __init__(self, name, host='localhost', port=8888, backend=None):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.backend = backend or control.BACKEND
+        self.current_servo_pulse_widths = {gpio: 1500 for gpio in control.servo_gpios.values()}
+        self.engine = RemoteControl(self.current_servo_pulse_widths)
+        self.executor = MotionExecutor()
+        self.connected = False
+        self.last_result = None
+
+    def connect(self):
+        # Los procesos de la flota no se fijan a un nucleo, todos compartirian el mismo
+        self.connected = self.engine.connect(self.backend, self.host, self.port, cpu=None)
+        if not self.connected:
+            print(f'No se pudo conectar el robot {self.name} en {self.host}:{self.port}')
+        return self.connected
+
+    # Brief: Manda una funcion del engine al ejecutor del robot. Con start_at (time.monotonic)
+    #        el primer comando que llegue al proceso espera a ese tiempo para empezar.
+    def submit(self, method, *args, start_at=0.0, on_done=None):
+        return self.executor.submit(f'{self.name}: {method}', self._run, method, args, start_at, on_done=on_done)
+
+    def _run(self, method, args, start_at):
+        if not self.connected:
+            print(f'Robot {self.name} no conectado')
+            self.last_result = False
+            return False
+        self.engine.process.start_at = start_at
+        self.last_result = bool(getattr(self.engine, method)(*args))
+        return self.last_result
+
+    # Brief: Diccionario con el estado del robot.
+    def state(self):
+        state = {
+            'name': self.name,
+            'host': self.host,
+            'port': self.port,
+            'connected': self.connected,
+            'busy': self.executor.is_busy(),
+            'status': self.executor.status(),
+            'last_result': self.last_result,
+            'pulses': dict(self.current_servo_pulse_widths),
+        }
+        if self.connected:
+            state['pulses'] = self.engine.process.current_pulses()
+            state['started'] = self.engine.process.last_started()
+            state.update(self.engine.process.counters())
+        return state
+
+    def shutdown(self):
+        self.executor.shutdown()
+        self.engine.shutdown()
+        self.connected = False
+
+class Fleet:
+    # Brief: Conjunto de robots. broadcast manda la misma funcion a todos y run ademas espera a
+    #        que todos terminen; regresa {nombre: resultado}.
+    def __init__(self, robots=()):
+        self.robots = {}
+        for robot in robots:
+            self.add(robot)
+
+    def add(self, robot):
+        if robot.name in self.robots:
+            raise ValueError(f'Ya existe un robot llamado {robot.name}')
+        self.robots[robot.name] = robot
+        return robot
+
+    # Brief: Conecta todos los robots en paralelo, regresa {nombre: conectado}.
+    def connect(self):
+        return self._fan_out(lambda robot, on_done: robot.executor.submit(f'{robot.name}: connect', robot.connect, on_done=on_done))
+
+    # Brief: Manda method(*args) a todos los robots sin esperar. Con sync todos empiezan en el
+    #        mismo tiempo de inicio. on_done recibe {nombre: resultado} cuando todos terminan.
+    def broadcast(self, method, *args, sync=True, on_done=None):
+        start_at = time.monotonic() + START_DELAY if sync else 0.0
+        return self._fan_out(lambda robot, done: robot.submit(method, *args, start_at=start_at, on_done=done),
+                             wait=False, on_done=on_done)
+
+    def run(self, method, *args, sync=True):
+        finished = threading.Event()
+        results = {}
+
+        def on_done(fleet_results):
+            results.update(fleet_results)
+            finished.set()
+
+        if not self.robots:
+            return results
+        self.broadcast(method, *args, sync=sync, on_done=on_done)
+        finished.wait()
+        return results
+
+    def _fan_out(self, submit, wait=True, on_done=None):
+        results = {}
+        lock = threading.Lock()
+        finished = threading.Event()
+        names = list(self.robots)
+
+        def robot_done(name, result):
+            with lock:
+                results[name] = result
+                complete = len(results) == len(names)
+            if complete:
+                finished.set()
+                if on_done is not None:
+                    on_done({name: results[name] for name in names})
+
+        for name in names:
+            submit(self.robots[name], lambda result, name=name: robot_done(name, result))
+        if wait and names:
+            finished.wait()
+            return {name: results[name] for name in names}
+        return None
+
+    def execute_servos(self, servo_angles, duration_per_servo=None):
+        return self.run('execute_servos', servo_angles, duration_per_servo)
+
+    def home(self):
+        return self.run('home')
+
+    def run_gait(self, name):
+        return self.run('run_gait', name)
+
+    def execute_trajectory(self, waypoints):
+        return self.run('execute_trajectory', waypoints)
+
+    def state(self):
+        return {name: robot.state() for name, robot in self.robots.items()}
+
+    # Brief: Diferencia en segundos entre el primer y el ultimo robot en empezar su ultimo comando.
+    def start_skew(self):
+        started = [robot.engine.process.last_started() for robot in self.robots.values() if robot.connected]
+        return max(started) - min(started) if started else 0.0
+
+    def shutdown(self):
+        for robot in self.robots.values():
+            robot.shutdown()
+
+# Brief: Convierte 'nombre=host:puerto' (el puerto es opcional) en un Robot.
+def parse_robot(text, backend=None):
+    name, _, address = text.partition('=')
+    if not address:
+        raise ValueError(f'Robot inválido {text}, se espera nombre=host[:puerto]')
+    host, _, port = address.partition(':')
+    return Robot(name, host, int(port) if port else 8888, backend)
+
+def main():
+    parser = argparse.ArgumentParser(description='Control de varios robots PATH')
+    parser.add_argument('--robot', action='append', required=True, help='nombre=host[:puerto], se puede repetir')
+    parser.add_argument('--backend', choices=control.BACKENDS, default=control.BACKEND)
+    parser.add_argument('--gait', help='caminata que ejecutan todos los robots')
+    parser.add_argument('--count', type=int, default=1)
+    args = parser.parse_args()
+
+    fleet = Fleet(parse_robot(text, args.backend) for text in args.robot)
+    control.load_calibration()
+    try:
+        connected = fleet.connect()
+        print(f'Robots conectados: {connected}')
+        if not all(connected.values()):
+            return
+        print(f'Home: {fleet.home()}')
+        for cycle in range(args.count if args.gait else 0):
+            print(f'{args.gait} {cycle + 1}: {fleet.run_gait(args.gait)}, desfase de inicio {fleet.start_skew() * 1000:.2f} ms')
+    finally:
+        fleet.shutdown()
+
+if __name__ == '__main__':
+    main()
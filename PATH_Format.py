@@ -0,0 +1,145 @@
+# Brief: Este codigo contiene el formato binario de archivos de PATH para caminatas y
+#        trayectorias. Un archivo es un encabezado de 64 bytes (tipo, frecuencia, escala y
+#        mapa de articulaciones) seguido de una tabla de int16 (filas x columnas). Las
+#        caminatas guardan el pulso de las 8 articulaciones en cada tick y las trayectorias
+#        guardan los waypoints (distancia, angulo) en decimas. La tabla se abre con
+#        numpy.memmap, asi un archivo grande se reproduce sin leerlo ni convertirlo antes.
+#        Uso: python3 PATH_Format.py --gait forward1 --out forward1.pgt
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import argparse
+import struct
+import numpy as np
+from PATH_Scheduler import SERVO_FRAME_HZ, align_rate
+
+MAGIC = b'PATH'
+VERSION = 1
+KIND_FRAMES = 1
+KIND_WAYPOINTS = 2
+HEADER_SIZE = 64
+MAX_COLUMNS = 16
+# Sin gpio en el mapa de articulaciones
+NO_GPIO = 0xFF
+# Los waypoints se guardan en decimas de unidad y de grado
+WAYPOINT_SCALE = 10
+
+FRAMES_EXTENSION = '.pgt'
+WAYPOINTS_EXTENSION = '.pwp'
+
+# magic, version, tipo, filas, columnas, escala, frecuencia en Hz y mapa de articulaciones
+_HEADER = struct.Struct(f'<4sHHIHHf{MAX_COLUMNS}s')
+_DTYPE = np.dtype('<i2')
+_LIMITS = np.iinfo(_DTYPE)
+
+# Brief: Lanza ValueError si algun valor de la tabla no cabe en int16 (se guardaria con otro
+#        valor). Con scale el mensaje da el limite en unidades del usuario.
+def _check_range(table, scale=1):
+    if table.size and (table.min() < _LIMITS.min or table.max() > _LIMITS.max):
+        raise ValueError(f'Valores fuera de rango, el archivo guarda de {_LIMITS.min / scale:g} a {_LIMITS.max / scale:g}')
+
+# Brief: Valida la frecuencia de una caminata, debe ser un divisor entero del marco de 50 Hz
+#        (50, 25, 16.7, 12.5...) porque el lazo de control solo corre a esas frecuencias; con
+#        otra frecuencia la caminata se reproduciria con otra duracion. Regresa la frecuencia
+#        exacta (el encabezado la guarda como float32) o lanza ValueError.
+def frame_rate(rate_hz):
+    aligned = align_rate(rate_hz)
+    if abs(aligned - rate_hz) > 1e-4 * aligned:
+        raise ValueError(f'Frecuencia de {rate_hz:g} Hz no soportada, debe dividir los {SERVO_FRAME_HZ} Hz del servo '
+                         f'(la más cercana es {aligned:g} Hz)')
+    return aligned
+
+def _write(path, kind, table, scale, rate_hz, joint_gpios):
+    source = np.asarray(table)
+    if source.ndim != 2 or source.shape[1] > MAX_COLUMNS:
+        raise ValueError(f'Tabla inválida con forma {source.shape}')
+    _check_range(source, scale)
+    table = np.ascontiguousarray(source, dtype=_DTYPE)
+    joint_map = bytes(joint_gpios) + bytes([NO_GPIO]) * (MAX_COLUMNS - len(joint_gpios))
+    header = _HEADER.pack(MAGIC, VERSION, kind, table.shape[0], table.shape[1], scale, rate_hz, joint_map)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(table.tobytes())
+
+# Brief: Lee el encabezado de un archivo, regresa un diccionario con sus campos.
+def read_header(path):
+    with open(path, 'rb') as f:
+        data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f'{path} no es un archivo de PATH')
+    magic, version, kind, rows, columns, scale, rate_hz, joint_map = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f'{path} no es un archivo de PATH')
+    if version != VERSION:
+        raise ValueError(f'Versión {version} de {path} no soportada')
+    return {
+        'kind': kind,
+        'rows': rows,
+        'columns': columns,
+        'scale': scale,
+        'rate_hz': rate_hz,
+        'joint_gpios': [gpio for gpio in joint_map[:columns]],
+    }
+
+# Brief: Abre la tabla del archivo sin leerla, regresa (encabezado, memmap de solo lectura).
+def open_table(path):
+    header = read_header(path)
+    if header['rows'] == 0:
+        return header, np.zeros((0, header['columns']), dtype=_DTYPE)
+    table = np.memmap(path, dtype=_DTYPE, mode='r', offset=HEADER_SIZE, shape=(header['rows'], header['columns']))
+    return header, table
+
+# Brief: Guarda una tabla de pulsos (ticks x articulaciones) reproducida a rate_hz, joint_gpios
+#        es el gpio de cada columna.
+def save_frames(path, frames, rate_hz, joint_gpios):
+    rate_hz = frame_rate(rate_hz)
+    _write(path, KIND_FRAMES, frames, 1, rate_hz, joint_gpios)
+
+# Brief: Abre una tabla de pulsos con las columnas en el orden de joint_gpios, regresa
+#        (tabla, frecuencia en Hz). Si el archivo tiene el mismo orden la tabla es el memmap.
+#        Lanza ValueError si la frecuencia del archivo no es una de las del lazo de control.
+def load_frames(path, joint_gpios):
+    header, table = open_table(path)
+    if header['kind'] != KIND_FRAMES:
+        raise ValueError(f'{path} no contiene una caminata')
+    if header['joint_gpios'] != list(joint_gpios):
+        missing = set(joint_gpios) - set(header['joint_gpios'])
+        if missing:
+            raise ValueError(f'{path} no tiene los gpio {sorted(missing)}')
+        table = table[:, [header['joint_gpios'].index(gpio) for gpio in joint_gpios]]
+    return table, frame_rate(header['rate_hz'])
+
+# Brief: Guarda los waypoints (distancia, angulo) en decimas, lanza ValueError si alguno no cabe.
+def save_waypoints(path, waypoints):
+    table = np.rint(np.array(waypoints, dtype=np.float64).reshape(-1, 2) * WAYPOINT_SCALE)
+    _write(path, KIND_WAYPOINTS, table, WAYPOINT_SCALE, 0.0, [])
+
+# Brief: Regresa la lista de waypoints (distancia, angulo) del archivo.
+def load_waypoints(path):
+    header, table = open_table(path)
+    if header['kind'] != KIND_WAYPOINTS:
+        raise ValueError(f'{path} no contiene waypoints')
+    return [(dist / header['scale'], angle / header['scale']) for dist, angle in table.tolist()]
+
+# Brief: Compila una caminata de PATH_Gait con la calibracion y la configuracion actuales y la
+#        guarda en path.
+def export_gait(name, path):
+    import PATH_Control as control
+    import PATH_Gait as gait
+    gpios = list(control.servo_gpios.values())
+    table = gait.gait_table(name, gait.HOME_POSE, gpios, control.pose_to_pulses, control.STEP_DELAY,
+                            control.GAIT_MOVE_DURATION, control.MOTION_PROFILE)
+    save_frames(path, table, 1.0 / control.STEP_DELAY, gpios)
+    print(f'Caminata {name} guardada en {path} ({len(table)} ticks)')
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta una caminata de PATH_Gait al formato binario')
+    parser.add_argument('--gait', required=True)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+    export_gait(args.gait, args.out)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# Brief: Este codigo contiene las secuencias de caminata del robot y su compilacion
+#        en tablas. Cada secuencia de poses se compila una sola vez en un arreglo de
+#        NumPy con el pulso de cada articulacion en cada tick del lazo de control, la
+#        tabla se guarda en memoria (y opcionalmente en disco) y se reproduce tal cual.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import hashlib
+import math
+import os
+import numpy as np
+import PATH_Profiles as profiles
+
+HOME_POSE = {
+    'elbow_1': 170,
+    'elbow_2': 20,
+    'elbow_3': 20,
+    'elbow_4': 170,
+    'shoulder_1': 90,
+    'shoulder_2': 90,
+    'shoulder_3': 90,
+    'shoulder_4': 90,
+}
+
+# Secuencias de forward1 y rotate1 a partir de home, cada elemento es una pose
+# parcial que se mueve con move_servo
+FORWARD1_SEQUENCE = [
+    {'shoulder_2': 0, 'shoulder_3': 180},
+    {'elbow_1': 110, 'elbow_4': 110},
+    {'shoulder_3': 90, 'elbow_4': 170, 'elbow_1': 170},
+    {'elbow_4': 110, 'elbow_1': 110, 'shoulder_2': 90},
+    {'elbow_1': 170, 'elbow_4': 170},
+]
+
+ROTATE1_SEQUENCE = [
+    {'elbow_1': 110, 'elbow_4': 110, 'shoulder_3': 180},
+    {'elbow_4': 170, 'elbow_1': 170},
+    {'elbow_4': 110, 'elbow_1': 110, 'shoulder_2': 160},
+    {'elbow_1': 170, 'elbow_4': 170},
+    {'elbow_3': 80, 'elbow_2': 80, 'shoulder_1': 180},
+    {'elbow_2': 20, 'elbow_3': 20},
+    {'elbow_2': 80, 'elbow_3': 80, 'shoulder_4': 180},
+    {'elbow_3': 20, 'elbow_2': 20},
+    {'shoulder_3': 90, 'shoulder_4': 90, 'shoulder_2': 90, 'shoulder_1': 90},
+]
+
+# Brief: Refleja una secuencia respecto al plano medio del robot, los hombros giran al lado
+#        contrario (angulo reflejado alrededor de 90) y los codos no cambian. Con ROTATE1
+#        se obtiene el giro en el sentido contrario.
+def mirror_sequence(sequence):
+    return [{name: 180 - angle if name.startswith('shoulder') else angle for name, angle in step_pose.items()}
+            for step_pose in sequence]
+
+ROTATE1_REVERSE_SEQUENCE = mirror_sequence(ROTATE1_SEQUENCE)
+
+GAITS = {
+    'forward1': FORWARD1_SEQUENCE,
+    'rotate1': ROTATE1_SEQUENCE,
+    'rotate1_reverse': ROTATE1_REVERSE_SEQUENCE,
+}
+
+# Carpeta para guardar las tablas compiladas en disco, None para usar solo memoria
+GAIT_CACHE_DIR = None
+
+_table_cache = {}
+
+# Brief: Convierte las poses de la secuencia en vectores de pulsos objetivo. Cada pose
+#        parcial se aplica sobre la pose anterior, las articulaciones que no aparecen
+#        conservan su pulso. pose_to_pulses recibe una pose completa y regresa
+#        {gpio: pulso}, joint_gpios define el orden de las columnas de la tabla.
+def keyframe_pulses(sequence, start_pose, joint_gpios, pose_to_pulses):
+    pose = dict(start_pose)
+    start = pose_to_pulses(pose)
+    keyframes = []
+    for step_pose in sequence:
+        pose.update(step_pose)
+        pulses = pose_to_pulses(pose)
+        keyframes.append([pulses[gpio] for gpio in joint_gpios])
+    return np.array([start[gpio] for gpio in joint_gpios], dtype=np.int16), np.array(keyframes, dtype=np.int16)
+
+# Brief: Compila los pulsos objetivo en una tabla (ticks x articulaciones) de int16. Cada
+#        pose toma steps_per_move ticks con el perfil de movimiento profile sobre la misma
+#        linea de tiempo, igual que move_servos_sync; las poses sin cambios no agregan ticks.
+def compile_table(start_pulses, keyframes, steps_per_move, profile='linear'):
+    fractions = profiles.fractions(profile, steps_per_move)
+    segments = []
+    previous = start_pulses
+    for target in keyframes:
+        if np.array_equal(previous, target):
+            continue
+        segments.append(profiles.interpolate(previous, target, fractions))
+        previous = target
+    if not segments:
+        return np.empty((0, len(start_pulses)), dtype=np.int16)
+    return np.concatenate(segments)
+
+def _table_key(start_pulses, keyframes, steps_per_move, profile):
+    digest = hashlib.sha1()
+    digest.update(start_pulses.tobytes())
+    digest.update(keyframes.tobytes())
+    digest.update(f'{steps_per_move}:{profile}'.encode())
+    return digest.hexdigest()[:16]
+
+# Brief: Regresa la tabla compilada de la caminata name. La primera llamada compila la
+#        secuencia (o la lee de GAIT_CACHE_DIR), las siguientes la toman de memoria sin
+#        recalcular nada. La tabla supone que el robot parte de start_pose.
+def gait_table(name, start_pose, joint_gpios, pose_to_pulses, period, move_duration, profile='linear'):
+    steps_per_move = max(1, int(math.ceil(move_duration / period)))
+    memory_key = (name, tuple(sorted(start_pose.items())), tuple(joint_gpios), steps_per_move, profile)
+    table = _table_cache.get(memory_key)
+    if table is not None:
+        return table
+
+    start_pulses, keyframes = keyframe_pulses(GAITS[name], start_pose, joint_gpios, pose_to_pulses)
+    path = None
+    if GAIT_CACHE_DIR is not None:
+        key = _table_key(start_pulses, keyframes, steps_per_move, profile)
+        path = os.path.join(GAIT_CACHE_DIR, f'{name}_{key}.npy')
+        if os.path.exists(path):
+            table = np.load(path)
+
+    if table is None:
+        table = compile_table(start_pulses, keyframes, steps_per_move, profile)
+        if path is not None:
+            os.makedirs(GAIT_CACHE_DIR, exist_ok=True)
+            np.save(path, table)
+
+    table.setflags(write=False)
+    _table_cache[memory_key] = table
+    return table
+
+# Brief: Encadena los ciclos de las caminatas names en una sola secuencia. La ultima pose
+#        de un ciclo y la primera del siguiente se mezclan en una sola cuando mueven
+#        articulaciones distintas, asi los ciclos se traslapan en lugar de esperar uno al otro.
+def chain_sequences(names):
+    sequence = []
+    for name in names:
+        cycle = GAITS[name]
+        if sequence and cycle and not set(sequence[-1]) & set(cycle[0]):
+            sequence[-1] = {**sequence[-1], **cycle[0]}
+            cycle = cycle[1:]
+        sequence += [dict(step_pose) for step_pose in cycle]
+    return sequence
+
+# Brief: Compila una corrida continua de varios ciclos (por ejemplo toda una trayectoria)
+#        en una sola tabla, el robot parte de start_pose una sola vez al inicio.
+def stream_table(names, start_pose, joint_gpios, pose_to_pulses, period, move_duration, profile='linear'):
+    steps_per_move = max(1, int(math.ceil(move_duration / period)))
+    start_pulses, keyframes = keyframe_pulses(chain_sequences(names), start_pose, joint_gpios, pose_to_pulses)
+    if len(keyframes) == 0:
+        return np.empty((0, len(joint_gpios)), dtype=np.int16)
+    return compile_table(start_pulses, keyframes, steps_per_move, profile)
+
+# Brief: Borra las tablas en memoria, se debe llamar si cambia la conversion de angulo a pulso.
+def clear_cache():
+    _table_cache.clear()
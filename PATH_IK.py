@@ -0,0 +1,154 @@
+# Brief: Este codigo contiene la cinematica inversa de las patas. Cada pata tiene el servo
+#        del hombro, que gira la pata en el plano horizontal, y el servo del codo, que mueve
+#        la tibia por medio de un mecanismo de cuatro barras. Las funciones reciben arreglos
+#        de NumPy con posiciones del pie (x adelante, y hacia afuera, z hacia abajo, en mm
+#        desde el eje del hombro) y regresan los angulos de los servos para toda la
+#        trayectoria en una sola operacion. Para la altura se puede usar una tabla
+#        precalculada, asi cada pie cuesta una busqueda en un arreglo.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import numpy as np
+
+# Longitudes de los eslabones en mm. Son valores provisionales: hasta medirlas en el robot y
+# poner LINK_LENGTHS_MEASURED en True, las caminatas calculadas con la cinematica solo se
+# ejecutan en el backend simulado (ver PATH_Control.build_locomotion).
+LINK_LENGTHS_MEASURED = False
+FEMUR_LENGTH = 45.0     # Eje del hombro a la rodilla, horizontal
+TIBIA_LENGTH = 80.0     # Rodilla al pie
+CRANK_LENGTH = 12.0     # Cuatro barras: brazo del servo del codo
+COUPLER_LENGTH = 42.0   # Cuatro barras: biela
+ROCKER_LENGTH = 18.0    # Cuatro barras: palanca de la rodilla
+GROUND_LENGTH = 40.0    # Cuatro barras: eje del servo al eje de la rodilla
+
+# Angulo de la manivela con el codo en home (tibia vertical, pie en su punto mas bajo) y
+# carrera maxima de levantamiento. Fuera de este rango la palanca deja de ser monotona.
+CRANK_HOME_DEG = 20.0
+MAX_LIFT_DEG = 140.0
+
+# Articulaciones de cada pata y montaje de los servos, inferido de FORWARD1_SEQUENCE y
+# ROTATE1_SEQUENCE: en home los hombros estan a 90, un signo de hombro positivo significa que
+# subir el angulo lleva el pie hacia adelante, y el signo del codo es la direccion del servo
+# que levanta el pie (los codos 1 y 4 levantan bajando de 170, el 2 y el 3 subiendo de 20).
+LEG_JOINTS = {
+    1: ('shoulder_1', 'elbow_1'),
+    2: ('shoulder_2', 'elbow_2'),
+    3: ('shoulder_3', 'elbow_3'),
+    4: ('shoulder_4', 'elbow_4'),
+}
+SHOULDER_HOME = 90.0
+SHOULDER_SIGN = {1: 1, 2: -1, 3: 1, 4: -1}
+ELBOW_HOME = {1: 170.0, 2: 20.0, 3: 20.0, 4: 170.0}
+ELBOW_SIGN = {1: -1, 2: 1, 3: 1, 4: -1}
+
+# Resolucion por defecto de la tabla de alturas en mm
+GRID_RESOLUTION = 0.1
+# Diferencia maxima en mm entre la distancia horizontal pedida del hombro al pie y la que da la
+# pata para esa altura. La pata tiene dos grados de libertad, para cada altura el pie solo puede
+# estar sobre un circulo alrededor del hombro.
+REACH_TOLERANCE = 0.5
+
+# Constantes de la ecuacion de Freudenstein del cuatro barras
+_K1 = GROUND_LENGTH / CRANK_LENGTH
+_K2 = GROUND_LENGTH / ROCKER_LENGTH
+_K3 = (CRANK_LENGTH ** 2 - COUPLER_LENGTH ** 2 + ROCKER_LENGTH ** 2 + GROUND_LENGTH ** 2) / (2 * CRANK_LENGTH * ROCKER_LENGTH)
+
+# Brief: Angulo de la palanca (rad) para un angulo de la manivela (rad), configuracion abierta.
+def rocker_angle(crank):
+    crank = np.asarray(crank, dtype=np.float64)
+    a = _K1 - np.cos(crank)
+    b = -np.sin(crank)
+    c = _K2 * np.cos(crank) - _K3
+    return np.arctan2(b, a) + np.arccos(np.clip(c / np.hypot(a, b), -1.0, 1.0))
+
+# Brief: Angulo de la manivela (rad) para un angulo de la palanca (rad), inversa de rocker_angle.
+def crank_angle(rocker):
+    rocker = np.asarray(rocker, dtype=np.float64)
+    a = np.cos(rocker) + _K2
+    b = np.sin(rocker)
+    c = _K1 * np.cos(rocker) + _K3
+    ratio = c / np.hypot(a, b)
+    crank = np.arctan2(b, a) + np.arccos(np.clip(ratio, -1.0, 1.0))
+    return np.where(np.abs(ratio) <= 1.0, crank, np.nan)
+
+_CRANK_HOME = np.radians(CRANK_HOME_DEG)
+_ROCKER_HOME = float(rocker_angle(_CRANK_HOME))
+
+# Brief: Levantamiento del codo (grados de servo desde home, en direccion de levantar) para
+#        una altura del pie z. Regresa NaN si la altura no se alcanza.
+def lift_from_height(z):
+    z = np.asarray(z, dtype=np.float64)
+    # Angulo de la tibia bajo la horizontal, 90 grados en home; se usa la rama hacia afuera
+    tibia = np.arcsin(np.clip(z / TIBIA_LENGTH, -1.0, 1.0))
+    crank = crank_angle(_ROCKER_HOME + (np.pi / 2 - tibia))
+    lift = np.degrees(crank - _CRANK_HOME)
+    valid = (np.abs(z) <= TIBIA_LENGTH) & (lift >= -1e-9) & (lift <= MAX_LIFT_DEG + 1e-9)
+    return np.where(valid, np.clip(lift, 0.0, MAX_LIFT_DEG), np.nan)
+
+_grid_cache = {}
+
+# Brief: Tabla de levantamiento del codo contra altura del pie, de 0 a TIBIA_LENGTH mm cada
+#        resolution mm. Se calcula una sola vez por resolucion.
+def height_grid(resolution=GRID_RESOLUTION):
+    grid = _grid_cache.get(resolution)
+    if grid is None:
+        heights = np.arange(0.0, TIBIA_LENGTH + resolution / 2, resolution)
+        grid = lift_from_height(heights)
+        grid.setflags(write=False)
+        _grid_cache[resolution] = grid
+    return grid
+
+def _grid_lift(z, resolution):
+    grid = height_grid(resolution)
+    z = np.asarray(z, dtype=np.float64)
+    index = np.rint(z / resolution)
+    inside = (index >= 0) & (index < len(grid))
+    return np.where(inside, grid[np.clip(index, 0, len(grid) - 1).astype(np.intp)], np.nan)
+
+# Brief: Distancia horizontal del hombro al pie con el pie a la altura z.
+def reach_at_height(z):
+    tibia = np.arcsin(np.clip(np.asarray(z, dtype=np.float64) / TIBIA_LENGTH, -1.0, 1.0))
+    return FEMUR_LENGTH + TIBIA_LENGTH * np.cos(tibia)
+
+# Brief: Angulos de hombro y codo de la pata leg para un arreglo de posiciones del pie con
+#        forma (..., 3). La direccion de (x, y) da el giro del hombro y z la altura; con
+#        use_grid se usa la tabla de alturas. Las posiciones que no se alcanzan dan NaN,
+#        incluidas las que estan fuera del circulo que alcanza la pata a esa altura.
+def leg_angles(leg, feet, use_grid=False, resolution=GRID_RESOLUTION):
+    feet = np.asarray(feet, dtype=np.float64)
+    x, y, z = feet[..., 0], feet[..., 1], feet[..., 2]
+    shoulder = SHOULDER_HOME + SHOULDER_SIGN[leg] * np.degrees(np.arctan2(x, y))
+    lift = _grid_lift(z, resolution) if use_grid else lift_from_height(z)
+    elbow = ELBOW_HOME[leg] + ELBOW_SIGN[leg] * lift
+    off_reach = np.abs(np.hypot(x, y) - reach_at_height(z)) > REACH_TOLERANCE
+    outside = off_reach | np.isnan(lift) | (shoulder < 0) | (shoulder > 180) | (elbow < 0) | (elbow > 180)
+    return np.where(outside, np.nan, shoulder), np.where(outside, np.nan, elbow)
+
+# Brief: Cinematica directa, posicion del pie (..., 3) para los angulos de los servos de leg.
+def foot_position(leg, shoulder, elbow):
+    yaw = np.radians((np.asarray(shoulder, dtype=np.float64) - SHOULDER_HOME) * SHOULDER_SIGN[leg])
+    lift = (np.asarray(elbow, dtype=np.float64) - ELBOW_HOME[leg]) * ELBOW_SIGN[leg]
+    rocker = rocker_angle(_CRANK_HOME + np.radians(lift))
+    tibia = np.pi / 2 - (rocker - _ROCKER_HOME)
+    reach = FEMUR_LENGTH + TIBIA_LENGTH * np.cos(tibia)
+    return np.stack([reach * np.sin(yaw), reach * np.cos(yaw), TIBIA_LENGTH * np.sin(tibia)], axis=-1)
+
+# Brief: Posicion del pie de leg con la pata en home.
+def home_foot(leg):
+    return foot_position(leg, SHOULDER_HOME, ELBOW_HOME[leg])
+
+# Brief: Resuelve varias patas a la vez. feet_by_leg es {pata: arreglo (n, 3)}, regresa
+#        {articulacion: arreglo de n angulos} con los nombres de PATH_Control.servo_gpios.
+#        Lanza ValueError si alguna posicion no se alcanza.
+def solve_legs(feet_by_leg, use_grid=False):
+    angles = {}
+    for leg, feet in feet_by_leg.items():
+        shoulder, elbow = leg_angles(leg, feet, use_grid)
+        if np.isnan(shoulder).any() or np.isnan(elbow).any():
+            raise ValueError(f'Posición del pie fuera de alcance en la pata {leg}')
+        shoulder_name, elbow_name = LEG_JOINTS[leg]
+        angles[shoulder_name] = shoulder
+        angles[elbow_name] = elbow
+    return angles
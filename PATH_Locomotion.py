@@ -0,0 +1,124 @@
+# Brief: Este codigo contiene el generador parametrico de caminatas. En lugar de poses fijas
+#        que se mueven una despues de otra, cada pata sigue una trayectoria continua del pie:
+#        en apoyo el pie se desliza hacia atras sobre el piso y en vuelo regresa hacia
+#        adelante levantado, y cada pata va desfasada de las otras (crawl o trot), asi unas
+#        patas avanzan mientras las demas empujan. La pata tiene dos grados de libertad, asi
+#        que la trayectoria se define con el giro del hombro y la altura del pie: sobre el piso
+#        el pie recorre un arco alrededor del hombro cuya cuerda es el paso. Las trayectorias
+#        se calculan como arreglos de NumPy a la frecuencia del lazo de control, se resuelven
+#        con PATH_IK y se convierten a pulsos con la calibracion en una tabla que se reproduce
+#        con play_table.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import numpy as np
+import PATH_IK as ik
+
+GAIT_TYPES = ('crawl', 'trot')
+# Fase de cada pata en el ciclo (0 a 1). Las parejas diagonales son 1-4 y 2-3, como en
+# FORWARD1_SEQUENCE. En trot cada pareja se mueve junta; en crawl las patas se mueven de una
+# en una alternando parejas, asi siempre hay tres patas en el piso.
+PHASE_OFFSETS = {
+    'crawl': {1: 0.0, 2: 0.25, 4: 0.5, 3: 0.75},
+    'trot': {1: 0.0, 4: 0.0, 2: 0.5, 3: 0.5},
+}
+# Fraccion del ciclo que cada pie pasa en el piso
+DUTY_FACTOR = {'crawl': 0.75, 'trot': 0.5}
+
+# Parametros por defecto: cuerda del paso del pie (mm), altura a la que se levanta (mm) y
+# duracion de un ciclo completo (s). Cerca de home el cuatro barras necesita mucho giro del codo
+# por cada mm de altura, los valores dejan los codos abajo de MAX_SERVO_SPEED_DPS.
+STRIDE_LENGTH_MM = 40.0
+STEP_HEIGHT_MM = 8.0
+CYCLE_PERIOD = {'crawl': 2.0, 'trot': 1.0}
+# Velocidad maxima de los servos en grados por segundo (0.1 s / 60 grados)
+MAX_SERVO_SPEED_DPS = 600.0
+# Tolerancia en mm para decidir que un pie esta apoyado en el piso
+GROUND_TOLERANCE = 1e-6
+
+# Brief: Giro del hombro (grados, relativo a home) y altura levantada (mm) para un arreglo de
+#        fases s en [0, 1). En apoyo (s < duty) el giro va de +sweep/2 a -sweep/2 a velocidad
+#        constante con el pie en el piso; en vuelo regresa con un cicloide, que empieza y
+#        termina con velocidad cero, y el pie sube hasta height a la mitad del vuelo.
+def foot_cycle(phase, sweep, height, duty):
+    phase = np.asarray(phase, dtype=np.float64)
+    stance = phase < duty
+    u = np.where(stance, phase / duty, (phase - duty) / (1.0 - duty))
+    swing = u - np.sin(2 * np.pi * u) / (2 * np.pi)
+    yaw = np.where(stance, 0.5 - u, swing - 0.5) * sweep
+    lift = np.where(stance, 0.0, height * 0.5 * (1 - np.cos(2 * np.pi * u)))
+    return yaw, lift
+
+# Brief: Trayectorias de los cuatro pies muestreadas cada period segundos durante cycles
+#        ciclos, regresa {pata: arreglo (ticks, 3)} en el marco de PATH_IK. Cada posicion
+#        esta sobre el circulo que alcanza la pata a su altura, asi todas son alcanzables.
+#        Lanza ValueError si los parametros no caben en el espacio de trabajo de la pata.
+def foot_trajectories(gait_type, period, cycles=1, stride=STRIDE_LENGTH_MM, height=STEP_HEIGHT_MM,
+                      cycle_period=None, duty=None):
+    if gait_type not in GAIT_TYPES:
+        raise ValueError(f'Tipo de caminata inválido: {gait_type}')
+    cycle_period = cycle_period or CYCLE_PERIOD[gait_type]
+    duty = duty or DUTY_FACTOR[gait_type]
+    if not 0 < duty < 1:
+        raise ValueError(f'Fracción de apoyo inválida: {duty}')
+    if height < 0:
+        raise ValueError(f'Altura de paso inválida: {height}')
+    ticks = max(1, int(round(cycles * cycle_period / period)))
+    # La ultima muestra cae al final del ultimo ciclo, asi dos tablas seguidas no dan saltos
+    time_phase = np.arange(1, ticks + 1) * (cycles / ticks)
+    feet = {}
+    for leg, offset in PHASE_OFFSETS[gait_type].items():
+        ground = ik.home_foot(leg)[2]
+        radius = ik.reach_at_height(ground)
+        if not 0 <= stride < 2 * radius:
+            raise ValueError(f'Paso inválido: {stride} mm, la pata alcanza a lo más {2 * radius:.0f} mm')
+        sweep = np.degrees(2 * np.arcsin(stride / (2 * radius)))
+        yaw, lift = foot_cycle(np.mod(time_phase + offset, 1.0), sweep, height, duty)
+        z = ground - lift
+        reach = ik.reach_at_height(z)
+        feet[leg] = np.stack([reach * np.sin(np.radians(yaw)), reach * np.cos(np.radians(yaw)), z], axis=-1)
+    return feet
+
+# Brief: Angulos de las 8 articulaciones para la caminata, {articulacion: arreglo de angulos}.
+def gait_angles(gait_type, period, cycles=1, **params):
+    return ik.solve_legs(foot_trajectories(gait_type, period, cycles, **params), use_grid=True)
+
+# Brief: Medidas de la caminata a partir de la cinematica directa de sus angulos: velocidad
+#        del cuerpo (lo que avanzan los pies apoyados por segundo), desplazamiento lateral
+#        de los pies apoyados y velocidad maxima pedida a los servos.
+def gait_metrics(angles, period):
+    forward = []
+    lateral = 0.0
+    for leg, (shoulder_name, elbow_name) in ik.LEG_JOINTS.items():
+        feet = ik.foot_position(leg, angles[shoulder_name], angles[elbow_name])
+        stance = feet[:, 2] >= ik.home_foot(leg)[2] - GROUND_TOLERANCE
+        # Solo cuentan los pasos de un tick en los que el pie esta en el piso al inicio y al final
+        both = stance[:-1] & stance[1:]
+        forward.append(-np.diff(feet[:, 0])[both])
+        if stance.any():
+            lateral = max(lateral, float(np.ptp(feet[stance, 1])))
+    forward = np.concatenate(forward)
+    speed = max(np.abs(np.diff(joint_angles)).max(initial=0.0) for joint_angles in angles.values()) / period
+    return {
+        'speed_mm_s': float(forward.mean() / period) if len(forward) else 0.0,
+        'lateral_mm': lateral,
+        'max_servo_dps': float(speed),
+    }
+
+# Brief: Compila la caminata en una tabla de pulsos (ticks x articulaciones) de int16 en el
+#        orden de joint_gpios. joint_gpios es {articulacion: gpio} y angles_to_pulses la
+#        conversion vectorizada de PATH_Control con la calibracion. Regresa (tabla, medidas de
+#        gait_metrics). Lanza ValueError si los parametros no son alcanzables y avisa si algun
+#        servo pasa de MAX_SERVO_SPEED_DPS.
+def locomotion_table(gait_type, joint_gpios, angles_to_pulses, period, cycles=1, **params):
+    angles = gait_angles(gait_type, period, cycles, **params)
+    metrics = gait_metrics(angles, period)
+    if metrics['max_servo_dps'] > MAX_SERVO_SPEED_DPS:
+        print(f'Aviso: la caminata {gait_type} pide {metrics["max_servo_dps"]:.0f} grados/s, '
+              f'más que los {MAX_SERVO_SPEED_DPS:.0f} de los servos')
+    columns = [angles_to_pulses(angles[joint], gpio) for joint, gpio in joint_gpios.items()]
+    table = np.column_stack(columns).astype(np.int16)
+    table.setflags(write=False)
+    return table, metrics
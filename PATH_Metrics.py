@@ -0,0 +1,150 @@
+# Brief: Este codigo contiene la instrumentacion del lazo de control. Cuenta las
+#        llamadas a pigpio por GPIO, arma un histograma de la latencia de escritura,
+#        cuenta los ticks atrasados del lazo y suma el tiempo de cada fase de caminata.
+#        Las metricas se muestran en vivo en el Tab 3 y se pueden exportar a JSON.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from PATH_Output import send_servo_batch
+
+# Limites superiores de las cubetas del histograma de latencia en microsegundos,
+# la ultima cubeta cuenta todo lo que pasa de 20 ms
+LATENCY_BUCKETS_US = (50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000)
+
+class ControlMetrics:
+    # Brief: Contenedor de metricas. Se registra como observador del lazo de control
+    #        (loop_started/tick) y recibe cada escritura de InstrumentedPi. Solo usa
+    #        contadores y listas de tamaño fijo para que el costo por tick sea minimo. Todas
+    #        las funciones toman el candado, el lazo escribe desde el hilo del ejecutor mientras
+    #        el HMI lee snapshot desde el hilo de Tk.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.write_counts = {}
+            self.batches = 0
+            self.latency_histogram = [0] * (len(LATENCY_BUCKETS_US) + 1)
+            self.max_latency = 0.0
+            self.loops = 0
+            self.ticks = 0
+            self.overruns = 0
+            self.max_lateness = 0.0
+            self.phase_time = {}
+            self.phase_count = {}
+            self._period = 0.0
+
+    def record_write(self, gpio, latency):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_US, latency * 1e6)
+        with self._lock:
+            self.write_counts[gpio] = self.write_counts.get(gpio, 0) + 1
+            self.latency_histogram[bucket] += 1
+            if latency > self.max_latency:
+                self.max_latency = latency
+
+    # Brief: Registra un lote de la etapa de salida, cada GPIO cuenta como una escritura y la
+    #        latencia del lote completo entra una vez al histograma.
+    def record_batch(self, gpios, latency):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_US, latency * 1e6)
+        with self._lock:
+            for gpio in gpios:
+                self.write_counts[gpio] = self.write_counts.get(gpio, 0) + 1
+            self.batches += 1
+            self.latency_histogram[bucket] += 1
+            if latency > self.max_latency:
+                self.max_latency = latency
+
+    def loop_started(self, num_ticks, period):
+        with self._lock:
+            self.loops += 1
+            self._period = period
+
+    def tick(self, lateness):
+        with self._lock:
+            self.ticks += 1
+            if lateness >= self._period:
+                self.overruns += 1
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+
+    # Brief: Suma el tiempo que tarda el bloque a la fase name, por ejemplo una caminata.
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phase_time[name] = self.phase_time.get(name, 0.0) + elapsed
+                self.phase_count[name] = self.phase_count.get(name, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'<{limit}us' for limit in LATENCY_BUCKETS_US] + [f'>={LATENCY_BUCKETS_US[-1]}us']
+            return {
+                'uptime_s': round(time.time() - self.started, 1),
+                'write_counts': {str(gpio): count for gpio, count in sorted(self.write_counts.items())},
+                'writes': sum(self.write_counts.values()),
+                'batches': self.batches,
+                'write_latency_histogram': dict(zip(labels, self.latency_histogram)),
+                'max_write_latency_ms': round(self.max_latency * 1000, 3),
+                'loops': self.loops,
+                'ticks': self.ticks,
+                'overruns': self.overruns,
+                'max_lateness_ms': round(self.max_lateness * 1000, 3),
+                'phase_time_s': {name: round(t, 3) for name, t in self.phase_time.items()},
+                'phase_count': dict(self.phase_count),
+            }
+
+    # Brief: Texto corto para el panel del HMI.
+    def summary(self):
+        snap = self.snapshot()
+        lines = [
+            f'Writes: {snap["writes"]} ({snap["batches"]} batches)   max latency: {snap["max_write_latency_ms"]:.2f} ms',
+            f'Ticks: {snap["ticks"]}   overruns: {snap["overruns"]}   max late: {snap["max_lateness_ms"]:.1f} ms',
+            'Per GPIO: ' + '  '.join(f'{gpio}:{count}' for gpio, count in snap['write_counts'].items()),
+            'Latency: ' + '  '.join(f'{label}:{count}' for label, count in snap['write_latency_histogram'].items() if count),
+        ]
+        for name, elapsed in snap['phase_time_s'].items():
+            lines.append(f'{name}: {elapsed:.2f} s ({snap["phase_count"][name]}x)')
+        return '\n'.join(lines)
+
+    def export(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        print(f'Metricas exportadas a {path}')
+
+class InstrumentedPi:
+    # Brief: Envuelve el backend de pigpio y mide cada set_servo_pulsewidth y cada lote de la
+    #        etapa de salida, el resto de los metodos pasan directo al backend.
+    def __init__(self, pi, metrics):
+        self._pi = pi
+        self._metrics = metrics
+        self._set_servo_pulsewidth = pi.set_servo_pulsewidth
+
+    def set_servo_pulsewidth(self, gpio, pulsewidth):
+        start = time.perf_counter()
+        result = self._set_servo_pulsewidth(gpio, pulsewidth)
+        self._metrics.record_write(gpio, time.perf_counter() - start)
+        return result
+
+    def set_servo_pulsewidths(self, items):
+        start = time.perf_counter()
+        send_servo_batch(self._pi, items)
+        self._metrics.record_batch([gpio for gpio, _ in items], time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._pi, name)
+
+# Metricas globales del control, PATH_Control las usa por defecto
+control_metrics = ControlMetrics()
@@ -0,0 +1,82 @@
+# Brief: Este codigo contiene la etapa de salida de los servos. Guarda el ultimo pulso
+#        escrito en cada GPIO y solo manda los que cambiaron, y los cambios de un tick
+#        para todas las articulaciones se mandan a pigpiod como un solo lote en el
+#        socket (pipelined) en lugar de 8 llamadas que esperan su respuesta una por una.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import struct
+import pigpio
+
+_CMD_SERVO = pigpio._PI_CMD_SERVO
+_RESPONSE_SIZE = 16
+
+# Brief: Manda varios comandos de servo por el socket de pigpio sin esperar la respuesta de
+#        cada uno: se escriben todos los paquetes y despues se leen todas las respuestas.
+#        Usa el socket y el candado del objeto pigpio.pi, asi no se mezcla con otras llamadas.
+def pipeline_servo_pulsewidths(pi, items):
+    request = b''.join(struct.pack('IIII', _CMD_SERVO, gpio, pulse, 0) for gpio, pulse in items)
+    expected = _RESPONSE_SIZE * len(items)
+    with pi.sl.l:
+        pi.sl.s.sendall(request)
+        response = b''
+        while len(response) < expected:
+            chunk = pi.sl.s.recv(expected - len(response))
+            if not chunk:
+                raise pigpio.error('Conexión con pigpiod cerrada')
+            response += chunk
+
+    for (gpio, pulse), (res,) in zip(items, struct.iter_unpack('12xi', response)):
+        if res < 0:
+            raise pigpio.error(f'Error escribiendo pulso {pulse} en {gpio}: {pigpio.error_text(res)}')
+
+# Brief: Manda un lote de (gpio, pulso). Si el backend tiene set_servo_pulsewidths (simulador,
+#        metricas) se usa, con pigpio.pi se usa el pipeline y si no, una llamada por GPIO.
+def send_servo_batch(pi, items):
+    batch = getattr(pi, 'set_servo_pulsewidths', None)
+    if batch is not None:
+        batch(items)
+    elif hasattr(pi, 'sl'):
+        pipeline_servo_pulsewidths(pi, items)
+    else:
+        for gpio, pulse in items:
+            pi.set_servo_pulsewidth(gpio, pulse)
+
+class OutputStage:
+    # Brief: Etapa de salida con seguimiento de cambios. last tiene el ultimo pulso que se
+    #        escribio en cada GPIO, los GPIO que no aparecen se escriben siempre. Si telemetry
+    #        no es None (ver PATH_Telemetry) cada tick escrito se registra ahi.
+    def __init__(self):
+        self.last = {}
+        self.sent = 0
+        self.suppressed = 0
+        self.telemetry = None
+
+    # Brief: Olvida los pulsos escritos, se llama al conectar un backend nuevo.
+    def reset(self):
+        self.last.clear()
+
+    # Brief: Registra pulsos que se escribieron por otro camino (por ejemplo las waveforms).
+    def mark(self, gpios, pulses):
+        self.last.update(zip(gpios, pulses))
+        if self.telemetry is not None:
+            self.telemetry.record(zip(gpios, pulses))
+
+    # Brief: Escribe un tick completo, solo los GPIO cuyo pulso cambio y en un solo lote.
+    #        Regresa la lista de (gpio, pulso) que se mando.
+    def write_frame(self, pi, gpios, pulses):
+        last = self.last
+        changed = [(gpio, pulse) for gpio, pulse in zip(gpios, pulses) if last.get(gpio) != pulse]
+        self.suppressed += len(gpios) - len(changed)
+        if changed:
+            send_servo_batch(pi, changed)
+            last.update(changed)
+            self.sent += len(changed)
+        if self.telemetry is not None:
+            self.telemetry.record(changed)
+        return changed
+
+    def write(self, pi, gpio, pulse):
+        return self.write_frame(pi, (gpio,), (pulse,))
@@ -0,0 +1,197 @@
+# Brief: Este codigo contiene el planeador de trayectorias. Convierte la lista de waypoints
+#        en la secuencia minima de ciclos de caminata: sigue la orientacion del robot, gira
+#        hacia el lado mas corto (rotate1 o rotate1_reverse), junta los waypoints repetidos
+#        o alineados y calcula cada tramo desde la posicion a la que de verdad llega el
+#        robot, asi los redondeos de giros y pasos no se acumulan.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import math
+
+# Grados que gira el robot en un ciclo de rotate1 (rotate1_reverse gira lo mismo al otro lado)
+ROTATE_STEP_DEG = 10.0
+# Distancia que avanza el robot en un ciclo de forward1
+STRIDE_LENGTH = 1.0
+# Waypoints mas cerca que esto del anterior se descartan
+MERGE_DISTANCE = 0.5
+# Un waypoint se quita si el cambio de direccion en el es menor que esto
+COLLINEAR_DEG = 2.0
+
+# Los angulos del planeador son los de los waypoints: PATH_View los dibuja con 0 arriba y
+# creciendo en sentido horario. to_points los pasa a x, y con la formula estandar, asi el plano
+# x, y queda reflejado respecto al grafico pero giros y distancias no cambian. rotate1 es el
+# ciclo que aumenta el angulo (horario en el grafico) y rotate1_reverse el que lo disminuye.
+TURN_POSITIVE = 'rotate1'
+TURN_NEGATIVE = 'rotate1_reverse'
+STRIDE = 'forward1'
+
+# Brief: Convierte waypoints (distancia, angulo en grados) desde el origen a puntos x, y.
+def to_points(waypoints):
+    return [(dist * math.cos(math.radians(angle)), dist * math.sin(math.radians(angle))) for dist, angle in waypoints]
+
+def _heading(p0, p1):
+    return math.degrees(math.atan2(p1[1] - p0[1], p1[0] - p0[0]))
+
+# Brief: Angulo en el rango (-180, 180].
+def wrap_angle(angle):
+    angle = math.fmod(angle, 360.0)
+    if angle <= -180.0:
+        angle += 360.0
+    elif angle > 180.0:
+        angle -= 360.0
+    return angle
+
+# Brief: True si el punto middle sobra, es decir, si el cambio de direccion entre los tramos
+#        previous -> middle y middle -> point es menor que collinear_deg.
+def is_collinear(previous, middle, point, collinear_deg=COLLINEAR_DEG):
+    return abs(wrap_angle(_heading(middle, point) - _heading(previous, middle))) < collinear_deg
+
+_cycle_costs = {}
+
+# Brief: Costo de un ciclo de caminata partiendo de home: numero de movimientos (poses que
+#        cambian algo) y recorrido total de los servos en grados. Se calcula una vez por ciclo.
+def cycle_cost(name):
+    cost = _cycle_costs.get(name)
+    if cost is None:
+        import PATH_Gait as gait
+        pose = dict(gait.HOME_POSE)
+        moves = 0
+        travel = 0.0
+        for step_pose in gait.GAITS[name]:
+            delta = sum(abs(angle - pose[joint]) for joint, angle in step_pose.items())
+            if delta:
+                moves += 1
+                travel += delta
+            pose.update(step_pose)
+        cost = (moves, travel)
+        _cycle_costs[name] = cost
+    return cost
+
+# Brief: True si al encadenar previous y name la ultima pose de uno y la primera del otro se
+#        mezclan en un solo movimiento (ver PATH_Gait.chain_sequences).
+def merges(previous, name):
+    import PATH_Gait as gait
+    return previous is not None and not set(gait.GAITS[previous][-1]) & set(gait.GAITS[name][0])
+
+class RoutePlanner:
+    # Brief: Planeador incremental. Cada waypoint agregado planea solo su tramo a partir del
+    #        estado (posicion, orientacion, ultimo ciclo y totales) en que termino el anterior, y
+    #        quitar el ultimo waypoint regresa al estado guardado, asi la ruta y la estimacion se
+    #        actualizan sin recalcular toda la trayectoria.
+    def __init__(self, heading=0.0, merge_distance=MERGE_DISTANCE, collinear_deg=COLLINEAR_DEG):
+        self.heading = heading
+        self.merge_distance = merge_distance
+        self.collinear_deg = collinear_deg
+        self.reset()
+
+    def reset(self, waypoints=()):
+        self.points = []
+        self._segments = []
+        self._history = []
+        for waypoint in waypoints:
+            self.add(waypoint)
+
+    def _state(self):
+        if self._segments:
+            return self._segments[-1]['after']
+        x, y = self.points[0]
+        return {'x': x, 'y': y, 'heading': self.heading, 'last': None,
+                'turns': 0, 'strides': 0, 'moves': 0, 'travel': 0.0}
+
+    def _plan_segment(self, target):
+        state = self._state()
+        x, y, heading = state['x'], state['y'], state['heading']
+        cycles = []
+        distance = math.dist((x, y), target)
+        strides = int(round(distance / STRIDE_LENGTH))
+        if strides:
+            # Giro mas corto desde la orientacion actual, redondeado a ciclos completos
+            turn = wrap_angle(_heading((x, y), target) - heading)
+            turns = int(round(abs(turn) / ROTATE_STEP_DEG))
+            cycles += [TURN_POSITIVE if turn > 0 else TURN_NEGATIVE] * turns
+            heading = wrap_angle(heading + math.copysign(turns * ROTATE_STEP_DEG, turn))
+            # Se avanza en la orientacion real, el siguiente tramo parte de donde se llego
+            cycles += [STRIDE] * strides
+            x += strides * STRIDE_LENGTH * math.cos(math.radians(heading))
+            y += strides * STRIDE_LENGTH * math.sin(math.radians(heading))
+
+        after = dict(state, x=x, y=y, heading=heading)
+        previous = state['last']
+        for name in cycles:
+            moves, travel = cycle_cost(name)
+            after['moves'] += moves - (1 if merges(previous, name) else 0)
+            after['travel'] += travel
+            after['turns' if name != STRIDE else 'strides'] += 1
+            previous = name
+        after['last'] = previous
+        return {'cycles': cycles, 'after': after}
+
+    # Brief: Agrega un waypoint (distancia, angulo) al final de la ruta.
+    def add(self, waypoint):
+        point = to_points([waypoint])[0]
+        record = {'removed': None, 'added': False}
+        if not self.points:
+            self.points.append(point)
+            record['added'] = True
+        elif math.dist(self.points[-1], point) >= self.merge_distance:
+            # Si el ultimo punto queda alineado con el nuevo se quita y su tramo se vuelve a planear
+            if len(self.points) >= 2 and is_collinear(self.points[-2], self.points[-1], point, self.collinear_deg):
+                record['removed'] = (self.points.pop(), self._segments.pop())
+            self._segments.append(self._plan_segment(point))
+            self.points.append(point)
+            record['added'] = True
+        self._history.append(record)
+
+    # Brief: Quita el ultimo waypoint agregado.
+    def remove_last(self):
+        if not self._history:
+            return
+        record = self._history.pop()
+        if record['added']:
+            self.points.pop()
+            if self._segments:
+                self._segments.pop()
+        if record['removed'] is not None:
+            point, segment = record['removed']
+            self.points.append(point)
+            self._segments.append(segment)
+
+    @property
+    def cycles(self):
+        return [name for segment in self._segments for name in segment['cycles']]
+
+    # Brief: Estimacion de la ejecucion con el periodo del lazo y la duracion de cada pose, mas
+    #        el movimiento a home (home_duration) con el que empieza toda trayectoria.
+    def estimate(self, period, move_duration, home_duration=1.0):
+        state = self._state() if self.points else {'turns': 0, 'strides': 0, 'moves': 0, 'travel': 0.0, 'x': 0.0, 'y': 0.0, 'heading': self.heading}
+        steps_per_move = max(1, int(math.ceil(move_duration / period)))
+        cycles = state['turns'] + state['strides']
+        duration = state['moves'] * steps_per_move * period
+        if cycles:
+            duration += max(1, int(math.ceil(home_duration / period))) * period
+        return {
+            'cycles': cycles,
+            'turns': state['turns'],
+            'strides': state['strides'],
+            'moves': state['moves'],
+            'duration_s': duration,
+            'travel_deg': state['travel'],
+            'position': (state['x'], state['y']),
+            'heading': state['heading'],
+        }
+
+# Brief: Planea la trayectoria completa. El robot empieza en el primer waypoint con orientacion
+#        heading (grados, 0 = eje x). Regresa un diccionario con la lista de ciclos, los
+#        puntos que quedaron despues de simplificar y la posicion y orientacion finales.
+def plan_route(waypoints, heading=0.0, merge_distance=MERGE_DISTANCE, collinear_deg=COLLINEAR_DEG):
+    planner = RoutePlanner(heading, merge_distance, collinear_deg)
+    planner.reset(waypoints)
+    estimate = planner.estimate(1.0, 1.0)
+    return {
+        'cycles': planner.cycles,
+        'points': list(planner.points),
+        'position': estimate['position'],
+        'heading': estimate['heading'],
+    }
@@ -0,0 +1,783 @@
+# Brief: Este codigo contiene el proceso de control en tiempo real. El lazo de los servos
+#        corre en su propio proceso (sin compartir el GIL con Tk ni matplotlib), fijado a un
+#        nucleo del raspberry. El HMI le manda poses y tablas de caminata por un buffer
+#        circular en memoria compartida y el proceso publica sus pulsos actuales en otro
+#        bloque compartido y la muestra de cada tick para la telemetria por un pipe. Los avisos entre los dos procesos (hay un mensaje nuevo, se libero
+#        espacio, termino un comando) van por pipes, asi el kernel ordena las escrituras de la
+#        memoria compartida en cualquier arquitectura. RemoteControl tiene las mismas
+#        funciones que usa el HMI de PATH_Control, asi la vista puede usar cualquiera de los dos.
+#        Se activa en el HMI con la variable de entorno PATH_CONTROL_PROCESS=1.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import argparse
+import json
+import os
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import PATH_Control as control
+from PATH_Metrics import ControlMetrics
+from PATH_Telemetry import TelemetryRing
+
+# Tamaño del buffer de comandos, alcanza para varios minutos de caminata continua
+RING_CAPACITY = 1 << 20
+# Mensajes sin leer que puede tener el buffer. Cada mensaje deja un aviso en los pipes, con
+# este limite los avisos pendientes siempre caben en el pipe y escribirlos nunca se bloquea
+MAX_PENDING = 128
+# Nucleo del proceso de control, por defecto el ultimo (el 3 en el raspberry pi 4)
+CONTROL_CPU = (os.cpu_count() or 1) - 1
+# Prioridad de tiempo real del proceso de control, solo se aplica si hay permisos
+CONTROL_PRIORITY = 50
+START_TIMEOUT = 10.0
+# Filas de tabla por mensaje (16 KiB con 8 articulaciones). Las tablas se mandan por partes,
+# asi cualquier tabla cabe en el buffer y un archivo grande no se copia completo a memoria
+STREAM_CHUNK_ROWS = 1024
+
+# Tipos de comando
+KIND_POSE = 1       # Angulos objetivo (NaN = sin cambio) y duracion, se ejecuta con move_servos_sync
+KIND_TABLE = 2      # Tabla de caminata int16 (ticks x articulaciones) que se reproduce con play_table
+KIND_HOME = 3
+KIND_RELOAD = 4     # Recargar la calibracion
+KIND_QUIT = 5
+KIND_CHUNK = 6      # Filas siguientes de la ultima tabla, las tablas se mandan por partes
+
+# Encabezado de cada comando: tipo, numero de comando, filas de la tabla, duracion, periodo
+# del lazo, perfil de movimiento, modo de salida y modo de ticks atrasados (indices en
+# PATH_Control) y tiempo de inicio en time.monotonic (0 = de inmediato), el reloj monotonic es
+# el mismo para todos los procesos
+_HEADER = struct.Struct('<IIIffBBBxd')
+# Aviso de los pipes del buffer: bytes del mensaje escrito o liberado
+_LENGTH = struct.Struct('<I')
+# Aviso de comando terminado: numero de comando, resultado y time.monotonic_ns en que empezo.
+# El proceso manda el comando 0 al iniciar, con resultado 1 si se conecto al backend.
+_DONE = struct.Struct('<Iiq')
+# Muestra de telemetria de cada tick: tiempo en el reloj del control y pulso de cada articulacion
+_SAMPLE = struct.Struct(f'<d{len(control.servo_gpios)}h')
+# Capacidad del buffer circular al inicio del bloque compartido, se escribe antes de arrancar
+# el proceso de control y no cambia
+_RING_OFFSET = 8
+# Bloque de metricas: seqlock y longitud (int32) seguidos del snapshot de ControlMetrics del
+# proceso de control en JSON, que se publica cada METRICS_INTERVAL segundos
+_METRICS_OFFSET = 8
+METRICS_BLOCK_SIZE = 1 << 16
+METRICS_INTERVAL = 0.5
+
+# Campos del bloque de estado. Son int32 para que cada escritura sea atomica tambien en
+# procesadores de 32 bits; solo son para mostrar, los resultados van por el pipe de comandos
+# terminados. _STATUS_SEQ protege a los pulsos como seqlock: el proceso lo incrementa antes y
+# despues de escribirlos (impar = escritura en curso) y el lector repite si lo ve impar o si
+# cambio mientras leia. _STATUS_RESET_METRICS lo incrementa el HMI para pedir que se
+# reinicien las metricas del proceso.
+_STATUS_SEQ = 0
+_STATUS_TICKS = 1
+_STATUS_OVERRUNS = 2
+_STATUS_RESET_METRICS = 3
+_STATUS_PULSES = 4
+_STATUS_SIZE = _STATUS_PULSES + len(control.servo_gpios)
+
+# Brief: Abre un bloque de memoria compartida creado por otro proceso. El bloque lo borra el
+#        proceso que lo creo, asi que no se registra en el resource tracker de este proceso.
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+# Brief: Lee exactamente size bytes de un pipe, regresa b'' si el otro extremo se cerro.
+def _read_exact(fd, size):
+    data = b''
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            return b''
+        data += chunk
+    return data
+
+class CommandRing:
+    # Brief: Buffer circular de bytes en memoria compartida con un solo productor (el HMI) y un
+    #        solo consumidor (el proceso de control). Los datos van en la memoria compartida y
+    #        cada lado lleva su propia posicion; el productor avisa cada mensaje escrito por el
+    #        pipe ready y el consumidor cada mensaje leido por el pipe free. Escribir y leer un
+    #        pipe son llamadas al kernel que ordenan la memoria, asi el consumidor nunca lee un
+    #        mensaje a medio escribir ni el productor escribe encima de uno sin leer.
+    #        El productor crea el buffer y los pipes; el consumidor lo abre con name y los
+    #        descriptores de consumer_fds.
+    def __init__(self, name=None, capacity=RING_CAPACITY, fds=None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=_RING_OFFSET + capacity)
+            np.ndarray((1,), dtype=np.uint64, buffer=self.shm.buf)[0] = capacity
+            ready_read, self._ready = os.pipe()
+            self._free, free_write = os.pipe()
+            self._consumer_fds = (ready_read, free_write)
+        else:
+            self.shm = _attach(name)
+            self._ready, self._free = fds
+            self._consumer_fds = ()
+        self.name = self.shm.name
+        self.capacity = int(np.ndarray((1,), dtype=np.uint64, buffer=self.shm.buf)[0])
+        self._buf = self.shm.buf[_RING_OFFSET:_RING_OFFSET + self.capacity]
+        # Posicion de escritura (productor) o de lectura (consumidor) y, en el productor, hasta
+        # donde ya libero el consumidor y cuantos mensajes no ha leido
+        self._position = 0
+        self._tail = 0
+        self._pending = 0
+        self._notices = b''
+
+    # Brief: Descriptores del consumidor (ready para leer, free para escribir) que se pasan al
+    #        proceso de control.
+    def consumer_fds(self):
+        return self._consumer_fds
+
+    # Brief: Cierra en el productor los descriptores del consumidor una vez que el proceso de
+    #        control los hereda, asi cada lado ve el cierre del otro como fin de archivo.
+    def detach_consumer(self):
+        for fd in self._consumer_fds:
+            os.close(fd)
+        self._consumer_fds = ()
+
+    def _write(self, position, data):
+        offset = position % self.capacity
+        first = min(len(data), self.capacity - offset)
+        self._buf[offset:offset + first] = data[:first]
+        if first < len(data):
+            self._buf[:len(data) - first] = data[first:]
+
+    def _read(self, position, size):
+        offset = position % self.capacity
+        first = min(size, self.capacity - offset)
+        data = bytes(self._buf[offset:offset + first])
+        if first < size:
+            data += bytes(self._buf[:size - first])
+        return data
+
+    # Brief: Lee los avisos del pipe free que lleguen antes de timeout (0 = solo los que ya
+    #        estan). Lanza BrokenPipeError si el consumidor cerro el buffer.
+    def _reclaim(self, timeout):
+        while select.select([self._free], [], [], timeout)[0]:
+            data = os.read(self._free, 4096)
+            if not data:
+                raise BrokenPipeError('El proceso de control cerró el buffer de comandos')
+            self._notices += data
+            count = len(self._notices) // _LENGTH.size
+            for (size,) in _LENGTH.iter_unpack(self._notices[:count * _LENGTH.size]):
+                self._tail += size
+            self._pending -= count
+            self._notices = self._notices[count * _LENGTH.size:]
+            timeout = 0
+
+    # Brief: Agrega un mensaje, espera si el buffer esta lleno. Lanza ValueError si el mensaje
+    #        no cabe en el buffer, TimeoutError si el consumidor no libera espacio a tiempo y
+    #        BrokenPipeError si el consumidor ya no existe.
+    def put(self, message, timeout=None):
+        if len(message) > self.capacity:
+            raise ValueError(f'Comando de {len(message)} bytes no cabe en el buffer de {self.capacity} bytes')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._reclaim(0)
+        while self.capacity - (self._position - self._tail) < len(message) or self._pending >= MAX_PENDING:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError('Buffer de comandos lleno')
+            self._reclaim(remaining)
+        self._write(self._position, message)
+        self._position += len(message)
+        self._pending += 1
+        os.write(self._ready, _LENGTH.pack(len(message)))
+
+    # Brief: Espera el siguiente mensaje y lo regresa, o None si el productor cerro el buffer.
+    def get(self):
+        notice = _read_exact(self._ready, _LENGTH.size)
+        if not notice:
+            return None
+        (size,) = _LENGTH.unpack(notice)
+        message = self._read(self._position, size)
+        self._position += size
+        os.write(self._free, notice)
+        return message
+
+    def close(self, unlink=False):
+        self.detach_consumer()
+        for fd in (self._ready, self._free):
+            os.close(fd)
+        self._buf.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def _status_array(shm):
+    return np.ndarray((_STATUS_SIZE,), dtype=np.int32, buffer=shm.buf)
+
+# Brief: Fija el proceso actual a un nucleo y le da prioridad de tiempo real si hay permisos.
+def pin_to_cpu(cpu, priority=CONTROL_PRIORITY):
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu})
+            print(f'Proceso de control fijado al núcleo {cpu}')
+        except OSError as e:
+            print(f'No se pudo fijar el proceso de control al núcleo {cpu}: {e}')
+    if priority and hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            print(f'Proceso de control con prioridad SCHED_FIFO {priority}')
+        except OSError:
+            print('Sin permisos para prioridad de tiempo real, se usa la prioridad normal')
+
+class _StreamedTable:
+    # Brief: Tabla que llega por partes del buffer de comandos, con lo que usa play_table: len,
+    #        rebanadas hacia adelante, indices y tolist. Las filas se reciben cuando se piden y
+    #        las que ya quedaron atras se descartan, asi solo hay unas partes en memoria.
+    def __init__(self, ring, seq, rows, first):
+        self._ring = ring
+        self._seq = seq
+        self._rows = rows
+        self._window = first
+        self._base = 0
+
+    def __len__(self):
+        return self._rows
+
+    def _receive(self, stop):
+        while self._base + len(self._window) < min(stop, self._rows):
+            message = self._ring.get()
+            if message is None:
+                raise EOFError('El HMI cerró el buffer a mitad de una tabla')
+            kind, seq, rows = _HEADER.unpack_from(message)[:3]
+            if kind != KIND_CHUNK or seq != self._seq:
+                raise RuntimeError(f'Se esperaba la tabla {self._seq} y llegó el comando {kind} #{seq}')
+            chunk = np.frombuffer(message, dtype=np.int16, offset=_HEADER.size).reshape(rows, -1)
+            self._window = np.concatenate([self._window, chunk])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._rows)
+        else:
+            start = index + self._rows if index < 0 else index
+            stop, step = start + 1, None
+        if start < self._base:
+            raise IndexError(f'La fila {start} de la tabla ya se descartó')
+        self._receive(stop)
+        self._window = self._window[start - self._base:]
+        self._base = start
+        rows = self._window[:stop - start:step]
+        return rows if isinstance(index, slice) else rows[0]
+
+    def tolist(self):
+        return self[self._base:].tolist()
+
+    # Brief: Recibe y descarta las partes que falten si la tabla no se reprodujo completa.
+    def drain(self):
+        self._receive(self._rows)
+        self._window = self._window[-1:]
+        self._base = self._rows - len(self._window)
+
+class _StatusPublisher:
+    # Brief: Observador del lazo de control del proceso, en cada tick publica los pulsos
+    #        actuales y los contadores en el bloque de estado, manda la muestra del tick por el
+    #        pipe de telemetria y pasa el tick al observador original. El pipe no se bloquea:
+    #        si el HMI no lo lee y se llena, las muestras se descartan y el lazo sigue.
+    def __init__(self, status, observer, samples_fd):
+        self._status = status
+        self._observer = observer
+        self._samples_fd = samples_fd
+        self._gpios = list(control.servo_gpios.values())
+        self._period = 0.0
+        os.set_blocking(samples_fd, False)
+
+    def publish(self):
+        pulses = control.current_servo_pulse_widths
+        frame = [pulses[gpio] for gpio in self._gpios]
+        status = self._status
+        status[_STATUS_SEQ] += 1
+        status[_STATUS_PULSES:] = frame
+        status[_STATUS_SEQ] += 1
+        return frame
+
+    def loop_started(self, num_ticks, period):
+        self._period = period
+        if self._observer is not None:
+            self._observer.loop_started(num_ticks, period)
+
+    def tick(self, lateness):
+        frame = self.publish()
+        try:
+            os.write(self._samples_fd, _SAMPLE.pack(control.clock.monotonic(), *frame))
+        except (BlockingIOError, BrokenPipeError):
+            pass
+        self._status[_STATUS_TICKS] += 1
+        if lateness >= self._period:
+            self._status[_STATUS_OVERRUNS] += 1
+        if self._observer is not None:
+            self._observer.tick(lateness)
+
+# Brief: Hilo del proceso de control que publica el snapshot de sus metricas en el bloque de
+#        metricas cada METRICS_INTERVAL y las reinicia cuando el HMI lo pide. Corre en un hilo
+#        aparte para que las metricas sigan al dia mientras el proceso espera comandos.
+def _publish_metrics(metrics_shm, status, stop):
+    header = np.ndarray((2,), dtype=np.int32, buffer=metrics_shm.buf)
+    data_buf = metrics_shm.buf[_METRICS_OFFSET:]
+    resets = 0
+    try:
+        while True:
+            if int(status[_STATUS_RESET_METRICS]) != resets:
+                resets = int(status[_STATUS_RESET_METRICS])
+                control.metrics.control_metrics.reset()
+            data = json.dumps(control.metrics.control_metrics.snapshot()).encode()
+            if len(data) <= len(data_buf):
+                header[0] += 1
+                data_buf[:len(data)] = data
+                header[1] = len(data)
+                header[0] += 1
+            if stop.wait(METRICS_INTERVAL):
+                break
+    finally:
+        data_buf.release()
+
+# Brief: Ejecuta un comando del buffer en el proceso de control, regresa (numero, resultado,
+#        inicio en time.monotonic_ns) o None si el comando es KIND_QUIT. Si el comando tiene
+#        tiempo de inicio se espera a ese tiempo antes de ejecutarlo.
+def _execute(message, ring):
+    kind, seq, rows, duration, period, profile, mode, late_ticks, start_at = _HEADER.unpack_from(message)
+    if kind == KIND_QUIT:
+        return None
+    delay = start_at - time.monotonic() if start_at else 0.0
+    if delay > 0:
+        time.sleep(delay)
+    started = time.monotonic_ns()
+    control.STEP_DELAY = period
+    control.MOTION_PROFILE = control.MOTION_PROFILES[profile]
+    control.OUTPUT_MODE = control.OUTPUT_MODES[mode]
+    control.LATE_TICK_MODE = control.LATE_TICK_MODES[late_ticks]
+    payload = memoryview(message)[_HEADER.size:]
+
+    if kind == KIND_POSE:
+        angles = np.frombuffer(payload, dtype=np.float32)
+        servo_angles = {name: float(angle) for name, angle in zip(control.servo_gpios, angles) if not np.isnan(angle)}
+        result = control.move_servos_sync(servo_angles, duration_sec=duration)
+    elif kind == KIND_TABLE:
+        first = np.frombuffer(payload, dtype=np.int16).reshape(-1, len(control.servo_gpios))
+        table = _StreamedTable(ring, seq, rows, first)
+        try:
+            result = control.play_table(table)
+        finally:
+            table.drain()
+    elif kind == KIND_HOME:
+        result = control.home()
+    elif kind == KIND_RELOAD:
+        result = control.load_calibration()
+    else:
+        print(f'Comando desconocido: {kind}')
+        result = False
+    return seq, result, started
+
+# Brief: Funcion principal del proceso de control. done_fd es el pipe de comandos terminados y
+#        samples_fd el de las muestras de telemetria.
+def _control_main(ring_name, ring_fds, done_fd, samples_fd, status_name, metrics_name, backend, host, port, cpu):
+    pin_to_cpu(cpu)
+    ring = CommandRing(ring_name, fds=ring_fds)
+    status_shm = _attach(status_name)
+    status = _status_array(status_shm)
+    metrics_shm = _attach(metrics_name)
+    metrics_stop = threading.Event()
+    metrics_thread = None
+    publisher = None
+    try:
+        if not control.connect(backend, host, port):
+            os.write(done_fd, _DONE.pack(0, 0, 0))
+            return
+        publisher = _StatusPublisher(status, control.loop_observer, samples_fd)
+        control.loop_observer = publisher
+        publisher.publish()
+        metrics_thread = threading.Thread(target=_publish_metrics, args=(metrics_shm, status, metrics_stop), daemon=True)
+        metrics_thread.start()
+        os.write(done_fd, _DONE.pack(0, 1, 0))
+
+        # get se bloquea hasta que llegue un comando; si el HMI se cierra el pipe da fin de
+        # archivo y el proceso termina
+        while (message := ring.get()) is not None:
+            try:
+                done = _execute(message, ring)
+            except Exception as e:
+                print(f'Error en el proceso de control: {e}')
+                done = (_HEADER.unpack_from(message)[1], False, time.monotonic_ns())
+            if done is None:
+                break
+            publisher.publish()
+            seq, result, started = done
+            os.write(done_fd, _DONE.pack(seq, int(bool(result)), started))
+    finally:
+        metrics_stop.set()
+        if metrics_thread is not None:
+            metrics_thread.join()
+        control.loop_observer = None
+        publisher = status = None
+        ring.close()
+        os.close(done_fd)
+        os.close(samples_fd)
+        status_shm.close()
+        metrics_shm.close()
+
+class ControlProcess:
+    # Brief: Lado del HMI del proceso de control. Crea la memoria compartida, arranca el proceso
+    #        y manda los comandos. send_* regresan el numero de comando sin esperar, wait espera
+    #        a que el proceso lo termine y regresa su resultado.
+    def __init__(self, capacity=RING_CAPACITY):
+        self._ring = CommandRing(capacity=capacity)
+        self._status_shm = shared_memory.SharedMemory(create=True, size=_STATUS_SIZE * 4)
+        self._status = _status_array(self._status_shm)
+        self._status[:] = 0
+        self._metrics_shm = shared_memory.SharedMemory(create=True, size=_METRICS_OFFSET + METRICS_BLOCK_SIZE)
+        self._metrics_header = np.ndarray((2,), dtype=np.int32, buffer=self._metrics_shm.buf)
+        self._metrics_header[:] = 0
+        self._done = None
+        self._samples = None
+        self._notices = b''
+        self._sample_data = b''
+        # Resultados de los comandos terminados que no se han esperado, {numero: resultado}
+        self._results = {}
+        self._last_started = 0
+        self._next_seq = 0
+        self._process = None
+        # Tiempo de inicio (time.monotonic) del siguiente comando que se mande, se usa una vez
+        self.start_at = 0.0
+
+    # Brief: Arranca el proceso de control y espera a que se conecte al backend. Es un
+    #        interprete nuevo que corre este archivo, no hereda nada del proceso del HMI salvo
+    #        los pipes que se le pasan.
+    def start(self, backend=None, host='localhost', port=8888, cpu=CONTROL_CPU):
+        self._done, done_write = os.pipe()
+        self._samples, samples_write = os.pipe()
+        ring_fds = self._ring.consumer_fds()
+        command = [sys.executable, os.path.abspath(__file__), '--ring', self._ring.name, '--status', self._status_shm.name,
+                   '--metrics', self._metrics_shm.name,
+                   '--ring-fds', *map(str, ring_fds), '--done-fd', str(done_write), '--samples-fd', str(samples_write),
+                   '--backend', backend or control.BACKEND, '--host', host, '--port', str(port)]
+        if cpu is not None:
+            command += ['--cpu', str(cpu)]
+        try:
+            self._process = subprocess.Popen(command, pass_fds=(*ring_fds, done_write, samples_write))
+        finally:
+            self._ring.detach_consumer()
+            os.close(done_write)
+            os.close(samples_write)
+        return self.wait(0, START_TIMEOUT)
+
+    # Brief: Lee los avisos de comandos terminados que lleguen antes de timeout, regresa False
+    #        si el proceso de control cerro el pipe.
+    def _collect(self, timeout):
+        if not select.select([self._done], [], [], timeout)[0]:
+            return True
+        data = os.read(self._done, 4096)
+        if not data:
+            return False
+        self._notices += data
+        count = len(self._notices) // _DONE.size
+        for seq, result, started in _DONE.iter_unpack(self._notices[:count * _DONE.size]):
+            self._results[seq] = bool(result)
+            self._last_started = max(self._last_started, started)
+        self._notices = self._notices[count * _DONE.size:]
+        return True
+
+    def _send(self, kind, payload=b'', rows=0, duration=0.0, period=None):
+        self._next_seq += 1
+        start_at, self.start_at = self.start_at, 0.0
+        header = _HEADER.pack(kind, self._next_seq, rows, duration, period or control.STEP_DELAY,
+                              control.MOTION_PROFILES.index(control.MOTION_PROFILE),
+                              control.OUTPUT_MODES.index(control.OUTPUT_MODE),
+                              control.LATE_TICK_MODES.index(control.LATE_TICK_MODE), start_at)
+        if not self._put(header + payload):
+            return None
+        # Los resultados que nadie espera no se acumulan en el pipe
+        self._collect(0)
+        return self._next_seq
+
+    def _put(self, message):
+        try:
+            self._ring.put(message)
+        except OSError as e:
+            print(f'No se pudo mandar el comando al proceso de control: {e}')
+            return False
+        return True
+
+    def send_pose(self, servo_angles, duration):
+        angles = np.array([servo_angles.get(name, np.nan) for name in control.servo_gpios], dtype=np.float32)
+        return self._send(KIND_POSE, angles.tobytes(), duration=duration)
+
+    # Brief: Manda una tabla por partes de STREAM_CHUNK_ROWS filas. Regresa cuando la ultima
+    #        parte entra al buffer; con tablas mas grandes que el buffer eso es mientras el proceso
+    #        ya reproduce las primeras filas. table puede ser un memmap, se lee una parte a la vez.
+    def send_table(self, table, period=None):
+        first = np.ascontiguousarray(table[:STREAM_CHUNK_ROWS], dtype=np.int16)
+        seq = self._send(KIND_TABLE, first.tobytes(), rows=len(table), period=period)
+        for start in range(STREAM_CHUNK_ROWS, len(table) if seq is not None else 0, STREAM_CHUNK_ROWS):
+            chunk = np.ascontiguousarray(table[start:start + STREAM_CHUNK_ROWS], dtype=np.int16)
+            if not self._put(_HEADER.pack(KIND_CHUNK, seq, len(chunk), 0.0, 0.0, 0, 0, 0, 0.0) + chunk.tobytes()):
+                return None
+        return seq
+
+    def send_home(self):
+        return self._send(KIND_HOME)
+
+    def send_reload(self):
+        return self._send(KIND_RELOAD)
+
+    # Brief: Espera a que el proceso termine el comando seq, regresa su resultado o False si el
+    #        comando no se mando, el proceso se detuvo o se vencio el timeout.
+    def wait(self, seq, timeout=None):
+        if seq is None or self._done is None:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while seq not in self._results:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            if not self._collect(remaining):
+                return False
+        # Los comandos terminan en orden, los resultados anteriores ya no se van a esperar
+        result = self._results.pop(seq)
+        self._results = {done: value for done, value in self._results.items() if done > seq}
+        return result
+
+    # Brief: Pulsos publicados por el proceso de control, {gpio: pulso}. Se leen con el seqlock
+    #        de _STATUS_SEQ, asi nunca se mezclan pulsos de dos ticks.
+    def current_pulses(self):
+        status = self._status
+        while True:
+            seq = int(status[_STATUS_SEQ])
+            pulses = status[_STATUS_PULSES:].tolist()
+            if seq % 2 == 0 and int(status[_STATUS_SEQ]) == seq:
+                return dict(zip(control.servo_gpios.values(), pulses))
+
+    # Brief: Ultimo snapshot de metricas que publico el proceso de control (ver PATH_Metrics),
+    #        o None si todavia no publica ninguno. Se lee con el seqlock del bloque de metricas.
+    def metrics_snapshot(self):
+        header = self._metrics_header
+        if header is None:
+            return None
+        while True:
+            seq = int(header[0])
+            size = int(header[1])
+            data = bytes(self._metrics_shm.buf[_METRICS_OFFSET:_METRICS_OFFSET + size])
+            if seq % 2 == 0 and int(header[0]) == seq:
+                break
+        return json.loads(data) if size else None
+
+    # Brief: Pide al proceso de control que reinicie sus metricas, se aplica en menos de
+    #        METRICS_INTERVAL.
+    def reset_metrics(self):
+        if self._status is not None:
+            self._status[_STATUS_RESET_METRICS] += 1
+
+    # Brief: Muestras de telemetria que lleguen antes de timeout, lista de (tiempo, pulsos) con
+    #        una muestra por tick del proceso de control, o None si el proceso cerro el pipe.
+    def read_samples(self, timeout):
+        if not select.select([self._samples], [], [], timeout)[0]:
+            return []
+        data = os.read(self._samples, 1 << 16)
+        if not data:
+            return None
+        self._sample_data += data
+        count = len(self._sample_data) // _SAMPLE.size
+        samples = [(sample[0], sample[1:]) for sample in _SAMPLE.iter_unpack(self._sample_data[:count * _SAMPLE.size])]
+        self._sample_data = self._sample_data[count * _SAMPLE.size:]
+        return samples
+
+    def counters(self):
+        return {'ticks': int(self._status[_STATUS_TICKS]), 'overruns': int(self._status[_STATUS_OVERRUNS])}
+
+    # Brief: Tiempo (time.monotonic) en que el proceso empezo el ultimo comando terminado.
+    def last_started(self):
+        return self._last_started / 1e9
+
+    def stop(self):
+        if self._process is not None and self._process.poll() is None:
+            self._send(KIND_QUIT)
+            try:
+                self._process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self._process.terminate()
+        self._status = None
+        self._ring.close(unlink=True)
+        for fd in (self._done, self._samples):
+            if fd is not None:
+                os.close(fd)
+        self._done = self._samples = None
+        self._status_shm.close()
+        self._status_shm.unlink()
+        self._metrics_header = None
+        self._metrics_shm.close()
+        self._metrics_shm.unlink()
+
+class RemoteMetrics(ControlMetrics):
+    # Brief: Metricas del proceso de control vistas desde el HMI, con el summary y el export de
+    #        ControlMetrics. snapshot regresa el ultimo snapshot que publico el proceso y reset
+    #        le pide que reinicie las suyas; sin proceso son metricas vacias.
+    def __init__(self):
+        self.process = None
+        super().__init__()
+
+    def snapshot(self):
+        snap = self.process.metrics_snapshot() if self.process is not None else None
+        return snap if snap is not None else super().snapshot()
+
+    def reset(self):
+        super().reset()
+        if self.process is not None:
+            self.process.reset_metrics()
+
+class RemoteControl:
+    # Brief: Mismas funciones de movimiento que PATH_Control pero ejecutadas en el proceso de
+    #        control. Las caminatas se compilan aqui (con la misma calibracion) y se mandan como
+    #        tablas; cada funcion espera a que el proceso termine, asi el ejecutor de movimientos
+    #        del HMI se comporta igual que con PATH_Control. Los pulsos del proceso se copian a
+    #        pulses, por defecto el current_servo_pulse_widths de PATH_Control que muestra el HMI.
+    #        telemetry se llena en este proceso con la muestra de cada tick del proceso de control.
+    def __init__(self, pulses=None):
+        self.process = None
+        self.current_servo_pulse_widths = control.current_servo_pulse_widths if pulses is None else pulses
+        self.telemetry = None
+        self.control_metrics = RemoteMetrics()
+        self._sampler = None
+        self._sampling = threading.Event()
+
+    @property
+    def BACKEND(self):
+        return control.BACKEND
+
+    def connect(self, backend=None, host='localhost', port=8888, cpu=CONTROL_CPU):
+        self.process = ControlProcess()
+        if not self.process.start(backend, host, port, cpu):
+            print('No se pudo iniciar el proceso de control')
+            return False
+        control.BACKEND = backend or control.BACKEND
+        control.load_calibration()
+        if self.telemetry is None:
+            self.telemetry = TelemetryRing(control.servo_gpios.values())
+        self.control_metrics.process = self.process
+        self._sampling.set()
+        self._sampler = threading.Thread(target=self._sample_telemetry, args=(self.process,), name='path-telemetry', daemon=True)
+        self._sampler.start()
+        print('Proceso de control iniciado')
+        return True
+
+    # Brief: Hilo que copia a telemetry las muestras que manda el proceso de control, una por
+    #        tick con el tiempo del tick. Termina con shutdown o cuando el proceso se detiene.
+    def _sample_telemetry(self, process):
+        gpios = list(control.servo_gpios.values())
+        while self._sampling.is_set():
+            samples = process.read_samples(0.1)
+            if samples is None:
+                break
+            for when, pulses in samples:
+                self.telemetry.record(zip(gpios, pulses), when)
+
+    def _sync_pulses(self):
+        self.current_servo_pulse_widths.update(self.process.current_pulses())
+
+    def execute_servos(self, servo_angles, duration_per_servo=None):
+        if duration_per_servo is None:
+            duration_per_servo = control.DEFAULT_DURATION
+        result = self.process.wait(self.process.send_pose(servo_angles, duration_per_servo))
+        self._sync_pulses()
+        return result
+
+    def home(self):
+        result = self.process.wait(self.process.send_home())
+        self._sync_pulses()
+        return result
+
+    def load_calibration(self):
+        return control.load_calibration() and self.process.wait(self.process.send_reload())
+
+    def _play_from_home(self, table):
+        import PATH_Gait as gait
+        if not self.process.wait(self.process.send_pose(gait.HOME_POSE, 1)):
+            return False
+        result = self.process.wait(self.process.send_table(table))
+        self._sync_pulses()
+        return result
+
+    def run_gait(self, name):
+        import PATH_Gait as gait
+        table = gait.gait_table(name, gait.HOME_POSE, list(control.servo_gpios.values()), control.pose_to_pulses,
+                                control.STEP_DELAY, control.GAIT_MOVE_DURATION, control.MOTION_PROFILE)
+        return self._play_from_home(table)
+
+    def forward1(self):
+        return self.run_gait('forward1')
+
+    def rotate1(self):
+        return self.run_gait('rotate1')
+
+    def execute_trajectory(self, waypoints):
+        import PATH_Gait as gait
+        if not waypoints:
+            print('La trayectoria no se ha definido')
+            return False
+        cycles = control.trajectory_cycles(waypoints)
+        if not cycles:
+            return True
+        table = gait.stream_table(cycles, gait.HOME_POSE, list(control.servo_gpios.values()), control.pose_to_pulses,
+                                  control.STEP_DELAY, control.GAIT_MOVE_DURATION, control.MOTION_PROFILE)
+        print(f'Mandando {len(cycles)} ciclos al proceso de control ({len(table) * control.STEP_DELAY:.1f} s)')
+        return self._play_from_home(table)
+
+    def run_locomotion(self, gait_type='trot', cycles=4, **params):
+        table = control.build_locomotion(gait_type, cycles, **params)
+        if table is None:
+            return False
+        self._sync_pulses()
+        if not self.process.wait(self.process.send_table(control.lead_in_table(table[0], start=self.current_servo_pulse_widths))):
+            return False
+        result = self.process.wait(self.process.send_table(table))
+        self._sync_pulses()
+        return result
+
+    def play_file(self, path):
+        import PATH_Format as fmt
+        try:
+            table, rate_hz = fmt.load_frames(path, list(control.servo_gpios.values()))
+        except (OSError, ValueError) as e:
+            print(f'Error abriendo {path}: {e}')
+            return False
+        if len(table) == 0:
+            return True
+        self._sync_pulses()
+        if not self.process.wait(self.process.send_table(control.lead_in_table(table[0], start=self.current_servo_pulse_widths))):
+            return False
+        result = self.process.wait(self.process.send_table(table, 1.0 / rate_hz))
+        self._sync_pulses()
+        return result
+
+    def shutdown(self):
+        self._sampling.clear()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        self.control_metrics.process = None
+        if self.process is not None:
+            self.process.stop()
+            self.process = None
+
+def main():
+    parser = argparse.ArgumentParser(description='Proceso de control de los servos de PATH')
+    parser.add_argument('--ring', required=True, help='nombre del buffer de comandos')
+    parser.add_argument('--status', required=True, help='nombre del bloque de estado')
+    parser.add_argument('--metrics', required=True, help='nombre del bloque de metricas')
+    parser.add_argument('--ring-fds', type=int, nargs=2, required=True, help='pipes ready y free del buffer')
+    parser.add_argument('--done-fd', type=int, required=True, help='pipe de comandos terminados')
+    parser.add_argument('--samples-fd', type=int, required=True, help='pipe de muestras de telemetria')
+    parser.add_argument('--backend', choices=control.BACKENDS, default=control.BACKEND)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument('--cpu', type=int, default=None)
+    args = parser.parse_args()
+    _control_main(args.ring, tuple(args.ring_fds), args.done_fd, args.samples_fd, args.status, args.metrics, args.backend, args.host, args.port, args.cpu)
+
+if __name__ == '__main__':
+    main()
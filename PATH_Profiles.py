@@ -0,0 +1,74 @@
+# Brief: Este codigo contiene los perfiles de movimiento de los servos. Cada perfil
+#        (lineal, trapezoidal, minimum-jerk y spline cubico) se precalcula una sola vez
+#        como tabla normalizada de posicion contra tiempo, y se aplica a todas las
+#        articulaciones de un movimiento en una sola operacion de NumPy.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import numpy as np
+
+# Numero de muestras de cada tabla normalizada
+LUT_SIZE = 1024
+# Fraccion del movimiento que el perfil trapezoidal usa para acelerar (y para frenar)
+TRAPEZOID_ACCEL = 0.25
+
+def _linear(tau):
+    return tau.copy()
+
+# Velocidad constante con rampas de aceleracion y frenado, sin saltos de velocidad
+def _trapezoidal(tau, accel=TRAPEZOID_ACCEL):
+    v_max = 1.0 / (1.0 - accel)
+    position = v_max * (tau - accel / 2)
+    ramp_up = tau < accel
+    ramp_down = tau > 1.0 - accel
+    position[ramp_up] = v_max * tau[ramp_up] ** 2 / (2 * accel)
+    position[ramp_down] = 1.0 - v_max * (1.0 - tau[ramp_down]) ** 2 / (2 * accel)
+    return position
+
+# Velocidad y aceleracion cero al inicio y al final
+def _min_jerk(tau):
+    return 10 * tau ** 3 - 15 * tau ** 4 + 6 * tau ** 5
+
+# Spline cubico entre dos puntos con velocidad cero en los extremos
+def _cubic(tau):
+    return 3 * tau ** 2 - 2 * tau ** 3
+
+_TAU = np.linspace(0.0, 1.0, LUT_SIZE + 1)
+
+PROFILE_LUTS = {
+    'linear': _linear(_TAU),
+    'trapezoidal': _trapezoidal(_TAU),
+    'min_jerk': _min_jerk(_TAU),
+    'cubic': _cubic(_TAU),
+}
+PROFILES = tuple(PROFILE_LUTS)
+
+_fraction_cache = {}
+
+# Brief: Regresa la fraccion del recorrido en cada uno de los num_steps pasos (1..num_steps)
+#        para el perfil name. El resultado se guarda, asi los movimientos con la misma
+#        duracion reutilizan el mismo arreglo. La ultima fraccion siempre es 1.
+def fractions(name, num_steps):
+    key = (name, num_steps)
+    result = _fraction_cache.get(key)
+    if result is None:
+        if name == 'linear':
+            result = np.arange(1, num_steps + 1, dtype=np.float64) / num_steps
+        else:
+            tau = np.arange(1, num_steps + 1, dtype=np.float64) / num_steps
+            result = np.interp(tau, _TAU, PROFILE_LUTS[name])
+            result[-1] = 1.0
+        result.setflags(write=False)
+        _fraction_cache[key] = result
+    return result
+
+# Brief: Aplica las fracciones a todas las articulaciones a la vez. start y target son
+#        vectores de pulsos (uno por articulacion), regresa una tabla (pasos x articulaciones)
+#        de enteros.
+def interpolate(start, target, step_fractions):
+    start = np.asarray(start, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    frames = start + np.outer(step_fractions, target - start)
+    return np.rint(frames).astype(np.int16)
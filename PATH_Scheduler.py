@@ -0,0 +1,85 @@
+# Brief: Este codigo contiene el lazo de control a frecuencia fija. En lugar de
+#        dormir STEP_DELAY despues de cada paso (lo que acumula el tiempo de la
+#        llamada a pigpio como deriva), cada tick tiene una fecha limite absoluta
+#        sobre el reloj monotono y el lazo duerme solo lo que falta para llegar a ella.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import time
+
+# Los servos MG1501 reciben un pulso cada 20 ms, no tiene caso actualizar mas rapido
+SERVO_FRAME_HZ = 50
+SERVO_FRAME_PERIOD = 1.0 / SERVO_FRAME_HZ
+
+# Brief: Ajusta la frecuencia pedida a un divisor entero del marco de 50 Hz
+#        (50, 25, 16.7, 12.5, 10 Hz...) para que cada tick caiga en un marco del servo.
+def align_rate(rate_hz):
+    rate_hz = float(rate_hz)
+    if rate_hz <= 0:
+        raise ValueError(f'Frecuencia de control inválida: {rate_hz}')
+    divisor = max(1, int(round(SERVO_FRAME_HZ / rate_hz)))
+    return SERVO_FRAME_HZ / divisor
+
+class FixedRateLoop:
+    # Brief: Lazo de frecuencia fija con fechas limite absolutas. Si un tick llega tarde
+    #        mas de un periodo se cuenta como overrun y, dependiendo de catch_up, se
+    #        ejecutan los ticks perdidos de inmediato o se saltan para no alargar el
+    #        movimiento. El ultimo tick nunca se salta para que el objetivo siempre se escriba.
+    #        clock puede ser cualquier objeto con monotonic() y sleep(), por defecto time.
+    #        observer es opcional, recibe loop_started(num_ticks, period) al iniciar y
+    #        tick(lateness) en cada tick, se usa para medir el lazo sin modificarlo.
+    def __init__(self, rate_hz, clock=time, catch_up=False, observer=None):
+        self.rate_hz = align_rate(rate_hz)
+        self.period = 1.0 / self.rate_hz
+        self.clock = clock
+        self.catch_up = catch_up
+        self.observer = observer
+        self.ticks_run = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+
+    # Brief: Generador que regresa el numero de paso (1..num_ticks) en cada fecha limite.
+    #        El paso k se ejecuta en start + (k-1)*periodo y al terminar se espera hasta
+    #        start + num_ticks*periodo, asi el movimiento dura exactamente num_ticks periodos.
+    def ticks(self, num_ticks):
+        period = self.period
+        observer = self.observer
+        start = self.clock.monotonic()
+        if observer is not None:
+            observer.loop_started(num_ticks, period)
+        k = 0
+        while k < num_ticks:
+            deadline = start + k * period
+            lateness = self.clock.monotonic() - deadline
+            if lateness < 0:
+                # Se duerme hasta la fecha limite, el error al despertar es el jitter del tick
+                self.clock.sleep(-lateness)
+                lateness = self.clock.monotonic() - deadline
+            elif lateness >= period:
+                self.overruns += 1
+                self.max_lateness = max(self.max_lateness, lateness)
+                if not self.catch_up:
+                    skip = min(int(lateness // period), num_ticks - 1 - k)
+                    self.skipped += skip
+                    k += skip
+            self.ticks_run += 1
+            if observer is not None:
+                observer.tick(lateness)
+            yield k + 1
+            k += 1
+
+        remaining = start + num_ticks * period - self.clock.monotonic()
+        if remaining > 0:
+            self.clock.sleep(remaining)
+
+    def report(self):
+        return {
+            'rate_hz': self.rate_hz,
+            'ticks': self.ticks_run,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'max_lateness_ms': self.max_lateness * 1000.0,
+        }
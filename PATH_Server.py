@@ -0,0 +1,306 @@
+# Brief: Este codigo contiene el servidor de control sin interfaz grafica. Escucha en un
+#        socket local con un protocolo de lineas JSON: cada linea es un comando (pose,
+#        caminata, caminata parametrica, trayectoria, archivo, home) o un lote de comandos,
+#        y el servidor responde con eventos (accepted, started, done, superseded, error,
+#        state) en la misma conexion. Los comandos de todas las conexiones se ejecutan en
+#        orden en un solo ejecutor de movimientos con una sola conexion persistente a pigpiod.
+#        Uso: python3 PATH_Server.py [--backend sim] [--port 8765]
+#        Ejemplo: {"id": 1, "cmd": "pose", "angles": {"shoulder_1": 120}, "duration": 1}
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import argparse
+import functools
+import itertools
+import json
+import socket
+import socketserver
+import threading
+import time
+import PATH_Control as control
+from PATH_Executor import MotionExecutor
+
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+# Periodo minimo de los eventos de estado de subscribe
+MIN_STATE_INTERVAL = 0.02
+
+class _ClientHandler(socketserver.StreamRequestHandler):
+    # Brief: Una conexion de cliente. Los eventos se pueden mandar desde el hilo del ejecutor y
+    #        desde el de subscribe, por eso la escritura usa un candado.
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._write_lock = threading.Lock()
+        self.open = True
+
+    def send_event(self, event, **fields):
+        line = json.dumps({'event': event, **fields}) + '\n'
+        with self._write_lock:
+            if not self.open:
+                return
+            try:
+                self.wfile.write(line.encode())
+            except OSError:
+                self.open = False
+
+    def handle(self):
+        server = self.server.control_server
+        for raw in self.rfile:
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self.send_event('error', message=f'JSON inválido: {e}')
+                continue
+            # Un error inesperado al atender un comando se reporta sin cerrar la conexion
+            try:
+                server.dispatch(self, request)
+            except Exception as e:
+                print(f'Error atendiendo {request}: {e}')
+                self.send_event('error', message=f'Error interno: {e}')
+        self.open = False
+
+class ControlServer:
+    # Brief: Servidor de control. Conecta el backend una sola vez al iniciar y mantiene un
+    #        MotionExecutor para todos los clientes. Con port=0 se elige un puerto libre.
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, backend=None, pigpio_host='localhost', pigpio_port=8888):
+        self.backend = backend or control.BACKEND
+        self.pigpio_host = pigpio_host
+        self.pigpio_port = pigpio_port
+        self.executor = MotionExecutor(preempt=control.preempt_event, stopped=control.preempt_stopped)
+        self._ids = itertools.count(1)
+        self._server = socketserver.ThreadingTCPServer((host, port), _ClientHandler, bind_and_activate=False)
+        self._server.allow_reuse_address = True
+        self._server.daemon_threads = True
+        self._server.control_server = self
+        self._thread = None
+        self.commands = {
+            'pose': self._pose,
+            'home': self._home,
+            'gait': self._gait,
+            'trajectory': self._trajectory,
+            'file': self._file,
+            'locomotion': self._locomotion,
+        }
+
+    # Brief: Conecta el backend y empieza a escuchar, regresa self o lanza RuntimeError si no
+    #        se pudo conectar.
+    def start(self):
+        if not control.connect(self.backend, self.pigpio_host, self.pigpio_port):
+            raise RuntimeError(f'No se pudo conectar el backend {self.backend}')
+        self._server.server_bind()
+        self._server.server_activate()
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, name='path-server', daemon=True)
+        self._thread.start()
+        print(f'Servidor de control escuchando en {self.host}:{self.port}')
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self.executor.shutdown()
+        control.pi.stop()
+
+    def state(self):
+        return {
+            'backend': control.BACKEND,
+            'busy': self.executor.is_busy(),
+            'status': self.executor.status(),
+            'pulses': {str(gpio): pulse for gpio, pulse in control.current_servo_pulse_widths.items()},
+        }
+
+    # Brief: Atiende un comando. Los comandos de movimiento se encolan y regresan accepted, el
+    #        ejecutor manda started y done al ejecutarlos.
+    def dispatch(self, handler, request):
+        if not isinstance(request, dict):
+            handler.send_event('error', message='El comando debe ser un objeto JSON')
+            return
+        cmd = request.get('cmd')
+        job_id = request.get('id', next(self._ids))
+
+        if cmd == 'batch':
+            commands = request.get('commands', [])
+            if not isinstance(commands, list):
+                handler.send_event('error', id=job_id, cmd=cmd, message='commands debe ser una lista')
+                return
+            handler.send_event('accepted', id=job_id, cmd=cmd, count=len(commands))
+            for command in commands:
+                self.dispatch(handler, command)
+            return
+        if cmd == 'state':
+            handler.send_event('state', id=job_id, **self.state())
+            return
+        if cmd == 'subscribe':
+            try:
+                interval = max(MIN_STATE_INTERVAL, _number(request.get('interval', 0.1), 'interval'))
+            except ValueError as e:
+                handler.send_event('error', id=job_id, cmd=cmd, message=f'Comando inválido: {e}')
+                return
+            threading.Thread(target=self._stream_state, args=(handler, interval), daemon=True).start()
+            handler.send_event('accepted', id=job_id, cmd=cmd)
+            return
+
+        build = self.commands.get(cmd)
+        if build is None:
+            handler.send_event('error', id=job_id, message=f'Comando desconocido: {cmd}')
+            return
+        try:
+            fn, args = build(request)
+        except KeyError as e:
+            handler.send_event('error', id=job_id, cmd=cmd, message=f'Comando inválido: falta {e}')
+            return
+        except (AttributeError, TypeError, ValueError) as e:
+            handler.send_event('error', id=job_id, cmd=cmd, message=f'Comando inválido: {e}')
+            return
+        # Con "preempt": true una pose reemplaza a las poses en cola o en curso. Solo las poses
+        # se pueden interrumpir, las caminatas suponen que el robot termino su movimiento a home.
+        coalesce = None
+        if request.get('preempt'):
+            if cmd != 'pose':
+                handler.send_event('error', id=job_id, cmd=cmd, message='preempt solo se permite en pose')
+                return
+            coalesce = cmd
+        self.executor.submit(f'{cmd} #{job_id}', self._run, handler, job_id, cmd, fn, args, coalesce=coalesce,
+                             on_dropped=lambda: handler.send_event('superseded', id=job_id, cmd=cmd))
+        handler.send_event('accepted', id=job_id, cmd=cmd)
+
+    def _run(self, handler, job_id, cmd, fn, args):
+        handler.send_event('started', id=job_id, cmd=cmd)
+        start = time.perf_counter()
+        try:
+            result = bool(fn(*args))
+        except Exception as e:
+            print(f'Error ejecutando {cmd}: {e}')
+            handler.send_event('error', id=job_id, cmd=cmd, message=str(e))
+            result = False
+        preempted = self.executor.preempted()
+        handler.send_event('done', id=job_id, cmd=cmd, result=result and not preempted, preempted=preempted,
+                           elapsed_s=round(time.perf_counter() - start, 3), **self.state())
+        return result
+
+    def _stream_state(self, handler, interval):
+        while handler.open:
+            handler.send_event('state', **self.state())
+            time.sleep(interval)
+
+    # Brief: Funciones que convierten cada comando en la funcion de PATH_Control y sus argumentos.
+    #        Todos los campos se validan aqui, un comando invalido se rechaza antes de encolarlo.
+    def _pose(self, request):
+        if not isinstance(request['angles'], dict):
+            raise ValueError('angles debe ser un objeto {servo: angulo}')
+        angles = {name: _number(angle, name) for name, angle in request['angles'].items()}
+        unknown = set(angles) - set(control.servo_gpios)
+        if unknown:
+            raise ValueError(f'servos desconocidos {sorted(unknown)}')
+        # Sin duration se usa la duracion configurada al momento de ejecutar
+        duration = _number(request['duration'], 'duration') if 'duration' in request else None
+        return control.execute_servos, (angles, duration)
+
+    def _home(self, request):
+        return control.home, ()
+
+    def _gait(self, request):
+        import PATH_Gait as gait
+        name = request['name']
+        if name not in gait.GAITS:
+            raise ValueError(f'caminata desconocida {name}')
+        count = _count(request.get('count', 1), 'count')
+        if count == 1:
+            return control.run_gait, (name,)
+        return control.run_gait_stream, ([name] * count,)
+
+    def _trajectory(self, request):
+        if not isinstance(request['waypoints'], list):
+            raise ValueError('waypoints debe ser una lista de [distancia, angulo]')
+        waypoints = []
+        for waypoint in request['waypoints']:
+            if not isinstance(waypoint, list) or len(waypoint) != 2:
+                raise ValueError(f'waypoint inválido {waypoint}')
+            waypoints.append((_number(waypoint[0], 'distancia'), _number(waypoint[1], 'angulo')))
+        return control.execute_trajectory, (waypoints,)
+
+    def _file(self, request):
+        return control.play_file, (str(request['path']),)
+
+    def _locomotion(self, request):
+        import PATH_Locomotion as locomotion
+        gait_type = request.get('gait', 'trot')
+        if gait_type not in locomotion.GAIT_TYPES:
+            raise ValueError(f'caminata desconocida {gait_type}')
+        cycles = _count(request.get('cycles', 4), 'cycles')
+        params = {name: _number(request[name], name) for name in ('stride', 'height', 'cycle_period', 'duty') if name in request}
+        return functools.partial(control.run_locomotion, **params), (gait_type, cycles)
+
+# Brief: Valida un numero de un comando (JSON no distingue enteros de reales), lanza ValueError.
+def _number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f'{name} debe ser un número')
+    return float(value)
+
+def _count(value, name):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f'{name} debe ser un entero mayor que 0')
+    return value
+
+class ControlClient:
+    # Brief: Cliente simple del servidor para scripts y pruebas. request manda un comando y
+    #        regresa su id, wait lee eventos hasta el done (o error o superseded) de ese id.
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, timeout=None):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._socket.makefile('r')
+        self._ids = itertools.count(1)
+        self.events = []
+
+    def request(self, cmd, **fields):
+        job_id = fields.pop('id', None) or f'c{next(self._ids)}'
+        self._socket.sendall((json.dumps({'id': job_id, 'cmd': cmd, **fields}) + '\n').encode())
+        return job_id
+
+    def read_event(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError('El servidor cerró la conexión')
+        event = json.loads(line)
+        self.events.append(event)
+        return event
+
+    def wait(self, job_id):
+        while True:
+            event = self.read_event()
+            if event.get('id') == job_id and event['event'] in ('done', 'error', 'superseded'):
+                return event
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de control de PATH sin interfaz grafica')
+    parser.add_argument('--backend', choices=control.BACKENDS, default=control.BACKEND)
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--pigpio-host', default='localhost')
+    parser.add_argument('--pigpio-port', type=int, default=8888)
+    args = parser.parse_args()
+
+    try:
+        server = ControlServer(args.host, args.port, args.backend, args.pigpio_host, args.pigpio_port).start()
+    except RuntimeError as e:
+        print(e)
+        return
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print('Cerrando servidor...')
+        server.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+# Brief: Este codigo contiene un backend simulado de pigpio para correr el control
+#        sin el raspberry. SimPi tiene los mismos metodos que pigpio.pi que usa
+#        PATH_Control y registra cada pulso escrito con su tiempo. Con VirtualClock el
+#        tiempo avanza solo cuando el control duerme, asi una trayectoria de 60 s se
+#        reproduce en milisegundos.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+import pigpio
+
+class VirtualClock:
+    # Brief: Reloj virtual con la misma interfaz que usa el lazo de control (monotonic
+    #        y sleep). sleep no espera, solo adelanta el tiempo.
+    def __init__(self, start=0.0):
+        self._now = float(start)
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        return self._now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.advance(seconds)
+
+    def advance(self, seconds):
+        with self._lock:
+            self._now += seconds
+
+class SimPi:
+    # Brief: Sustituto de pigpio.pi. Cada escritura se guarda en writes como
+    #        (tiempo, gpio, pulso). write_latency simula el tiempo del viaje por el
+    #        socket a pigpiod y se suma al reloj en cada llamada.
+    def __init__(self, clock=None, write_latency=0.0):
+        self.clock = clock if clock is not None else time
+        self.write_latency = write_latency
+        self.connected = True
+        self.writes = []
+        self.calls = 0
+        self._pulse_widths = {}
+        self._modes = {}
+        self._new_wave = []
+        self._waves = {}
+        self._next_wave_id = 0
+        self._tx_end = 0.0
+
+    def _call(self):
+        self.calls += 1
+        if self.write_latency > 0:
+            self.clock.sleep(self.write_latency)
+
+    def set_servo_pulsewidth(self, gpio, pulsewidth):
+        self._call()
+        self._pulse_widths[gpio] = int(pulsewidth)
+        self.writes.append((self.clock.monotonic(), gpio, int(pulsewidth)))
+        return 0
+
+    # Brief: Lote de escrituras de la etapa de salida, cuenta como un solo viaje al daemon.
+    def set_servo_pulsewidths(self, items):
+        self._call()
+        now = self.clock.monotonic()
+        for gpio, pulsewidth in items:
+            self._pulse_widths[gpio] = int(pulsewidth)
+            self.writes.append((now, gpio, int(pulsewidth)))
+        return 0
+
+    def get_servo_pulsewidth(self, gpio):
+        self._call()
+        return self._pulse_widths.get(gpio, 0)
+
+    def set_mode(self, gpio, mode):
+        self._call()
+        self._modes[gpio] = mode
+        return 0
+
+    # Brief: Funciones de waveforms. Cada wave se guarda como su duracion y el ancho de
+    #        pulso de cada GPIO, wave_chain registra los pulsos de cada marco en el tiempo
+    #        en que el DMA los hubiera generado.
+    def wave_add_generic(self, pulses):
+        self._call()
+        self._new_wave += list(pulses)
+        return len(self._new_wave)
+
+    def wave_create(self):
+        self._call()
+        now_us = 0
+        rising = {}
+        widths = {}
+        for pulse in self._new_wave:
+            for gpio in range(32):
+                bit = 1 << gpio
+                if pulse.gpio_on & bit:
+                    rising[gpio] = now_us
+                if pulse.gpio_off & bit and gpio in rising:
+                    widths[gpio] = now_us - rising.pop(gpio)
+            now_us += pulse.delay
+        wave_id = self._next_wave_id
+        self._next_wave_id += 1
+        self._waves[wave_id] = (now_us / 1e6, widths)
+        self._new_wave = []
+        return wave_id
+
+    def wave_delete(self, wave_id):
+        self._call()
+        self._waves.pop(wave_id, None)
+        return 0
+
+    def wave_chain(self, data):
+        self._call()
+        start = max(self.clock.monotonic(), self._tx_end)
+        t = start
+        for wave_id in self._expand_chain(list(data)):
+            duration, widths = self._waves[wave_id]
+            for gpio, width in widths.items():
+                self._pulse_widths[gpio] = width
+                self.writes.append((t, gpio, width))
+            t += duration
+        self._tx_end = t
+        return 0
+
+    def _expand_chain(self, data):
+        sequence = []
+        i = 0
+        while i < len(data):
+            if data[i] == 255 and data[i + 1] == 0:
+                depth = 1
+                j = i + 2
+                while depth:
+                    if data[j] == 255 and data[j + 1] == 0:
+                        depth += 1
+                        j += 2
+                    elif data[j] == 255 and data[j + 1] == 1:
+                        depth -= 1
+                        j += 4
+                    else:
+                        j += 1
+                body = self._expand_chain(data[i + 2:j - 4])
+                sequence += body * (data[j - 2] + 256 * data[j - 1])
+                i = j
+            else:
+                sequence.append(data[i])
+                i += 1
+        return sequence
+
+    def wave_tx_busy(self):
+        self._call()
+        return 1 if self.clock.monotonic() < self._tx_end else 0
+
+    def wave_tx_stop(self):
+        self._call()
+        self._tx_end = min(self._tx_end, self.clock.monotonic())
+        return 0
+
+    def stop(self):
+        self.connected = False
+
+    # Brief: Regresa la lista de (tiempo, pulso) escrita a un GPIO.
+    def trace(self, gpio):
+        return [(t, pulse) for t, g, pulse in self.writes if g == gpio]
+
+
+# Codigos de comando del protocolo de socket de pigpiod que usa PATH_Control
+_CMD_MODES = pigpio._PI_CMD_MODES
+_CMD_SERVO = pigpio._PI_CMD_SERVO
+_CMD_NC = pigpio._PI_CMD_NC
+_CMD_WVAG = pigpio._PI_CMD_WVAG
+_CMD_WVBSY = pigpio._PI_CMD_WVBSY
+_CMD_WVHLT = pigpio._PI_CMD_WVHLT
+_CMD_WVCRE = pigpio._PI_CMD_WVCRE
+_CMD_WVDEL = pigpio._PI_CMD_WVDEL
+_CMD_GPW = pigpio._PI_CMD_GPW
+_CMD_WVCHA = pigpio._PI_CMD_WVCHA
+_CMD_NOIB = pigpio._PI_CMD_NOIB
+
+class _StandInHandler(socketserver.BaseRequestHandler):
+    # Sin Nagle, asi las respuestas de un lote de comandos no se detienen esperando el ACK
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _recv_exact(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def handle(self):
+        daemon = self.server.stand_in
+        while True:
+            header = self._recv_exact(16)
+            if header is None:
+                return
+            cmd, p1, p2, p3 = struct.unpack('IIII', header)
+            ext = b''
+            # Los comandos con extension mandan su longitud en p3
+            if cmd in (_CMD_WVAG, _CMD_WVCHA) and p3:
+                ext = self._recv_exact(p3)
+                if ext is None:
+                    return
+            res = daemon.execute(cmd, p1, p2, ext)
+            if cmd == _CMD_NC:
+                return
+            self.request.sendall(struct.pack('IIII', cmd, p1, p2, res & 0xFFFFFFFF))
+
+class StandInDaemon:
+    # Brief: Sustituto local de pigpiod. Escucha en un socket TCP con el mismo protocolo que
+    #        el daemon, de modo que pigpio.pi(host, port) se conecta a el sin cambios, y pasa
+    #        los comandos a un SimPi con reloj real. Sirve para pruebas y benchmarks del
+    #        camino completo por el socket sin el raspberry. Con port=0 se elige un puerto libre.
+    def __init__(self, host='127.0.0.1', port=0, write_latency=0.0):
+        self.sim = SimPi(write_latency=write_latency)
+        self._lock = threading.Lock()
+        self._next_handle = 0
+        self._server = socketserver.ThreadingTCPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, name='pigpiod-stand-in', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def execute(self, cmd, p1, p2, ext):
+        sim = self.sim
+        with self._lock:
+            if cmd == _CMD_SERVO:
+                return sim.set_servo_pulsewidth(p1, p2)
+            if cmd == _CMD_GPW:
+                return sim.get_servo_pulsewidth(p1)
+            if cmd == _CMD_MODES:
+                return sim.set_mode(p1, p2)
+            if cmd == _CMD_WVAG:
+                pulses = [pigpio.pulse(*fields) for fields in struct.iter_unpack('III', ext)]
+                return sim.wave_add_generic(pulses)
+            if cmd == _CMD_WVCRE:
+                return sim.wave_create()
+            if cmd == _CMD_WVDEL:
+                return sim.wave_delete(p1)
+            if cmd == _CMD_WVCHA:
+                return sim.wave_chain(list(ext))
+            if cmd == _CMD_WVBSY:
+                return sim.wave_tx_busy()
+            if cmd == _CMD_WVHLT:
+                return sim.wave_tx_stop()
+            if cmd == _CMD_NOIB:
+                self._next_handle += 1
+                return self._next_handle
+            # El resto de los comandos (BR1, NB, NC...) solo se confirman
+            return 0
@@ -0,0 +1,74 @@
+# Brief: Este codigo contiene el registro de telemetria del estado comandado. Un buffer
+#        circular de tamaño fijo guarda en cada tick del lazo de control el tiempo y el
+#        pulso comandado de las 8 articulaciones. Los arreglos se crean una sola vez, cada
+#        muestra solo copia valores dentro de ellos. El HMI lo usa para la grafica en vivo
+#        del Tab 4 y se puede guardar en CSV para revisar los tiempos de una caminata.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import time
+import numpy as np
+
+# Muestras guardadas, 2 minutos a 50 Hz
+TELEMETRY_SIZE = 6000
+
+class TelemetryRing:
+    # Brief: Buffer circular de marcos comandados. record recibe los (gpio, pulso) que cambiaron
+    #        en el tick (como los regresa PATH_Output.OutputStage.write_frame) y guarda el marco
+    #        completo; los gpio que todavia no se escriben aparecen con pulso 0.
+    def __init__(self, gpios, size=TELEMETRY_SIZE, clock=time):
+        self.gpios = list(gpios)
+        self.size = size
+        self.clock = clock
+        self._columns = {gpio: col for col, gpio in enumerate(self.gpios)}
+        self.times = np.zeros(size, dtype=np.float64)
+        self.pulses = np.zeros((size, len(self.gpios)), dtype=np.int16)
+        self._current = np.zeros(len(self.gpios), dtype=np.int16)
+        self.count = 0
+
+    # Brief: Guarda un marco. when es el tiempo de la muestra en el reloj de clock, por defecto
+    #        el de ahora; el proceso de control manda el tiempo de cada tick (ver PATH_Process).
+    def record(self, changed, when=None):
+        current = self._current
+        columns = self._columns
+        for gpio, pulse in changed:
+            current[columns[gpio]] = pulse
+        index = self.count % self.size
+        self.times[index] = self.clock.monotonic() if when is None else when
+        self.pulses[index] = current
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    # Brief: Copia de las muestras en orden, de la mas vieja a la mas nueva. Con seconds solo
+    #        se regresan las ultimas seconds segundos y con max_points se toma una de cada
+    #        n muestras para no pasar de max_points. Regresa (tiempos, pulsos).
+    def snapshot(self, seconds=None, max_points=None):
+        count = self.count
+        stored = min(count, self.size)
+        order = (np.arange(count - stored, count) % self.size)
+        times = self.times[order]
+        pulses = self.pulses[order]
+        if seconds is not None and stored:
+            start = np.searchsorted(times, times[-1] - seconds)
+            times = times[start:]
+            pulses = pulses[start:]
+        if max_points is not None and len(times) > max_points:
+            stride = -(-len(times) // max_points)
+            # Se conserva siempre la ultima muestra
+            times = times[::-1][::stride][::-1]
+            pulses = pulses[::-1][::stride][::-1]
+        return times, pulses
+
+    # Brief: Guarda las muestras en CSV con el tiempo relativo a la primera muestra.
+    def dump(self, path):
+        times, pulses = self.snapshot()
+        if len(times):
+            times = times - times[0]
+        data = np.column_stack([times, pulses])
+        header = 'time_s,' + ','.join(f'gpio_{gpio}' for gpio in self.gpios)
+        np.savetxt(path, data, delimiter=',', header=header, comments='', fmt=['%.6f'] + ['%d'] * len(self.gpios))
+        print(f'Telemetría guardada en {path} ({len(times)} muestras)')
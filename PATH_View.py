@@ -7,55 +7,242 @@
 # Author: Fernando Ian Yedra - Jose Eduardo Crecenscio - Diego Zamora Garcia 
 #         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
 
+import time
+STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
+from tkinter import filedialog
 import PATH_Control as control
+import PATH_Metrics as metrics
+from PATH_Executor import MotionExecutor
+from PATH_Planner import RoutePlanner
 import math
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import os
+
+# Motor de movimiento: PATH_Control en este mismo proceso o, con PATH_CONTROL_PROCESS=1, el
+# proceso de control separado de PATH_Process, que tiene las mismas funciones
+if os.environ.get('PATH_CONTROL_PROCESS') == '1':
+    from PATH_Process import RemoteControl
+    engine = RemoteControl()
+else:
+    engine = control
+# Metricas del lazo de control, en modo proceso son las que publica el proceso de control
+control_metrics = getattr(engine, 'control_metrics', metrics.control_metrics)
 
 # Ddefinicion de variables globales
 waypoints = [(0, 0)]
+# Planeador incremental de la trayectoria (ver PATH_Planner), sigue a la lista de waypoints
+route_planner = RoutePlanner()
+route_planner.reset(waypoints)
+
+# matplotlib se importa hasta que se muestra el Tab 1, ver ensure_plot
+plt = None
+plot_ready = False
+
+# Periodo para redibujar el preview mientras se arrastran los sliders (~60 Hz)
+PREVIEW_REFRESH_MS = 16
+plot_background = None
+preview_pending = False
+
+# Brief: Registro de tiempos de arranque. Cada etapa guarda su tiempo desde el inicio del
+#        programa y al terminar la ultima (ventana, grafico y conexion) se imprime el reporte.
+startup_marks = []
+STARTUP_STAGES = ('window', 'plot', 'backend')
+
+def mark_startup(stage):
+    startup_marks.append((stage, time.perf_counter() - STARTUP_T0))
+    if {name for name, _ in startup_marks} >= set(STARTUP_STAGES):
+        report_startup()
+
+def report_startup():
+    print('Reporte de arranque:')
+    for stage, elapsed in startup_marks:
+        print(f'  {stage:10s} {elapsed * 1000:8.1f} ms')
+    ready = max(elapsed for _, elapsed in startup_marks)
+    startup_var.set(f'Boot-to-ready: {ready:.2f} s')
+
+# Brief: Crea el grafico polar la primera vez que se muestra el Tab 1. La importacion de
+#        matplotlib es lo mas lento del arranque, por eso se hace despues de mostrar la ventana.
+def ensure_plot():
+    global plt, fig, ax, canvas, plot_ready
+    if plot_ready or notebook.select() != str(tab1):
+        return
+    plot_ready = True
+
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    fig, ax = plt.subplots(subplot_kw={'projection': 'polar'})
+    plt.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.1)
+    fig.set_figwidth(1)
+    fig.set_figheight(1)
+
+    plot_loading_label.destroy()
+    canvas = FigureCanvasTkAgg(fig, master=left_frame)
+    canvas_widget = canvas.get_tk_widget()
+    canvas_widget.pack(fill=tk.BOTH, expand=True)
+    setup_plot()
+    mark_startup('plot')
+
+# Brief: Crea la grafica de telemetria la primera vez que se muestra el Tab 4, una linea por
+#        articulacion con el pulso comandado en los ultimos TELEMETRY_WINDOW_S segundos.
+TELEMETRY_WINDOW_S = 10
+TELEMETRY_POINTS = 500
+TELEMETRY_REFRESH_MS = 200
+telemetry_ready = False
+telemetry_count = -1
+
+def ensure_telemetry_plot():
+    global plt, telemetry_fig, telemetry_ax, telemetry_canvas, telemetry_lines, telemetry_ready
+    if telemetry_ready or notebook.select() != str(tab4):
+        return
+    telemetry_ready = True
+
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    telemetry_fig, telemetry_ax = plt.subplots()
+    telemetry_fig.subplots_adjust(left=0.12, right=0.8, top=0.95, bottom=0.12)
+    telemetry_ax.set_xlim(-TELEMETRY_WINDOW_S, 0)
+    telemetry_ax.set_ylim(control.SERVO_MIN_PULSE - 50, control.SERVO_MAX_PULSE + 50)
+    telemetry_ax.set_xlabel('Time (s)', fontsize=8)
+    telemetry_ax.set_ylabel('Pulse (us)', fontsize=8)
+    telemetry_ax.tick_params(axis='both', which='major', labelsize=8)
+    telemetry_ax.grid(True)
+    telemetry_lines = [telemetry_ax.plot([], [], linewidth=1, label=name)[0] for name in control.servo_gpios]
+    telemetry_ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1), fontsize=7)
+
+    telemetry_loading_label.destroy()
+    telemetry_canvas = FigureCanvasTkAgg(telemetry_fig, master=telemetry_frame)
+    telemetry_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+# Brief: Actualiza la grafica de telemetria mientras el Tab 4 esta visible, solo se redibuja
+#        cuando hay muestras nuevas y con a lo mas TELEMETRY_POINTS puntos por linea.
+def refresh_telemetry():
+    global telemetry_count
+    telemetry = engine.telemetry
+    if telemetry_ready and telemetry is not None and notebook.select() == str(tab4) and telemetry.count != telemetry_count:
+        telemetry_count = telemetry.count
+        times, pulses = telemetry.snapshot(TELEMETRY_WINDOW_S, TELEMETRY_POINTS)
+        if len(times):
+            times = times - times[-1]
+        for col, line in enumerate(telemetry_lines):
+            line.set_data(times, pulses[:, col])
+        telemetry_canvas.draw_idle()
+    root.after(TELEMETRY_REFRESH_MS, refresh_telemetry)
+
+def dump_telemetry():
+    if engine.telemetry is None:
+        messagebox.showwarning('Aviso', 'No hay telemetría, el backend no se ha conectado.')
+        return
+    path = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[('CSV', '*.csv')], initialfile='path_telemetry.csv')
+    if path:
+        engine.telemetry.dump(path)
+
+def clear_telemetry():
+    if engine.telemetry is not None:
+        engine.telemetry.clear()
+
+# Brief: La conexion con pigpiod es el primer trabajo del ejecutor, asi no bloquea la ventana
+#        y los movimientos que se manden antes de conectar esperan en la cola.
+def on_backend_connected(connected):
+    if connected:
+        backend_status_var.set(f'Backend: {control.BACKEND} connected')
+    else:
+        backend_status_var.set(f'Backend: {control.BACKEND} not connected')
+        messagebox.showerror('Pigpio', 'Pigpio daemon no se ha inicializado, correr "sudo systemctl start pigpiod"')
+    mark_startup('backend')
 
-# Brief: Funcion que manda actualizar los waypoints para la interfaz grafica
-#        usa el arreglo de waypoints para generar la imagen de la trayectoria.
-def update_plot():
-    ax.clear()
-
-    if waypoints:
-        distances = [wp[0] for wp in waypoints]
-        angles_rad = [math.radians(wp[1]) for wp in waypoints]
-
-        ax.plot(angles_rad, distances, marker='o', linestyle='-', color='blue', label='Trtajectory')
-        ax.plot(angles_rad, distances, marker='x', linestyle='None', color='red')
-    
-    current_dis = distance_var.get()
-    current_angle_deg = rotation_var.get()
-    current_angle_rad = math.radians(current_angle_deg)
-
-    ax.plot([0, current_angle_rad], [0, current_dis], color='green', linestyle='--', label='Preview')
-    ax.plot(current_angle_rad, current_dis, marker='+', color='lime', markersize='10')
+# Brief: Configura una sola vez los ejes polares y crea los artistas del grafico. La
+#        trayectoria es parte del fondo estatico, el preview se marca como animado para
+#        dibujarlo encima del fondo guardado sin redibujar toda la figura.
+def setup_plot():
+    global traj_line, traj_marks, preview_line, preview_marker
 
     ax.set_theta_zero_location('N')
     ax.set_theta_direction(-1)
-    ax.set_rmax(105)
     ax.set_rticks(range(0, 101, 20))
     ax.set_rlabel_position(-22.5)
     ax.set_title('Waypoint Trajectory', va='bottom')
     ax.tick_params(axis='both', which='major', labelsize=8)
     ax.grid(True)
 
+    traj_line, = ax.plot([], [], marker='o', linestyle='-', color='blue', label='Trtajectory')
+    traj_marks, = ax.plot([], [], marker='x', linestyle='None', color='red')
+    preview_line, = ax.plot([], [], color='green', linestyle='--', label='Preview', animated=True)
+    preview_marker, = ax.plot([], [], marker='+', color='lime', markersize=10, animated=True)
+    # El limite se fija despues de crear las lineas para que el autoescalado no lo cambie
+    ax.set_rmax(105)
+
+    canvas.mpl_connect('draw_event', on_plot_draw)
+    update_plot()
+
+# Brief: Se llama despues de cada dibujo completo (incluyendo cambios de tamaño), guarda el
+#        fondo estatico para el blit y dibuja el preview encima.
+def on_plot_draw(event=None):
+    global plot_background
+    plot_background = canvas.copy_from_bbox(fig.bbox)
+    draw_preview_artists()
+
+def draw_preview_artists():
+    current_dis = distance_var.get()
+    current_angle_rad = math.radians(rotation_var.get())
+    preview_line.set_data([0, current_angle_rad], [0, current_dis])
+    preview_marker.set_data([current_angle_rad], [current_dis])
+    ax.draw_artist(preview_line)
+    ax.draw_artist(preview_marker)
+
+# Brief: Funcion que manda actualizar los waypoints para la interfaz grafica
+#        usa el arreglo de waypoints para generar la imagen de la trayectoria.
+#        Solo se llama cuando cambian los waypoints, ya que redibuja el fondo completo.
+def update_plot():
+    update_estimate()
+    if not plot_ready:
+        return
+    distances = [wp[0] for wp in waypoints]
+    angles_rad = [math.radians(wp[1]) for wp in waypoints]
+    traj_line.set_data(angles_rad, distances)
+    traj_marks.set_data(angles_rad, distances)
+
     canvas.draw()
 
+# Brief: Muestra la estimacion de la trayectoria (dry run) con la configuracion actual. El
+#        planeador ya tiene los totales, aqui solo se convierten a tiempo.
+def update_estimate():
+    estimate = route_planner.estimate(control.STEP_DELAY, control.GAIT_MOVE_DURATION)
+    minutes, seconds = divmod(int(round(estimate['duration_s'])), 60)
+    estimate_var.set(f'Estimate: {estimate["cycles"]} cycles ({estimate["turns"]} turns, {estimate["strides"]} strides)\n'
+                     f'Time: {minutes}:{seconds:02d}   Servo travel: {estimate["travel_deg"]:.0f}º')
+
+# Brief: Redibuja solo el preview sobre el fondo guardado y copia el area a la pantalla.
+def redraw_preview():
+    global preview_pending
+    preview_pending = False
+    if not plot_ready:
+        return
+    if plot_background is None:
+        canvas.draw()
+        return
+    canvas.restore_region(plot_background)
+    draw_preview_artists()
+    canvas.blit(fig.bbox)
+
 # Brief: Esta función se encarga de mandar a actualizar el marcador de preview para el gráfico.
+#        Los eventos del slider se agrupan, el preview se redibuja a lo mas cada PREVIEW_REFRESH_MS.
 def update_preview_label(event=None):
+    global preview_pending
     dist_label_val.config(text=f'{distance_var.get():.1f}')
     rot_label_val.config(text=f'{rotation_var.get():.1f}º')
 
-    update_plot()
+    if not preview_pending:
+        preview_pending = True
+        root.after(PREVIEW_REFRESH_MS, redraw_preview)
 
 # Brief: Esta función obtiene los valores almacenados de ttk y los añade a la lista de waypoints
 #        como una tupla.
@@ -63,6 +250,7 @@ def add_waypoint():
     dist = distance_var.get()
     angle = rotation_var.get()
     waypoints.append((dist, angle))
+    route_planner.add((dist, angle))
     print(f'Waypoint añadido: ({dist:.1f}, {angle:.1f}º)')
     print('Lista de waypoints: ', waypoints)
 
@@ -73,6 +261,7 @@ def add_waypoint():
 def remove_waypoint():
     if waypoints:
         removed = waypoints.pop()
+        route_planner.remove_last()
         print(f'Waypoint eliminado: ({removed})')
         print(f'Lista de waypoints: ', waypoints)
         update_plot()
@@ -80,6 +269,105 @@ def remove_waypoint():
         print('Lista de waypoints vacia')
         messagebox.showwarning('Aviso', 'Lista de waypoints vacia, añadir waypoint.')
 
+# Brief: Carga un archivo de PATH_Format. Un archivo de waypoints reemplaza la trayectoria
+#        actual y un archivo de caminata se manda a reproducir al ejecutor.
+def load_file():
+    import PATH_Format as fmt
+    path = filedialog.askopenfilename(filetypes=[('PATH files', f'*{fmt.WAYPOINTS_EXTENSION} *{fmt.FRAMES_EXTENSION}'), ('All files', '*')])
+    if not path:
+        return
+    try:
+        header = fmt.read_header(path)
+        if header['kind'] == fmt.KIND_WAYPOINTS:
+            waypoints[:] = fmt.load_waypoints(path)
+            route_planner.reset(waypoints)
+            print(f'Waypoints cargados de {path}: ', waypoints)
+            update_plot()
+            return
+    except (OSError, ValueError) as e:
+        messagebox.showerror('Error', f'No se pudo abrir el archivo: {e}')
+        return
+    executor.submit('Play File', engine.play_file, path, on_done=on_play_file_done)
+
+def on_play_file_done(completed):
+    if not completed:
+        messagebox.showerror('Alerta', 'No se pudo reproducir el archivo, revisar la consola.')
+
+def on_locomotion_done(completed):
+    if not completed:
+        messagebox.showerror('Alerta', 'No se pudo ejecutar la caminata, revisar la consola.')
+
+def save_file():
+    import PATH_Format as fmt
+    path = filedialog.asksaveasfilename(defaultextension=fmt.WAYPOINTS_EXTENSION, filetypes=[('PATH waypoints', f'*{fmt.WAYPOINTS_EXTENSION}')], initialfile=f'trajectory{fmt.WAYPOINTS_EXTENSION}')
+    if not path:
+        return
+    try:
+        fmt.save_waypoints(path, waypoints)
+        print(f'Waypoints guardados en {path}')
+    except (OSError, ValueError) as e:
+        messagebox.showerror('Error', f'No se pudo guardar el archivo: {e}')
+
+# Brief: Funciones que mandan los movimientos al ejecutor para no bloquear el mainloop de Tk.
+#        Los avisos al terminar se muestran en los callbacks, que el ejecutor corre en el
+#        hilo de Tk por medio de root.after. Execute Servos se puede volver a presionar
+#        durante un movimiento: la nueva pose reemplaza a la anterior en vez de esperarla.
+def submit_execute_servos():
+    try:
+        servo_angles = control.read_servo_entries(shoulder_1_entry, shoulder_2_entry, shoulder_3_entry, shoulder_4_entry, elbow_1_entry, elbow_2_entry, elbow_3_entry, elbow_4_entry)
+    except ValueError:
+        messagebox.showerror('Valor inválido', 'Los ángulos de los servos deben ser números.')
+        return
+    executor.submit('Execute Servos', engine.execute_servos, servo_angles, on_done=on_servos_done, coalesce='pose')
+
+def on_servos_done(all_angles_set):
+    if all_angles_set:
+        messagebox.showinfo('Ángulos actualizados', 'Se han mandado a actualizar la posición de los ángulos. Revisar la consola para más información.')
+    else:
+        messagebox.showerror('Error moviendo servos', 'No todos los servos se movieron a la posición deseada.')
+
+def submit_home():
+    executor.submit('Home', engine.home, on_done=on_home_done)
+
+def on_home_done(all_home):
+    if all_home:
+        messagebox.showinfo('Ángulos actualizados', 'Se han colocado los servos en home')
+    else:
+        messagebox.showerror('Error moviendo servos', 'Error colocando los servos en home.')
+
+def submit_trajectory():
+    if not waypoints:
+        messagebox.showerror('Alerta', 'La trayectoria no se ha definido')
+        return
+    executor.submit('Trajectory', engine.execute_trajectory, list(waypoints), on_done=on_trajectory_done)
+    messagebox.showinfo('Trayectoria mandada a ejecutar', 'Espere a que se termine la trayectoria actual.')
+
+def submit_reload_calibration():
+    executor.submit('Calibration', engine.load_calibration, on_done=on_calibration_done)
+
+def on_calibration_done(loaded):
+    if loaded:
+        messagebox.showinfo('Calibración', 'Calibración de servos actualizada')
+    else:
+        messagebox.showerror('Calibración', 'No se pudo cargar la calibración, revisar la consola.')
+
+def on_trajectory_done(completed):
+    if not completed:
+        messagebox.showerror('Alerta', 'La trayectoria no se pudo completar, revisar la consola.')
+
+# Brief: Refresca el panel de metricas del Tab 3, solo se actualiza mientras el tab esta visible.
+METRICS_REFRESH_MS = 500
+
+def refresh_metrics():
+    if notebook.select() == str(tab3):
+        metrics_var.set(control_metrics.summary())
+    root.after(METRICS_REFRESH_MS, refresh_metrics)
+
+def export_metrics():
+    path = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[('JSON', '*.json')], initialfile='path_metrics.json')
+    if path:
+        control_metrics.export(path)
+
 # Brief: Funcion para hacer toggle de pantalla completa,
 #        se verifica si se encuentra en pantalla completa
 #        y se cambia el atributo del root.
@@ -90,8 +378,12 @@ def toggle_fullscreen():
 
 def on_closing():
     print('Cerrando programa...')
+    executor.shutdown()
+    if engine is not control:
+        engine.shutdown()
     try:
-        plt.close('all')
+        if plt is not None:
+            plt.close('all')
     except Exception as e:
         print('Error cerrando plot.')
     
@@ -135,7 +427,7 @@ def increment_step(entry_widget, step):
 def decrement_step(entry_widget, step):
     try:
         current_step = float(entry_widget.get())
-        new_step = max(current_step - step, 0.05)
+        new_step = max(current_step - step, 0.02)
         entry_widget.delete(0, tk.END)
         entry_widget.insert(0, str(new_step))
     except ValueError:
@@ -150,6 +442,23 @@ root.title('HMI | PATH: Nahui 1.0')
 root.minsize(600, 400)
 root.protocol('WM_DELETE_WINDOW', on_closing)
 
+# Se crea el ejecutor de movimientos y la barra de estado con los movimientos en cola.
+# RemoteControl no revisa preempt_event, en modo proceso una pose nueva solo reemplaza a las de la cola
+if engine is control:
+    executor = MotionExecutor(preempt=control.preempt_event, stopped=control.preempt_stopped)
+else:
+    executor = MotionExecutor()
+executor.attach_tk(root)
+motion_status_var = tk.StringVar(value='Motion: idle')
+motion_status_label = ttk.Label(root, textvariable=motion_status_var, anchor='w', padding='10 0 10 5')
+motion_status_label.pack(side=tk.BOTTOM, fill='x')
+executor.add_status_listener(motion_status_var.set)
+
+backend_status_var = tk.StringVar(value=f'Backend: {control.BACKEND} connecting...')
+backend_status_label = ttk.Label(root, textvariable=backend_status_var, anchor='w', padding='10 0 10 0')
+backend_status_label.pack(side=tk.BOTTOM, fill='x')
+executor.submit('Connect', engine.connect, on_done=on_backend_connected)
+
 distance_var = tk.DoubleVar(value=0)
 rotation_var = tk.DoubleVar(value=0)
 
@@ -175,14 +484,8 @@ left_frame.grid(row=0, column=0, padx=(0,5), pady=5, sticky='nsew')
 #left_label = ttk.Label(left_frame, text='Trajectory Preview', font=('Helvetica', 10,'bold'))
 #left_label.pack(padx=10, pady=10)
 
-fig, ax = plt.subplots(subplot_kw={'projection': 'polar'})
-plt.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.1)
-fig.set_figwidth(1)
-fig.set_figheight(1)
-
-canvas = FigureCanvasTkAgg(fig, master=left_frame)
-canvas_widget = canvas.get_tk_widget()
-canvas_widget.pack(fill=tk.BOTH, expand=True)
+plot_loading_label = ttk.Label(left_frame, text='Loading plot...', anchor='center')
+plot_loading_label.pack(fill=tk.BOTH, expand=True)
 
 # Right frame
 right_frame = ttk.Frame(tab1, borderwidth=2, relief='groove', padding='10 15 10 15')
@@ -225,15 +528,28 @@ remove_button = ttk.Button(right_frame, text='Remove Waypoint', command=remove_w
 remove_button.grid(row=row_idx, column=0, columnspan=2, sticky='ew', pady=5, ipady=10)
 row_idx += 1
 
+load_button = ttk.Button(right_frame, text='Load', command=load_file)
+load_button.grid(row=row_idx, column=0, sticky='ew', padx=(0, 2), pady=5)
+save_button = ttk.Button(right_frame, text='Save', command=save_file)
+save_button.grid(row=row_idx, column=1, sticky='ew', padx=(2, 0), pady=5)
+row_idx += 1
+
 ttk.Label(right_frame, text='').grid(row=row_idx, column=0, pady=10)
 row_idx += 1
 
-execute_traj = ttk.Button(right_frame, text='Execute Trajectory', command=lambda: control.execute_trajectory(waypoints), style='Accent.TButton')
+execute_traj = ttk.Button(right_frame, text='Execute Trajectory', command=submit_trajectory, style='Accent.TButton')
 execute_traj.grid(row=row_idx, column=0, columnspan=2, sticky='ew', pady=10, ipady=10)
 row_idx += 1
 
+# Dry run de la trayectoria actual
+estimate_var = tk.StringVar(value='')
+ttk.Label(right_frame, textvariable=estimate_var, font=('Helvetica', 8), justify='left').grid(row=row_idx, column=0, columnspan=2, sticky='w', pady=5)
+row_idx += 1
+update_estimate()
+
 # Add Tab 1 to notebook
 notebook.add(tab1, text='Trajectory Control')
+notebook.bind('<<NotebookTabChanged>>', lambda event: (root.after_idle(ensure_plot), root.after_idle(ensure_telemetry_plot)))
 
 #=============================================================================================================
 #                                                 TAB 2
@@ -373,21 +689,28 @@ row_num += 1
 button_frame = ttk.Frame(inner_frame)
 button_frame.grid(row=row_num, column=0, columnspan=6, pady=(15, 5))
 
-execute_button = ttk.Button(button_frame, text="Execute Servos", command=lambda: control.execute_servos(shoulder_1_entry, shoulder_2_entry, shoulder_3_entry, shoulder_4_entry, elbow_1_entry, elbow_2_entry, elbow_3_entry, elbow_4_entry))
+execute_button = ttk.Button(button_frame, text="Execute Servos", command=submit_execute_servos)
 execute_button.pack(side=tk.LEFT, padx=5)
 
 # Home Button
-home_button = ttk.Button(button_frame, text='Set servos home', command=control.home)
+home_button = ttk.Button(button_frame, text='Set servos home', command=submit_home)
 home_button.pack(side=tk.LEFT, padx=5)
 
 # Forward Button Test
-forward_button = ttk.Button(button_frame, text='Test Forward (1)', command=control.forward1)
+forward_button = ttk.Button(button_frame, text='Test Forward (1)', command=lambda: executor.submit('Forward (1)', engine.forward1))
 forward_button.pack(side=tk.LEFT, padx=5)
 
 # Rotate Button Test
-rotate_button = ttk.Button(button_frame, text='Test Rotate (1)', command=control.rotate1)
+rotate_button = ttk.Button(button_frame, text='Test Rotate (1)', command=lambda: executor.submit('Rotate (1)', engine.rotate1))
 rotate_button.pack(side=tk.LEFT, padx=5)
 
+# Parametric Gait Buttons Test
+trot_button = ttk.Button(button_frame, text='Test Trot (4)', command=lambda: executor.submit('Trot (4)', engine.run_locomotion, 'trot', 4, on_done=on_locomotion_done))
+trot_button.pack(side=tk.LEFT, padx=5)
+
+crawl_button = ttk.Button(button_frame, text='Test Crawl (2)', command=lambda: executor.submit('Crawl (2)', engine.run_locomotion, 'crawl', 2, on_done=on_locomotion_done))
+crawl_button.pack(side=tk.LEFT, padx=5)
+
 # Add Tab 2 to notebook
 notebook.add(tab2, text='Servo Test')
 
@@ -411,11 +734,11 @@ ttk.Label(tab3_frame, text='Step Delay').grid(row=row_num, column=0, columnspan=
 row_num += 1
 
 step_entry = ttk.Entry(tab3_frame)
-step_entry.insert(0, '0.1')
+step_entry.insert(0, str(control.STEP_DELAY))
 step_entry.grid(row=row_num, column=0, padx=5, pady=5)
-sdec_button = ttk.Button(tab3_frame, text='-', width=2, command=lambda: decrement_step(step_entry, 0.1))
+sdec_button = ttk.Button(tab3_frame, text='-', width=2, command=lambda: decrement_step(step_entry, 0.02))
 sdec_button.grid(row=row_num, column=1, padx=2, pady=5)
-sinc_button = ttk.Button(tab3_frame, text='+', width=2, command=lambda: crement_step(step_entry, 0.1))
+sinc_button = ttk.Button(tab3_frame, text='+', width=2, command=lambda: increment_step(step_entry, 0.02))
 sinc_button.grid(row=row_num, column=2, padx=2, pady=5)
 row_num+=1
 
@@ -432,14 +755,91 @@ minc_button = ttk.Button(tab3_frame, text='+', width=2, command=lambda: incremen
 minc_button.grid(row=row_num, column=2, padx=2, pady=5)
 row_num += 1
 
+# Define output mode
+ttk.Label(tab3_frame, text='Servo Output').grid(row=row_num, column=0, columnspan=3, pady=2)
+row_num += 1
+
+output_mode_var = tk.StringVar(value=control.OUTPUT_MODE)
+output_mode_combo = ttk.Combobox(tab3_frame, textvariable=output_mode_var, values=control.OUTPUT_MODES, state='readonly', width=10)
+output_mode_combo.grid(row=row_num, column=0, columnspan=3, padx=5, pady=5)
+output_mode_combo.bind('<<ComboboxSelected>>', lambda event: control.set_output_mode(output_mode_var.get()))
+row_num += 1
+
+# Define motion profile
+ttk.Label(tab3_frame, text='Motion Profile').grid(row=row_num, column=0, columnspan=3, pady=2)
+row_num += 1
+
+motion_profile_var = tk.StringVar(value=control.MOTION_PROFILE)
+motion_profile_combo = ttk.Combobox(tab3_frame, textvariable=motion_profile_var, values=control.MOTION_PROFILES, state='readonly', width=10)
+motion_profile_combo.grid(row=row_num, column=0, columnspan=3, padx=5, pady=5)
+motion_profile_combo.bind('<<ComboboxSelected>>', lambda event: control.set_motion_profile(motion_profile_var.get()))
+row_num += 1
+
+# Define what the control loop does with late ticks
+ttk.Label(tab3_frame, text='Late Ticks').grid(row=row_num, column=0, columnspan=3, pady=2)
+row_num += 1
+
+late_tick_var = tk.StringVar(value=control.LATE_TICK_MODE)
+late_tick_combo = ttk.Combobox(tab3_frame, textvariable=late_tick_var, values=control.LATE_TICK_MODES, state='readonly', width=10)
+late_tick_combo.grid(row=row_num, column=0, columnspan=3, padx=5, pady=5)
+late_tick_combo.bind('<<ComboboxSelected>>', lambda event: control.set_late_tick_mode(late_tick_var.get()))
+row_num += 1
+
 # Update button
-update_button = ttk.Button(tab3_frame, text='Update Values', command=lambda: control.update_values(step_entry, mov_entry))
+update_button = ttk.Button(tab3_frame, text='Update Values', command=lambda: (control.update_values(step_entry, mov_entry), update_estimate()))
 update_button.grid(row=row_num, column=0, columnspan=3, pady=5)
+row_num += 1
+
+# Reload servo calibration, se manda al ejecutor para no cambiar las tablas a mitad de un movimiento
+calibration_button = ttk.Button(tab3_frame, text='Reload Calibration', command=submit_reload_calibration)
+calibration_button.grid(row=row_num, column=0, columnspan=3, pady=5)
+row_num += 1
+
+# Startup timing
+startup_var = tk.StringVar(value='Boot-to-ready: -')
+ttk.Label(tab3_frame, textvariable=startup_var).grid(row=row_num, column=0, columnspan=3, pady=5)
+row_num += 1
+
+# Live control metrics
+metrics_frame = ttk.LabelFrame(tab3_frame, text='Control Metrics', padding=5)
+metrics_frame.grid(row=row_num, column=0, columnspan=3, pady=5, sticky='ew')
+metrics_var = tk.StringVar(value='')
+ttk.Label(metrics_frame, textvariable=metrics_var, font=('Courier', 8), justify='left').pack(fill='x')
+metrics_buttons = ttk.Frame(metrics_frame)
+metrics_buttons.pack(pady=(5, 0))
+ttk.Button(metrics_buttons, text='Export Metrics', command=export_metrics).pack(side=tk.LEFT, padx=5)
+ttk.Button(metrics_buttons, text='Reset Metrics', command=control_metrics.reset).pack(side=tk.LEFT, padx=5)
+row_num += 1
 
 notebook.add(tab3, text='Configuration')
 
+#=============================================================================================================
+#                                                 TAB 4
+#=============================================================================================================
+# Brief: Grafica en vivo de los pulsos comandados a cada articulacion (ver PATH_Telemetry).
+tab4 = ttk.Frame(notebook)
+telemetry_frame = ttk.Frame(tab4, borderwidth=2, relief='groove', padding=10)
+telemetry_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+telemetry_loading_label = ttk.Label(telemetry_frame, text='Loading plot...', anchor='center')
+telemetry_loading_label.pack(fill=tk.BOTH, expand=True)
+
+telemetry_buttons = ttk.Frame(tab4)
+telemetry_buttons.pack(pady=(0, 5))
+ttk.Button(telemetry_buttons, text='Dump Telemetry', command=dump_telemetry).pack(side=tk.LEFT, padx=5)
+ttk.Button(telemetry_buttons, text='Clear', command=clear_telemetry).pack(side=tk.LEFT, padx=5)
+
+notebook.add(tab4, text='Telemetry')
+
 # Se crea el boton para hacer toggle a fullscreen (Este bloque de código se podrá quitar)
 #fullscreen_button = ttk.Button(root, text='Toggle fullscreen', command=toggle_fullscreen)
 #fullscreen_button.pack(side=tk.BOTTOM, pady=5, ipady=10)
 
+# Brief: La ventana se muestra primero y despues se carga el grafico si el Tab 1 esta visible.
+def on_window_shown():
+    mark_startup('window')
+    root.after(1, ensure_plot)
+
+root.after_idle(on_window_shown)
+root.after(METRICS_REFRESH_MS, refresh_metrics)
+root.after(TELEMETRY_REFRESH_MS, refresh_telemetry)
 root.mainloop()
@@ -0,0 +1,153 @@
+# Brief: Este codigo contiene la salida de servos por medio de waveforms de pigpio.
+#        Un segmento de movimiento completo para los 8 GPIO se compila en waves
+#        (wave_add_generic) y se manda al daemon con wave_chain, de modo que el
+#        motor DMA del raspberry se encarga de los tiempos en lugar del lazo de Python.
+# Version: 1.0
+# Date: 18/10/2026
+# Author: Fernando Ian Yedra - Jose Eduardo Crecenscio
+#         Universidad Iberoamerica - Coordinacion de Ingenieria Mecatronica
+
+import time
+import pigpio
+
+# Cada wave contiene un marco de servo de 20 ms para todos los GPIO
+FRAME_US = 20000
+# Numero de waves distintas por cadena, se mantiene bajo para que dos cadenas
+# (la que se transmite y la que se compila) quepan en la memoria de pigpiod
+MAX_WAVES_PER_CHAIN = 100
+# wave_chain acepta a lo mas 600 bytes por cadena
+MAX_CHAIN_BYTES = 600
+BUSY_POLL_SEC = 0.005
+
+# Brief: Genera los pulsos de un marco de 20 ms. Todos los GPIO suben al inicio del
+#        marco y cada uno baja al cumplir su ancho de pulso, los GPIO con el mismo
+#        ancho se agrupan en un solo pulso.
+def frame_pulses(gpios, pulses):
+    all_mask = 0
+    widths = {}
+    for gpio, pulse in zip(gpios, pulses):
+        all_mask |= 1 << gpio
+        widths[int(pulse)] = widths.get(int(pulse), 0) | (1 << gpio)
+
+    ordered = sorted(widths.items())
+    wave = [pigpio.pulse(all_mask, 0, ordered[0][0])]
+    for i, (width, off_mask) in enumerate(ordered):
+        next_edge = ordered[i + 1][0] if i + 1 < len(ordered) else FRAME_US
+        wave.append(pigpio.pulse(0, off_mask, next_edge - width))
+    return wave
+
+# Brief: Agrupa los marcos consecutivos iguales en (pulsos, repeticiones), asi un servo
+#        detenido o un tick de varios marcos cuesta una sola wave dentro de la cadena.
+def run_length(frames, frames_per_tick=1):
+    runs = []
+    for frame in frames:
+        frame = tuple(int(p) for p in frame)
+        if runs and runs[-1][0] == frame:
+            runs[-1][1] += frames_per_tick
+        else:
+            runs.append([frame, frames_per_tick])
+    return runs
+
+def _chain_entry(wave_id, repeat):
+    if repeat == 1:
+        return [wave_id]
+    # 255 0 inicia un ciclo, 255 1 x y lo repite x + 256*y veces
+    return [255, 0, wave_id, 255, 1, repeat & 0xFF, repeat >> 8]
+
+# Brief: Compila un grupo de marcos en waves y regresa (ids de waves, cadena).
+def _compile_chain(pi, gpios, runs):
+    wave_ids = []
+    chain = []
+    for frame, repeat in runs:
+        pi.wave_add_generic(frame_pulses(gpios, frame))
+        wave_id = pi.wave_create()
+        wave_ids.append(wave_id)
+        # Un ciclo acepta a lo mas 65535 repeticiones
+        while repeat > 0:
+            count = min(repeat, 0xFFFF)
+            chain += _chain_entry(wave_id, count)
+            repeat -= count
+    return wave_ids, chain
+
+def _split_runs(runs):
+    group = []
+    chain_bytes = 0
+    for run in runs:
+        entry_bytes = 1 if run[1] == 1 else 7 * (1 + run[1] // 0x10000)
+        if group and (len(group) >= MAX_WAVES_PER_CHAIN or chain_bytes + entry_bytes > MAX_CHAIN_BYTES):
+            yield group
+            group = []
+            chain_bytes = 0
+        group.append(run)
+        chain_bytes += entry_bytes
+    if group:
+        yield group
+
+# Brief: Espera a que termine la cadena en transmision. Regresa False si stop_event se
+#        activo antes, la cadena sigue transmitiendose y quien llama la detiene.
+def _wait_chain(pi, clock, stop_event=None):
+    while pi.wave_tx_busy():
+        if stop_event is not None and stop_event.is_set():
+            return False
+        clock.sleep(BUSY_POLL_SEC)
+    return True
+
+# Brief: Reproduce un segmento por DMA. frames es una lista de ticks con el pulso de
+#        cada GPIO en el orden de gpios, cada tick dura frames_per_tick marcos de 20 ms.
+#        Mientras se transmite una cadena se compila la siguiente; al terminar se
+#        regresa el control de los GPIO a set_servo_pulsewidth con el pulso del ultimo
+#        tick reproducido. observer es el del lazo de control (ver FixedRateLoop), recibe
+#        loop_started con el numero de ticks y su duracion, asi el tiempo comandado es el
+#        largo de la waveform. Si stop_event se activa la cadena se corta con wave_tx_stop
+#        y los servos se quedan en el tick que se estaba transmitiendo. Regresa el numero
+#        de ticks reproducidos, menor que len(frames) si el segmento se detuvo.
+def play_segment(pi, gpios, frames, frames_per_tick=1, clock=time, observer=None, stop_event=None):
+    gpios = list(gpios)
+    runs = run_length(frames, frames_per_tick)
+    if not runs or (stop_event is not None and stop_event.is_set()):
+        return 0
+    if observer is not None:
+        observer.loop_started(len(frames), frames_per_tick * FRAME_US / 1e6)
+
+    sent_ids = []
+    switched = False
+    played = len(frames)
+    sent_frames = 0
+    chain_offset = 0
+    chain_start = 0.0
+    try:
+        for group in _split_runs(runs):
+            wave_ids, chain = _compile_chain(pi, gpios, group)
+            if not switched:
+                # Los pulsos de servo del daemon se detienen hasta que la primera cadena esta
+                # compilada, asi los servos no se quedan sin señal mientras se crean las waves
+                for gpio in gpios:
+                    pi.set_servo_pulsewidth(gpio, 0)
+                    pi.set_mode(gpio, pigpio.OUTPUT)
+                switched = True
+            if not _wait_chain(pi, clock, stop_event):
+                for wave_id in wave_ids:
+                    pi.wave_delete(wave_id)
+                break
+            for wave_id in sent_ids:
+                pi.wave_delete(wave_id)
+            pi.wave_chain(chain)
+            chain_start = clock.monotonic()
+            chain_offset = sent_frames
+            sent_frames += sum(repeat for _, repeat in group)
+            sent_ids = wave_ids
+        else:
+            if _wait_chain(pi, clock, stop_event):
+                return played
+        # El marco que se transmite se calcula con el tiempo desde que empezo su cadena
+        frame = chain_offset + int((clock.monotonic() - chain_start) / (FRAME_US / 1e6))
+        played = min(len(frames), frame // frames_per_tick + 1)
+        return played
+    finally:
+        pi.wave_tx_stop()
+        for wave_id in sent_ids:
+            pi.wave_delete(wave_id)
+        # Si la salida nunca paso a las waves los servos siguen en su pulso anterior
+        if switched:
+            for gpio, pulse in zip(gpios, frames[played - 1]):
+                pi.set_servo_pulsewidth(gpio, pulse)
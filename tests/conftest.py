@@ -0,0 +1,6 @@
+# Brief: Configuracion de pytest, agrega la raiz del repositorio al path para importar los
+#        modulos PATH_*.py sin instalarlos.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,65 @@
+# Brief: Pruebas del ejecutor de movimientos (PATH_Executor): un movimiento solo cuenta como
+#        interrumpido si de verdad se detuvo, no si ya habia terminado cuando llego el nuevo.
+import threading
+from PATH_Executor import MotionExecutor
+
+def make_executor():
+    preempt, stopped = threading.Event(), threading.Event()
+    return MotionExecutor(preempt=preempt, stopped=stopped), preempt, stopped
+
+def test_move_that_stops_early_is_preempted():
+    executor, preempt, stopped = make_executor()
+    started, finished = threading.Event(), threading.Event()
+    results = []
+
+    def move():
+        started.set()
+        preempt.wait(5)
+        stopped.set()
+        return False
+
+    executor.submit('first', move, on_done=results.append, coalesce='pose')
+    started.wait(5)
+    executor.submit('second', lambda: True, on_done=lambda result: (results.append(result), finished.set()), coalesce='pose')
+    assert finished.wait(5)
+    assert results == [True]
+    executor.shutdown()
+
+def test_move_that_already_finished_keeps_on_done():
+    executor, preempt, stopped = make_executor()
+    finished = threading.Event()
+    results = []
+
+    # El segundo llega cuando el primero ya termino su movimiento pero sigue como movimiento en curso
+    def move():
+        executor.submit('second', lambda: 'second', on_done=lambda result: (results.append(result), finished.set()), coalesce='pose')
+        return 'first'
+
+    def first_done(result):
+        results.append((result, executor.preempted()))
+
+    executor.submit('first', move, on_done=first_done, coalesce='pose')
+    assert finished.wait(5)
+    assert results == [('first', False), 'second']
+    executor.shutdown()
+
+def test_without_stopped_event_running_move_is_not_interrupted():
+    preempt = threading.Event()
+    executor = MotionExecutor(preempt=preempt)
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+    results = []
+
+    def move():
+        started.set()
+        release.wait(5)
+        return 'first'
+
+    executor.submit('first', move, on_done=results.append, coalesce='pose')
+    started.wait(5)
+    executor.submit('second', lambda: 'second', coalesce='pose')
+    executor.submit('third', lambda: 'third', on_done=lambda result: (results.append(result), finished.set()), coalesce='pose')
+    assert not preempt.is_set()
+    release.set()
+    assert finished.wait(5)
+    assert results == ['first', 'third']
+    executor.shutdown()
@@ -0,0 +1,32 @@
+# Brief: Pruebas del formato de archivos (PATH_Format): frecuencias que el lazo de control no
+#        puede reproducir y waypoints que no caben en el archivo.
+import numpy as np
+import pytest
+import PATH_Format as fmt
+
+GPIOS = [18, 23]
+
+@pytest.mark.parametrize('rate_hz', [50, 25, 50 / 3, 12.5])
+def test_frame_rate_round_trip(tmp_path, rate_hz):
+    path = tmp_path / 'gait.pgt'
+    frames = np.arange(20, dtype=np.int16).reshape(10, 2) + 1500
+    fmt.save_frames(path, frames, rate_hz, GPIOS)
+    table, loaded_rate = fmt.load_frames(path, GPIOS)
+    assert loaded_rate == pytest.approx(rate_hz)
+    assert np.array_equal(table, frames)
+
+def test_rate_that_does_not_divide_servo_frame_is_rejected(tmp_path):
+    path = tmp_path / 'gait.pgt'
+    with pytest.raises(ValueError):
+        fmt.save_frames(path, np.zeros((2, 2)), 30, GPIOS)
+    # Un archivo escrito por otra herramienta con 30 Hz tampoco se reproduce a 25 Hz
+    fmt._write(path, fmt.KIND_FRAMES, np.zeros((2, 2)), 1, 30.0, GPIOS)
+    with pytest.raises(ValueError):
+        fmt.load_frames(path, GPIOS)
+
+def test_waypoints_out_of_range_are_rejected(tmp_path):
+    path = tmp_path / 'route.pwp'
+    fmt.save_waypoints(path, [(3000, -90.5)])
+    assert fmt.load_waypoints(path) == [(3000, -90.5)]
+    with pytest.raises(ValueError):
+        fmt.save_waypoints(path, [(4000, 0)])
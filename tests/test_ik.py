@@ -0,0 +1,38 @@
+# Brief: Pruebas de la cinematica de las patas (PATH_IK): ida y vuelta entre angulos y
+#        posiciones del pie, y rechazo de posiciones que la pata no alcanza.
+import numpy as np
+import pytest
+import PATH_IK as ik
+
+def _reachable_feet(leg):
+    shoulder, lift = np.meshgrid(np.linspace(10, 170, 33), np.linspace(0, ik.MAX_LIFT_DEG, 29))
+    elbow = ik.ELBOW_HOME[leg] + ik.ELBOW_SIGN[leg] * lift
+    return ik.foot_position(leg, shoulder.ravel(), elbow.ravel())
+
+@pytest.mark.parametrize('leg', sorted(ik.LEG_JOINTS))
+def test_round_trip(leg):
+    feet = _reachable_feet(leg)
+    shoulder, elbow = ik.leg_angles(leg, feet)
+    assert not np.isnan(shoulder).any() and not np.isnan(elbow).any()
+    np.testing.assert_allclose(ik.foot_position(leg, shoulder, elbow), feet, atol=1e-6)
+
+@pytest.mark.parametrize('leg', sorted(ik.LEG_JOINTS))
+def test_round_trip_with_grid(leg):
+    feet = _reachable_feet(leg)
+    shoulder, elbow = ik.leg_angles(leg, feet, use_grid=True)
+    assert not np.isnan(elbow).any()
+    # La tabla redondea la altura a GRID_RESOLUTION
+    np.testing.assert_allclose(ik.foot_position(leg, shoulder, elbow)[:, 2], feet[:, 2], atol=ik.GRID_RESOLUTION)
+
+@pytest.mark.parametrize('foot', [(30, 95, 70), (0, 20, 80), (0, ik.FEMUR_LENGTH, 90), (10, 60, 79)])
+def test_unreachable_feet_give_nan(foot):
+    shoulder, elbow = ik.leg_angles(1, np.array(foot, dtype=float))
+    assert np.isnan(shoulder) and np.isnan(elbow)
+    with pytest.raises(ValueError):
+        ik.solve_legs({1: np.array([foot], dtype=float)})
+
+def test_home_foot_round_trip():
+    for leg in ik.LEG_JOINTS:
+        shoulder, elbow = ik.leg_angles(leg, ik.home_foot(leg))
+        assert shoulder == pytest.approx(ik.SHOULDER_HOME)
+        assert elbow == pytest.approx(ik.ELBOW_HOME[leg])
@@ -0,0 +1,29 @@
+# Brief: Pruebas del generador de caminatas (PATH_Locomotion): los pies siguen la trayectoria
+#        pedida, la velocidad corresponde al paso y un paso fuera de alcance se rechaza.
+import numpy as np
+import pytest
+
+import PATH_IK as ik
+import PATH_Locomotion as locomotion
+
+PERIOD = 0.02
+
+@pytest.mark.parametrize('gait_type', locomotion.GAIT_TYPES)
+def test_feet_follow_commanded_path(gait_type):
+    feet = locomotion.foot_trajectories(gait_type, PERIOD, cycles=2)
+    angles = locomotion.gait_angles(gait_type, PERIOD, cycles=2)
+    for leg, (shoulder, elbow) in ik.LEG_JOINTS.items():
+        reached = ik.foot_position(leg, angles[shoulder], angles[elbow])
+        assert np.allclose(reached, feet[leg], atol=ik.REACH_TOLERANCE)
+
+@pytest.mark.parametrize('gait_type', locomotion.GAIT_TYPES)
+def test_speed_matches_stride(gait_type):
+    angles = locomotion.gait_angles(gait_type, PERIOD, cycles=2)
+    metrics = locomotion.gait_metrics(angles, PERIOD)
+    stance_time = locomotion.CYCLE_PERIOD[gait_type] * locomotion.DUTY_FACTOR[gait_type]
+    assert metrics['speed_mm_s'] == pytest.approx(locomotion.STRIDE_LENGTH_MM / stance_time, rel=0.05)
+    assert metrics['max_servo_dps'] <= locomotion.MAX_SERVO_SPEED_DPS
+
+def test_stride_longer_than_reach_is_rejected():
+    with pytest.raises(ValueError):
+        locomotion.foot_trajectories('trot', PERIOD, stride=200)
@@ -0,0 +1,26 @@
+# Brief: Pruebas de las metricas del lazo de control (PATH_Metrics): snapshot desde otro hilo
+#        mientras el lazo escribe, como lo hace el panel del HMI.
+import threading
+from PATH_Metrics import ControlMetrics
+
+def test_snapshot_while_writing():
+    metrics = ControlMetrics()
+    stop = threading.Event()
+
+    def write():
+        count = 0
+        while not stop.is_set():
+            # GPIO distintos para que el diccionario de conteos crezca mientras se lee
+            metrics.record_batch(range(count % 500, count % 500 + 8), 1e-4)
+            metrics.tick(0.0)
+            count += 1
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(500):
+            snap = metrics.snapshot()
+            assert snap['writes'] == 8 * snap['batches']
+    finally:
+        stop.set()
+        writer.join()
@@ -0,0 +1,30 @@
+# Brief: Pruebas del planeador de trayectorias (PATH_Planner): quitar el ultimo waypoint deja
+#        la misma ruta que planearla completa y la estimacion coincide con la corrida simulada.
+import pytest
+import PATH_Control as control
+from PATH_Planner import RoutePlanner
+
+WAYPOINTS = [(0, 0), (5, 0), (5, 60), (8, 30), (4, 200)]
+
+def planned(planner):
+    return planner.cycles, planner.points, planner.estimate(control.STEP_DELAY, control.GAIT_MOVE_DURATION)
+
+# (4, 200) repite el ultimo waypoint y (15.94, 205) queda alineado con los dos ultimos
+@pytest.mark.parametrize('extra', [(12, 0), (9, 120), (4, 200), (15.94, 205)])
+def test_remove_last_matches_full_plan(extra):
+    planner = RoutePlanner()
+    planner.reset(WAYPOINTS)
+    planner.add(extra)
+    planner.remove_last()
+    full = RoutePlanner()
+    full.reset(WAYPOINTS)
+    assert planned(planner) == planned(full)
+
+def test_estimate_matches_sim_run():
+    assert control.connect('sim')
+    planner = RoutePlanner()
+    planner.reset(WAYPOINTS)
+    estimate = planner.estimate(control.STEP_DELAY, control.GAIT_MOVE_DURATION)
+    start = control.clock.monotonic()
+    assert control.execute_trajectory(WAYPOINTS)
+    assert control.clock.monotonic() - start == pytest.approx(estimate['duration_s'], abs=control.STEP_DELAY)
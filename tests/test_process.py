@@ -0,0 +1,98 @@
+# Brief: Pruebas del proceso de control (PATH_Process) y de la flota (PATH_Fleet) contra
+#        sustitutos locales de pigpiod de PATH_Sim, cada robot con su propio proceso.
+import time
+import numpy as np
+import pytest
+import PATH_Control as control
+from PATH_Fleet import Fleet, Robot
+from PATH_Process import MAX_PENDING, RING_CAPACITY, ControlProcess, RemoteControl
+from PATH_Sim import StandInDaemon
+
+@pytest.fixture
+def daemons():
+    daemons = [StandInDaemon().start() for _ in range(2)]
+    yield daemons
+    for daemon in daemons:
+        daemon.close()
+
+@pytest.fixture
+def process(daemons):
+    process = ControlProcess()
+    assert process.start('pigpio', daemons[0].host, daemons[0].port, cpu=None)
+    yield process
+    process.stop()
+
+def test_commands_finish_in_order_past_pending_limit(process, daemons):
+    gpio = control.servo_gpios['shoulder_1']
+    seqs = [process.send_pose({'shoulder_1': 90 + i % 10}, 0.0) for i in range(3 * MAX_PENDING)]
+    assert process.wait(seqs[-1], timeout=30) is True
+    assert daemons[0].sim.get_servo_pulsewidth(gpio) == control.angle_to_pulse(90 + (len(seqs) - 1) % 10, gpio)
+    assert process.current_pulses()[gpio] == daemons[0].sim.get_servo_pulsewidth(gpio)
+
+def test_table_larger_than_ring_is_streamed():
+    process = ControlProcess()
+    try:
+        assert process.start('sim', cpu=None)
+        rows = RING_CAPACITY // (2 * len(control.servo_gpios)) + 1000
+        table = (1500 + np.arange(rows)[:, None] % 400 + np.arange(len(control.servo_gpios))).astype(np.int16)
+        assert process.wait(process.send_table(table), timeout=60) is True
+        assert list(process.current_pulses().values()) == table[-1].tolist()
+        assert process.counters()['ticks'] == rows
+    finally:
+        process.stop()
+
+def test_wait_fails_when_process_dies(process):
+    process._process.kill()
+    process._process.wait()
+    assert process.wait(process.send_home(), timeout=5) is False
+
+def test_remote_control_fills_telemetry(daemons):
+    engine = RemoteControl({gpio: 1500 for gpio in control.servo_gpios.values()})
+    try:
+        assert engine.connect('pigpio', daemons[0].host, daemons[0].port, cpu=None)
+        assert engine.execute_servos({'shoulder_3': 110}, 0.5)
+        gpio = control.servo_gpios['shoulder_3']
+        # Una muestra por tick del proceso de control, con el tiempo de cada tick
+        ticks = engine.process.counters()['ticks']
+        deadline = time.monotonic() + 5
+        while engine.telemetry.count < ticks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert engine.telemetry.count == ticks
+        times, pulses = engine.telemetry.snapshot()
+        column = engine.telemetry.gpios.index(gpio)
+        assert np.diff(times) == pytest.approx(control.STEP_DELAY, abs=0.01)
+        assert pulses[-1, column] == control.angle_to_pulse(110, gpio)
+    finally:
+        engine.shutdown()
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+def test_remote_control_reports_process_metrics(daemons):
+    engine = RemoteControl({gpio: 1500 for gpio in control.servo_gpios.values()})
+    try:
+        assert engine.connect('pigpio', daemons[0].host, daemons[0].port, cpu=None)
+        assert engine.execute_servos({'elbow_4': 120}, 0.3)
+        ticks = engine.process.counters()['ticks']
+        assert wait_for(lambda: engine.control_metrics.snapshot()['ticks'] == ticks)
+        assert engine.control_metrics.snapshot()['writes'] > 0
+        assert 'Ticks:' in engine.control_metrics.summary()
+        engine.control_metrics.reset()
+        assert wait_for(lambda: engine.control_metrics.snapshot()['ticks'] == 0)
+    finally:
+        engine.shutdown()
+
+def test_fleet_moves_every_robot(daemons):
+    fleet = Fleet(Robot(f'r{i}', daemon.host, daemon.port, 'pigpio') for i, daemon in enumerate(daemons))
+    try:
+        assert fleet.connect() == {'r0': True, 'r1': True}
+        assert fleet.execute_servos({'elbow_2': 140}, 0.2) == {'r0': True, 'r1': True}
+        gpio = control.servo_gpios['elbow_2']
+        for daemon in daemons:
+            assert daemon.sim.get_servo_pulsewidth(gpio) == control.angle_to_pulse(140, gpio)
+        assert fleet.start_skew() < 0.05
+    finally:
+        fleet.shutdown()
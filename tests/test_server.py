@@ -0,0 +1,85 @@
+# Brief: Pruebas del servidor de control (PATH_Server) contra el sustituto local de pigpiod
+#        de PATH_Sim, sin interfaz grafica ni raspberry.
+import pytest
+import PATH_Control as control
+from PATH_Sim import StandInDaemon
+from PATH_Server import ControlServer, ControlClient
+
+@pytest.fixture(scope='module')
+def server():
+    daemon = StandInDaemon().start()
+    server = ControlServer(port=0, backend='pigpio', pigpio_host=daemon.host, pigpio_port=daemon.port).start()
+    yield server, daemon
+    server.close()
+    daemon.close()
+
+@pytest.fixture
+def client(server):
+    client = ControlClient(server[0].host, server[0].port, timeout=30)
+    yield client
+    client.close()
+
+def test_pose_reaches_daemon(server, client):
+    gpio = control.servo_gpios['shoulder_1']
+    event = client.wait(client.request('pose', angles={'shoulder_1': 120}, duration=0.2))
+    assert event['event'] == 'done' and event['result'] is True
+    assert event['pulses'][str(gpio)] == control.angle_to_pulse(120, gpio)
+    assert server[1].sim.get_servo_pulsewidth(gpio) == control.angle_to_pulse(120, gpio)
+
+def test_batch_runs_in_order(client):
+    first = client.request('batch', commands=[
+        {'id': 'a', 'cmd': 'pose', 'angles': {'elbow_1': 150}, 'duration': 0.1},
+        {'id': 'b', 'cmd': 'pose', 'angles': {'elbow_1': 160}, 'duration': 0.1},
+    ])
+    assert client.wait('b')['result'] is True
+    order = [(event['event'], event.get('id')) for event in client.events if event['event'] in ('accepted', 'done')]
+    assert order[0] == ('accepted', first)
+    assert order.index(('done', 'a')) < order.index(('done', 'b'))
+
+@pytest.mark.parametrize('fields', [
+    {'cmd': 'pose', 'angles': [1, 2]},
+    {'cmd': 'pose', 'angles': {'shoulder_1': 'x'}},
+    {'cmd': 'pose', 'angles': {'knee': 90}},
+    {'cmd': 'pose'},
+    {'cmd': 'batch', 'commands': 'pose'},
+    {'cmd': 'subscribe', 'interval': 'fast'},
+    {'cmd': 'trajectory', 'waypoints': 5},
+    {'cmd': 'trajectory', 'waypoints': [[1, 2, 3]]},
+    {'cmd': 'gait', 'name': 'forward1', 'count': 0},
+    {'cmd': 'locomotion', 'gait': 'trot', 'cycles': 'x'},
+    {'cmd': 'locomotion', 'gait': 'gallop'},
+    {'cmd': 'gait', 'name': 'forward1', 'preempt': True},
+    {'cmd': 'jump'},
+])
+def test_invalid_commands_are_rejected(client, fields):
+    cmd = fields.pop('cmd')
+    event = client.wait(client.request(cmd, **fields))
+    assert event['event'] == 'error'
+    # La conexion sigue atendiendo comandos despues del error
+    assert client.wait(client.request('pose', angles={'shoulder_2': 90}, duration=0))['result'] is True
+
+def test_invalid_json_keeps_connection(client):
+    client._socket.sendall(b'{not json\n[1, 2]\n')
+    assert client.read_event()['event'] == 'error'
+    assert client.read_event()['event'] == 'error'
+    client.request('state')
+    assert client.read_event()['event'] == 'state'
+
+def test_preempted_and_superseded_poses(client):
+    running = client.request('pose', angles={'shoulder_3': 170}, duration=1.0, preempt=True)
+    while client.read_event() != {'event': 'started', 'id': running, 'cmd': 'pose'}:
+        pass
+    # En un lote las dos poses se encolan juntas, la segunda reemplaza a la primera antes de que empiece
+    queued, latest = 'queued', 'latest'
+    client.request('batch', commands=[
+        {'id': queued, 'cmd': 'pose', 'angles': {'shoulder_3': 10}, 'duration': 0.2, 'preempt': True},
+        {'id': latest, 'cmd': 'pose', 'angles': {'shoulder_3': 100}, 'duration': 0.2, 'preempt': True},
+    ])
+
+    assert client.wait(queued)['event'] == 'superseded'
+    interrupted = client.wait(running)
+    assert interrupted['result'] is False and interrupted['preempted'] is True
+    done = client.wait(latest)
+    assert done['result'] is True and done['preempted'] is False
+    gpio = control.servo_gpios['shoulder_3']
+    assert done['pulses'][str(gpio)] == control.angle_to_pulse(100, gpio)
@@ -0,0 +1,45 @@
+# Brief: Pruebas de la salida por waveforms (PATH_Wave) contra el backend simulado: un
+#        segmento se reproduce completo o se corta en el tick que se transmitia al detenerlo.
+from PATH_Sim import SimPi, VirtualClock
+from PATH_Wave import play_segment, FRAME_US
+
+GPIOS = [4, 17]
+
+class StopAt:
+    # Brief: Evento que se activa solo cuando el reloj virtual llega a when.
+    def __init__(self, clock, when):
+        self.clock = clock
+        self.when = when
+
+    def is_set(self):
+        return self.clock.monotonic() >= self.when
+
+def make_frames(num_ticks):
+    return [[1000 + 10 * tick, 2000 - 10 * tick] for tick in range(num_ticks)]
+
+def test_segment_plays_to_the_end():
+    clock = VirtualClock()
+    pi = SimPi(clock)
+    frames = make_frames(50)
+    assert play_segment(pi, GPIOS, frames, clock=clock) == len(frames)
+    assert [pi.get_servo_pulsewidth(gpio) for gpio in GPIOS] == frames[-1]
+
+def test_stop_event_cuts_the_chain():
+    clock = VirtualClock()
+    pi = SimPi(clock)
+    frames = make_frames(50)
+    frames_per_tick = 2
+    played = play_segment(pi, GPIOS, frames, frames_per_tick, clock=clock, stop_event=StopAt(clock, 0.5))
+    tick_sec = frames_per_tick * FRAME_US / 1e6
+    assert 0 < played < len(frames)
+    assert played == int(clock.monotonic() / tick_sec) + 1
+    assert not pi.wave_tx_busy()
+    assert [pi.get_servo_pulsewidth(gpio) for gpio in GPIOS] == frames[played - 1]
+
+def test_stop_before_start_leaves_servos():
+    clock = VirtualClock()
+    pi = SimPi(clock)
+    for gpio in GPIOS:
+        pi.set_servo_pulsewidth(gpio, 1500)
+    assert play_segment(pi, GPIOS, make_frames(10), clock=clock, stop_event=StopAt(clock, 0.0)) == 0
+    assert [pi.get_servo_pulsewidth(gpio) for gpio in GPIOS] == [1500, 1500]